@@ -0,0 +1,38 @@
+import argparse
+import sys
+
+
+def _key_value(text):
+    # Validación en argparse: un --set mal formado es un error de uso (exit 2), no una traza
+    key, sep, _ = text.partition("=")
+    if not sep or not key.strip():
+        raise argparse.ArgumentTypeError(f"invalid parameter '{text}' (expected KEY=VALUE)")
+    return text
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app", description="Structural 3D Analysis")
+    parser.add_argument("--batch", nargs="+", metavar="SCRIPT",
+                        help="Run scripts headless (no GUI, PyQt6 is not imported)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Number of parallel processes for --batch")
+    parser.add_argument("--set", dest="params", action="append", metavar="KEY=VALUE", type=_key_value,
+                        help="Parameter exposed to batch scripts as params[KEY]")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.batch:
+        from app.batch import main as batch_main
+        return batch_main(args.batch, jobs=args.jobs, param_pairs=args.params)
+
+    # Modo GUI: solo aquí se importa PyQt6
+    from app.controllers.main_controller import MainController
+    controller = MainController()
+    controller.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
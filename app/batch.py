@@ -0,0 +1,120 @@
+"""
+Modo batch (headless): ejecuta scripts de usuario contra un DocumentModel
+sin crear QApplication ni importar PyQt6 / pyqtgraph / OpenGL.
+
+Uso:
+    python -m app --batch modelo.py otro.py --jobs 4 --set n=10
+"""
+import os
+import sys
+import time
+import traceback
+import importlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+
+from app.models.document_model import DocumentModel
+
+# Nombres expuestos a los scripts ("modulo" o "modulo:atributo").
+# Ningún módulo de esta lista puede importar PyQt6/pyqtgraph.
+SCRIPT_EXPORTS = {
+    "DocumentModel": "app.models.document_model:DocumentModel",
+    "np": "numpy",
+    "perf": "app.perf:perf",
+    "selection": "app.models.selection",
+    "export": "app.models.export",
+    "loads": "app.models.loads",
+    "sections": "app.models.sections",
+    "memory": "app.memory",
+}
+
+
+def _resolve_export(target):
+    module_name, _, attr = target.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, attr) if attr else module
+
+
+def build_namespace(model=None, params=None, script_path=None):
+    """Crea el diccionario global con el que se ejecuta un script."""
+    namespace = {
+        "__name__": "__main__",
+        "__file__": script_path or "<script>",
+        "model": model if model is not None else DocumentModel(),
+        "params": dict(params or {}),
+    }
+    for name, target in SCRIPT_EXPORTS.items():
+        namespace[name] = _resolve_export(target)
+    return namespace
+
+
+def run_script(script_path, params=None):
+    """Ejecuta un script en el proceso actual y devuelve un resumen (dict)."""
+    t0 = time.perf_counter()
+    result = {"script": script_path, "ok": False, "error": None,
+              "nodes": 0, "elements": 0, "elapsed": 0.0}
+    try:
+        with open(script_path, "r", encoding="utf-8") as f:
+            source = f.read()
+        code = compile(source, script_path, "exec")
+        namespace = build_namespace(params=params, script_path=os.path.abspath(script_path))
+        exec(code, namespace)
+        model = namespace["model"]
+        result["nodes"] = len(model.node_ids)
+        result["elements"] = len(model.element_ids)
+        result["ok"] = True
+    except SystemExit as e:
+        result["ok"] = e.code in (None, 0)
+        if not result["ok"]:
+            result["error"] = f"SystemExit({e.code})"
+    except Exception:
+        result["error"] = traceback.format_exc()
+    result["elapsed"] = time.perf_counter() - t0
+    return result
+
+
+def run_batch(script_paths, jobs=1, params=None):
+    """Ejecuta varios scripts, en paralelo (un proceso por job) si jobs > 1."""
+    if jobs <= 1 or len(script_paths) <= 1:
+        return [run_script(p, params) for p in script_paths]
+
+    # 'spawn' evita heredar estado del padre (y es igual en Linux/Windows/macOS)
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=ctx) as pool:
+        futures = {pool.submit(run_script, p, params): i for i, p in enumerate(script_paths)}
+        for fut in as_completed(futures):
+            results[futures[fut]] = fut.result()
+    return [results[i] for i in range(len(script_paths))]
+
+
+def parse_params(pairs):
+    """Convierte ['n=10', 'name=A'] en {'n': 10, 'name': 'A'}."""
+    params = {}
+    for pair in pairs or []:
+        key, sep, value = pair.partition("=")
+        if not sep or not key.strip():
+            raise ValueError(f"Invalid parameter '{pair}' (expected KEY=VALUE)")
+        for cast in (int, float):
+            try:
+                value = cast(value)
+                break
+            except ValueError:
+                pass
+        params[key.strip()] = value
+    return params
+
+
+def main(script_paths, jobs=1, param_pairs=None):
+    params = parse_params(param_pairs)
+    results = run_batch(script_paths, jobs=jobs, params=params)
+
+    failed = 0
+    for r in results:
+        status = "OK  " if r["ok"] else "FAIL"
+        print(f"[{status}] {r['script']}  ({r['elapsed']:.2f} s)  "
+              f"nodes={r['nodes']} elements={r['elements']}")
+        if r["error"]:
+            failed += 1
+            print(r["error"], file=sys.stderr)
+    return 1 if failed else 0
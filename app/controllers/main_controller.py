@@ -1,18 +1,82 @@
 #
 import sys
-from PyQt6.QtWidgets import QApplication
+import time
+import numpy as np
+from PyQt6.QtWidgets import QApplication, QFileDialog, QInputDialog, QMessageBox
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QAction
 
+from app.lazy import lazy_import
+from app.perf import perf
+from app.memory import MemoryReport, allocations
 from app.models.document_model import DocumentModel
+from app.models import selection
+from app.models.loads import NODAL_COMPONENTS, MEMBER_COMPONENTS
+from app.controllers.tasks import TaskManager
 from app.views.main_window import MainWindow
-from app.views.dialogs import AddNodeDialog, AddMaterialDialog
+from app.views import glyphs
+
+# Subsistemas que no hacen falta para el primer pintado
+dialogs = lazy_import("app.views.dialogs")
+script_runner = lazy_import("app.controllers.script_runner")
+spatial = lazy_import("app.models.spatial")
+meshing = lazy_import("app.models.meshing")
+checks = lazy_import("app.models.checks")
+replicate = lazy_import("app.models.replicate")
+export = lazy_import("app.models.export")
+journal = lazy_import("app.models.journal")
+
+def _merge_representatives(ctx, coords, tol):
+    # Tarea en segundo plano: solo calcula sobre una copia; la fusión se aplica en on_result
+    ctx.progress(0, None, f"{len(coords)} nodes")
+    reps = spatial.coincident_representatives(coords, tol)
+    ctx.check_cancelled()
+    return reps
+
+def _find_intersection_splits(ctx, p0, p1, conn, tol):
+    # Tarea en segundo plano sobre copias de los extremos; el corte se aplica en on_result
+    ctx.progress(0, None, f"{len(conn)} frames")
+    rows, params, pairs = meshing.intersection_splits(p0, p1, conn, tol)
+    ctx.check_cancelled()
+    return rows, params, pairs
+
+
+def _run_model_checks(ctx, node_ids, coords, element_ids, conn):
+    ctx.progress(0, None, f"{len(node_ids)} nodes, {len(element_ids)} frames")
+    return checks.run_checks(node_ids, coords, element_ids, conn)
+
+
+def _export_model(ctx, data, path, fmt):
+    # Tarea en segundo plano sobre una instantánea; ctx.progress corta la escritura si se cancela
+    start = time.perf_counter()
+
+    def progress(done, total, nbytes):
+        elapsed = max(time.perf_counter() - start, 1e-9)
+        ctx.progress(done, total, f"{nbytes / 1e6:.1f} MB, {nbytes / 1e6 / elapsed:.1f} MB/s")
+
+    return export.export(data, path, fmt, progress=progress)
+
 
 class MainController:
     def __init__(self):
+        # Los paneles del split view comparten buffers de GPU: contextos GL compartidos
+        QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
         self.app = QApplication(sys.argv)
         self.model = DocumentModel()
+        # Solo el hilo GUI muta el modelo; las tareas entregan sus resultados aquí
+        self.model.bind_to_current_thread()
+        self.tasks = TaskManager()
+        self.merge_tolerance = 1e-3
         self.window = MainWindow()
-        
+        self.script_runner = None  # se crea al ejecutar el primer script
+        self._console_namespace = {}
+        self._check_dialog = None
+        # Patrón de carga cuyas flechas se dibujan (None = ninguno)
+        self.shown_load_pattern = None
+        # Autoguardado: journal de cambios + snapshots periódicos (se crea en run())
+        self.journal = None
+        self._autosave_timer = None
+
         self._connect_signals()
         
     def _connect_signals(self):
@@ -42,24 +106,82 @@ class MainController:
         self.delete_action.triggered.connect(self.delete_selected_items)
         toolbar.addAction(self.delete_action)
 
-        # 2. Menu View Connections
+        # 2. Menu File / View Connections
+        self.window.log_to_file_action.triggered.connect(self.toggle_log_to_file)
+        self.window.export_tcl_action.triggered.connect(lambda: self.export_model("tcl"))
+        self.window.export_py_action.triggered.connect(lambda: self.export_model("py"))
+        self.window.export_csv_action.triggered.connect(lambda: self.export_model("csv"))
         self.window.view_axes_action.triggered.connect(self.toggle_axes)
+        for count, action in self.window.view_layout_actions.items():
+            action.triggered.connect(lambda _, n=count: self.set_view_layout(n))
+        self.window.zoom_extents_action.triggered.connect(self.zoom_extents)
         self.window.view_node_ids_action.triggered.connect(self.toggle_node_ids)
         self.window.view_frame_ids_action.triggered.connect(self.toggle_frame_ids)
+        self.window.view_perf_action.triggered.connect(self.toggle_performance)
+        self.window.perf_dump_action.triggered.connect(self.dump_performance_stats)
+        self.window.perf_save_action.triggered.connect(self.save_performance_stats)
+        self.window.memory_report_action.triggered.connect(self.memory_report)
+        self.window.track_allocations_action.setChecked(allocations.active)
+        self.window.track_allocations_action.triggered.connect(self.toggle_allocation_tracking)
         
-        # 3. Define Connections
+        # 3. Edit / Define Connections
+        self.window.replicate_action.triggered.connect(self.replicate_selection)
+        self.window.divide_frames_action.triggered.connect(self.divide_selected_frames)
+        self.window.split_intersections_action.triggered.connect(self.split_frames_at_intersections)
+        self.window.merge_nodes_action.triggered.connect(self.merge_coincident_nodes)
+        self.window.merge_on_insert_action.triggered.connect(self.toggle_merge_on_insert)
         self.window.define_material_action.triggered.connect(self.open_add_material_dialog)
+        self.window.define_section_action.triggered.connect(self.open_add_section_dialog)
+        self.window.assign_frame_properties_action.triggered.connect(self.assign_frame_properties)
+        self.window.define_load_pattern_action.triggered.connect(self.open_add_load_pattern_dialog)
+        self.window.assign_nodal_loads_action.triggered.connect(self.assign_nodal_loads)
+        self.window.assign_frame_loads_action.triggered.connect(self.assign_frame_loads)
+        self.window.view_loads_action.triggered.connect(self.show_loads)
+        self.window.check_model_action.triggered.connect(self.check_model)
 
-        # 4. Viewport & Table Connections
-        viewport = self.window.central_container.viewport
-        viewport.nodeSelectionChanged.connect(self.on_viewport_node_selection)
-        viewport.frameSelectionChanged.connect(self.on_viewport_frame_selection)
-        viewport.createFrameSignal.connect(self.on_create_frame)
+        # Select
+        self.window.select_all_action.triggered.connect(self.select_all)
+        self.window.select_none_action.triggered.connect(self.select_none)
+        self.window.select_invert_action.triggered.connect(self.select_invert)
+        self.window.select_nodes_range_action.triggered.connect(self.select_nodes_in_range)
+        self.window.select_nodes_plane_action.triggered.connect(self.select_nodes_on_plane)
+        self.window.select_frames_orientation_action.triggered.connect(self.select_frames_by_orientation)
+        self.window.select_frames_length_action.triggered.connect(self.select_frames_by_length)
+        self.window.select_frames_property_action.triggered.connect(self.select_frames_by_property)
+
+        # 4. Viewport (se crea tras el primer pintado) & Table Connections
+        self.window.central_container.viewportCreated.connect(self._connect_viewport_signals)
         
         self.window.node_table.selectionChanged.connect(self.on_node_table_selection)
         self.window.element_table.selectionChanged.connect(self.on_frame_table_selection)
         self.window.work_tree.itemSelected.connect(self.on_tree_item_selected)
 
+        # 5. Background tasks -> status bar
+        status = self.window.task_status
+        self.tasks.taskStarted.connect(status.task_started)
+        self.tasks.taskProgress.connect(status.task_progress)
+        self.tasks.taskEnded.connect(status.task_ended)
+        self.tasks.taskFailed.connect(self.on_task_failed)
+        status.cancelRequested.connect(lambda handle: handle.cancel())
+
+        # 6. Script Editor / Console
+        self.window.script_editor.runRequested.connect(self.run_script)
+        self.window.script_editor.consoleRequested.connect(self.run_console_line)
+        self.window.script_editor.stopRequested.connect(self.stop_script)
+
+    def _connect_viewport_signals(self, viewport):
+        viewport.nodeSelectionChanged.connect(self.on_viewport_node_selection)
+        viewport.frameSelectionChanged.connect(self.on_viewport_frame_selection)
+        viewport.createFrameSignal.connect(self.on_create_frame)
+
+    def on_task_failed(self, handle, tb):
+        # Tareas sin on_error propio: el fallo se ve en el terminal, no solo en stdout
+        self._report_task_error(handle.name, tb)
+
+    def _report_task_error(self, name, tb):
+        self.window.terminal.print_message(tb.rstrip())
+        self.window.terminal.print_message(f">> {name} failed")
+
     # --- MODOS DE INTERACCIÓN ---
     
     def toggle_add_frame_mode(self, checked):
@@ -86,9 +208,144 @@ class MainController:
             
         self.window.central_container.viewport.set_box_selection_mode(checked)
 
+    # --- MERGE COINCIDENT NODES ---
+    def _ask_merge_tolerance(self):
+        tol, ok = QInputDialog.getDouble(self.window, "Merge Coincident Nodes", "Tolerance:",
+                                         self.merge_tolerance, 0.0, 1e6, 6)
+        if ok:
+            self.merge_tolerance = tol
+        return ok
+
+    @perf.measure("controller.merge_nodes")
+    def merge_coincident_nodes(self):
+        if not self._ask_merge_tolerance():
+            return
+        tol = self.merge_tolerance
+        coords, revision = self.model.node_coords.copy(), self.model.revision
+
+        def apply(reps):
+            # Si el modelo cambió mientras tanto, reps ya no vale y se recalcula aquí
+            removed_nodes, removed_frames = self.model.merge_coincident_nodes(
+                tol, reps if self.model.revision == revision else None)
+            self.window.terminal.print_message(
+                f">> Merge (tol={tol:g}): {removed_nodes} nodes merged, "
+                f"{removed_frames} degenerate/duplicate frames removed")
+            if removed_nodes:
+                self._refresh_all_views()
+
+        self.tasks.submit("Merge coincident nodes", _merge_representatives, coords, tol, on_result=apply,
+                          on_error=lambda tb: self._report_task_error("Merge coincident nodes", tb),
+                          on_cancel=lambda: self.window.terminal.print_message(">> Merge cancelled"))
+
+    # --- REPLICATE ---
+    def replicate_selection(self):
+        vp = self.window.central_container.viewport
+        if vp.selection.is_empty():
+            self.window.statusBar().showMessage("Replicate: nothing selected", 3000)
+            return
+        dialog = dialogs.ReplicateDialog(self.window, self.merge_tolerance)
+        if not dialog.exec():
+            return
+        kind, params, merge_tol = dialog.get_data()
+        if kind == "linear":
+            rotations, translations = replicate.linear_transforms(params["offset"], params["count"])
+        elif kind == "radial":
+            rotations, translations = replicate.radial_transforms(
+                params["angle_deg"], params["count"], params["axis"], params["center"])
+        else:
+            rotations, translations = replicate.mirror_transform(params["point"], params["normal"])
+
+        with perf.timed("controller.replicate"):
+            new_nodes, new_frames = self.model.replicate(
+                vp.selected_node_ids.selected_ids(), vp.selected_frame_ids.selected_ids(),
+                rotations, translations, merge_tol)
+        self.window.terminal.print_message(
+            f">> Replicate ({kind}, {len(rotations)} copies): +{len(new_nodes)} nodes, +{len(new_frames)} frames")
+        self._refresh_all_views()
+
+    # --- DIVIDE / SPLIT FRAMES ---
+    @perf.measure("controller.divide_frames")
+    def divide_selected_frames(self):
+        frames = self.window.central_container.viewport.selected_frame_ids.selected_ids()
+        if not len(frames):
+            self.window.statusBar().showMessage("Divide Frames: no frames selected", 3000)
+            return
+        n, ok = QInputDialog.getInt(self.window, "Divide Frames", "Segments per frame:", 2, 2, 10000)
+        if not ok:
+            return
+        new_nodes, new_frames, removed = self.model.divide_elements(frames, n)
+        self.window.terminal.print_message(
+            f">> Divided {removed} frames into {n}: +{len(new_nodes)} nodes, {len(new_frames)} new frames")
+        self._refresh_all_views()
+
+    def split_frames_at_intersections(self):
+        tol, ok = QInputDialog.getDouble(self.window, "Split Frames at Intersections", "Tolerance:",
+                                         max(self.merge_tolerance, 1e-6), 1e-6, 1e6, 6)
+        if not ok:
+            return
+        # Frames seleccionados, o todos si no hay selección
+        selected = self.window.central_container.viewport.selected_frame_ids.selected_ids()
+        model = self.model
+        elem_ids, conn, p0, p1 = model.frame_endpoints(selected if len(selected) else None)
+        revision = model.revision
+
+        def apply(result):
+            idx, params, pairs = result
+            # Si el modelo cambió mientras tanto, se recalcula aquí
+            splits = (elem_ids[idx], params, pairs) if model.revision == revision else None
+            new_nodes, new_frames, removed = model.split_at_intersections(
+                tol, elem_ids if len(selected) else None, splits)
+            self.window.terminal.print_message(
+                f">> Split at intersections (tol={tol:g}): {pairs} crossings, {removed} frames split "
+                f"into {len(new_frames)}, +{len(new_nodes)} nodes")
+            if removed:
+                self._refresh_all_views()
+
+        self.tasks.submit("Split frames at intersections", _find_intersection_splits, p0, p1, conn, tol,
+                          on_result=apply,
+                          on_error=lambda tb: self._report_task_error("Split frames at intersections", tb),
+                          on_cancel=lambda: self.window.terminal.print_message(">> Split cancelled"))
+
+    def toggle_merge_on_insert(self, checked):
+        if checked and not self._ask_merge_tolerance():
+            self.window.merge_on_insert_action.setChecked(False)
+            return
+        self.model.merge_tolerance = self.merge_tolerance if checked else None
+        state = f"ON (tol={self.merge_tolerance:g})" if checked else "OFF"
+        self.window.terminal.print_message(f">> Merge on insert {state}")
+
+    # --- MODEL CHECK ---
+    def check_model(self):
+        m = self.model
+        args = (m.node_ids.copy(), m.node_coords.copy(), m.element_ids.copy(), m.element_conn.copy())
+        self.tasks.submit("Check model", _run_model_checks, *args, on_result=self.on_model_checked,
+                          on_error=lambda tb: self._report_task_error("Check model", tb))
+
+    def on_model_checked(self, issues):
+        terminal = self.window.terminal
+        if not issues:
+            terminal.print_message(">> Model check: no problems found")
+        for issue in issues:
+            if len(issue.element_ids):
+                terminal.print_bulk(f"Check: {issue.title} -", "frame", issue.element_ids)
+            if len(issue.node_ids):
+                terminal.print_bulk(f"Check: {issue.title} -", "node", issue.node_ids)
+        dialog = dialogs.ModelCheckDialog(issues, self.window)
+        dialog.selectRequested.connect(self.select_check_issue)
+        dialog.setModal(False)
+        dialog.show()
+        self._check_dialog = dialog
+
+    def select_check_issue(self, issue):
+        # Frames con nodos inexistentes no están en el viewport: solo se ven en la tabla
+        vp = self.window.central_container.viewport
+        vp.set_selection(node_ids=issue.node_ids, frame_ids=issue.element_ids, notify=True)
+        if self.window.element_table.isVisible():
+            self.window.element_table.select_rows_by_ids(issue.element_ids)
+
     # --- MATERIALS ---
     def open_add_material_dialog(self):
-        dialog = AddMaterialDialog(self.window)
+        dialog = dialogs.AddMaterialDialog(self.window)
         if dialog.exec():
             name, e, nu, rho = dialog.get_data()
             mat_id = self.model.add_material(name, e, nu, rho)
@@ -96,6 +353,123 @@ class MainController:
             if self.window.material_table.isVisible():
                 self.window.material_table.update_data(self.model.get_materials_data())
 
+    # --- SECTIONS ---
+    def open_add_section_dialog(self):
+        dialog = dialogs.AddSectionDialog(self.window)
+        if dialog.exec():
+            shape, name, params = dialog.get_data()
+            try:
+                self.model.add_section(shape, name, **params)
+            except ValueError as exc:
+                self.window.terminal.print_message(f">> Section not added: {exc}")
+                return
+            self.window.terminal.print_message(f">> Section Added: {name} ({shape})")
+            if self.window.section_table.isVisible():
+                self.window.section_table.update_data(self.model.get_sections_data())
+
+    def assign_frame_properties(self):
+        ids = self.window.central_container.viewport.selected_frame_ids.selected_ids()
+        if not len(ids):
+            self.window.statusBar().showMessage("Frame Material / Section: no frames selected", 3000)
+            return
+        dialog = dialogs.AssignFramePropertiesDialog(self.model.get_materials_data(),
+                                                     self.model.get_sections_data(), self.window)
+        if not dialog.exec():
+            return
+        material_id, section_id = dialog.get_data()
+        if material_id is None and section_id is None:
+            return
+        with perf.timed("controller.assign_frame_properties"):
+            count = self.model.assign_frame_properties(ids, material_id, section_id)
+        self.window.terminal.print_message(f">> Frame Material / Section assigned: {count} frames")
+        if self.window.element_table.isVisible():
+            self.window.element_table.update_data(self.model.get_elements_data())
+        if self.shown_load_pattern is not None:
+            self._refresh_load_arrows()
+
+    # --- LOADS ---
+    def open_add_load_pattern_dialog(self):
+        default = "LIVE" if self.model.load_patterns else "DEAD"
+        dialog = dialogs.AddLoadPatternDialog(self.window, default)
+        if dialog.exec():
+            name, self_weight = dialog.get_data()
+            self.model.add_load_pattern(name, self_weight)
+            note = f" (self weight x{self_weight:g})" if self_weight else ""
+            self.window.terminal.print_message(f">> Load Pattern Added: {name}{note}")
+
+    def assign_nodal_loads(self):
+        ids = self.window.central_container.viewport.selected_node_ids.selected_ids()
+        self._assign_loads("Joint Loads", ids, "joints", NODAL_COMPONENTS, "kN", self.model.set_nodal_loads)
+
+    def assign_frame_loads(self):
+        ids = self.window.central_container.viewport.selected_frame_ids.selected_ids()
+        self._assign_loads("Frame Distributed Loads", ids, "frames", MEMBER_COMPONENTS, "kN/m",
+                           self.model.set_member_loads)
+
+    def _assign_loads(self, title, ids, noun, components, unit, assign):
+        if not len(ids):
+            self.window.statusBar().showMessage(f"{title}: no {noun} selected", 3000)
+            return
+        if not self.model.load_patterns:
+            self.window.statusBar().showMessage(f"{title}: define a load pattern first", 3000)
+            return
+        dialog = dialogs.AssignLoadDialog(title, self.model.load_patterns, components, unit, self.window)
+        if not dialog.exec():
+            return
+        pattern_id, values, mode = dialog.get_data()
+        if mode == "delete":
+            values = [0.0] * len(components)
+        with perf.timed("controller.assign_loads"):
+            count = assign(pattern_id, ids, values, add=(mode == "add"))
+        name = self.model.get_load_pattern(pattern_id)[1]
+        self.window.terminal.print_message(f">> {title} ({name}, {mode}): {count} {noun}")
+        self.shown_load_pattern = pattern_id
+        self._refresh_load_arrows()
+
+    def show_loads(self):
+        patterns = self.model.load_patterns
+        names = ["None"] + [name for _, name, _ in patterns]
+        ids = [None] + [pattern_id for pattern_id, _, _ in patterns]
+        current = ids.index(self.shown_load_pattern) if self.shown_load_pattern in ids else 0
+        name, ok = QInputDialog.getItem(self.window, "Show Loads", "Load pattern:", names, current, False)
+        if not ok:
+            return
+        self.shown_load_pattern = ids[names.index(name)]
+        self._refresh_load_arrows()
+        if self.shown_load_pattern is not None:
+            # Resultante del patrón (nodales + equivalentes de frames y peso propio)
+            total = self.model.equivalent_nodal_loads(self.shown_load_pattern).sum(axis=0)
+            self.window.terminal.print_message(
+                f">> Loads '{name}': resultant Fx={total[0]:.4g}, Fy={total[1]:.4g}, Fz={total[2]:.4g} kN")
+            if self.model.get_load_pattern(self.shown_load_pattern)[2]:
+                # El peso propio solo cuenta los frames con material y sección
+                props = self.model.element_properties()
+                missing = int(np.isnan(props["gamma"] * props["A"]).sum())
+                if missing:
+                    self.window.terminal.print_message(
+                        f">> Self weight ignores {missing} frames without material / section")
+
+    @perf.measure("controller.refresh_load_arrows")
+    def _refresh_load_arrows(self):
+        vp = self.window.central_container.viewport
+        pattern_id = self.shown_load_pattern
+        if pattern_id is None:
+            vp.set_load_arrows(np.zeros((0, 3), dtype=np.float32), None)
+            return
+        m = self.model
+        coords = m.node_coords
+        node_ids, nodal = m.nodal_loads.of_pattern(pattern_id)
+        node_pos = coords[m.node_rows(node_ids)]
+        elem_ids, w = m.member_loads.of_pattern(pattern_id)
+        ends = m.node_rows(m.element_conn[m.element_rows(elem_ids)])
+        ok = (ends >= 0).all(axis=1)
+        ends, w = ends[ok], w[ok]
+        # Flecha mayor: una fracción del tamaño del modelo
+        (x0, x1, y0, y1, z0, z1), _ = m.get_bounds_with_revision()
+        length = 0.08 * max(x1 - x0, y1 - y0, z1 - z0, 1.0)
+        pos, colors = glyphs.load_arrows(node_pos, nodal[:, :3], coords[ends[:, 0]], coords[ends[:, 1]], w, length)
+        vp.set_load_arrows(pos, colors)
+
     # --- VIEW ACTIONS ---
     def toggle_axes(self, checked):
         self.window.central_container.viewport.toggle_axes(checked)
@@ -104,7 +478,91 @@ class MainController:
     def toggle_frame_ids(self, checked):
         self.window.central_container.viewport.toggle_frame_ids(checked)
 
+    # --- LOG ---
+    def toggle_log_to_file(self, checked):
+        terminal = self.window.terminal
+        if checked:
+            path, _ = QFileDialog.getSaveFileName(self.window, "Log to File", "session.log", "Log (*.log *.txt)")
+            if not path:
+                self.window.log_to_file_action.setChecked(False)
+                return
+            terminal.set_log_file(path)
+            terminal.print_message(f">> Logging to {path}")
+        else:
+            terminal.print_message(">> File logging stopped")
+            terminal.close_log_file()
+
+    # --- EXPORT ---
+    def export_model(self, fmt):
+        filters = {"tcl": "OpenSees Tcl (*.tcl)", "py": "OpenSees Python (*.py)", "csv": "CSV (*.csv)"}
+        path, _ = QFileDialog.getSaveFileName(self.window, f"Export {export.FORMATS[fmt]}",
+                                              f"model.{fmt}", filters[fmt])
+        if not path:
+            return
+        terminal = self.window.terminal
+
+        def done(stats):
+            terminal.print_message(
+                f">> Exported {', '.join(stats['paths'])}: {stats['rows']} rows, "
+                f"{stats['bytes'] / 1e6:.1f} MB in {stats['elapsed']:.2f} s ({stats['mb_per_s']:.1f} MB/s)")
+            if stats["skipped_elements"]:
+                terminal.print_message(
+                    f">> Export skipped {stats['skipped_elements']} frames with missing nodes")
+            if stats["unassigned_elements"]:
+                terminal.print_message(
+                    f">> {stats['unassigned_elements']} frames without material/section exported "
+                    f"with placeholder properties")
+
+        self.tasks.submit(f"Export {export.FORMATS[fmt]}", _export_model, export.snapshot(self.model),
+                          path, fmt, on_result=done,
+                          on_error=lambda tb: terminal.print_message(f">> Export failed:\n{tb.rstrip()}"),
+                          on_cancel=lambda: terminal.print_message(">> Export cancelled"))
+
+    # --- PERFORMANCE ---
+    def toggle_performance(self, checked):
+        perf.enabled = checked
+        self.window.central_container.set_perf_overlay_visible(checked)
+        self.window.terminal.print_message(">> Performance instrumentation " + ("ON" if checked else "OFF"))
+
+    def dump_performance_stats(self):
+        self.window.terminal.print_message(perf.report())
+
+    def save_performance_stats(self):
+        path, _ = QFileDialog.getSaveFileName(self.window, "Save Performance Stats", "perf.json",
+                                              "JSON (*.json);;Text (*.txt)")
+        if path:
+            perf.dump(path)
+            self.window.terminal.print_message(f">> Performance stats saved: {path}")
+
+    # --- MEMORIA ---
+    def memory_report(self):
+        container = self.window.central_container
+        # El modelo se declara primero: las listas de tuplas que comparte con la escena cuentan allí
+        report = MemoryReport.collect(
+            self.model, self.journal,
+            container.viewport.scene if container.is_viewport_created() else None,
+            self.window.node_table, self.window.element_table,
+            self.window.material_table, self.window.section_table)
+        terminal = self.window.terminal
+        terminal.print_message(report.format(n_nodes=len(self.model.node_ids)))
+        if allocations.active:
+            rows = allocations.since_last()
+            terminal.print_message("Allocations since last report:" if rows is not None else
+                                   "Allocations: baseline snapshot taken (the next report shows the difference)")
+            if rows is not None:
+                terminal.print_message(allocations.format_diff(rows))
+            terminal.print_message(allocations.report())
+
+    def toggle_allocation_tracking(self, checked):
+        if checked:
+            allocations.start()
+            allocations.since_last()  # punto de partida del próximo informe
+        else:
+            allocations.stop()
+        self.window.terminal.print_message(">> Allocation tracking " + ("ON" if checked else "OFF"))
+
     # --- CREATE FRAME ---
+    @perf.measure("controller.create_frame")
     def on_create_frame(self, n1, n2):
         elem_id = self.model.add_element(n1, n2)
         if elem_id:
@@ -114,27 +572,30 @@ class MainController:
             self.window.statusBar().showMessage("Invalid Frame", 3000)
 
     # --- SELECTION & DELETE ---
+    @perf.measure("controller.node_selection")
     def on_viewport_node_selection(self, selected_ids):
         if self.window.node_table.isVisible():
             self.window.node_table.select_rows_by_ids(selected_ids)
         self.update_delete_button_state()
 
+    @perf.measure("controller.frame_selection")
     def on_viewport_frame_selection(self, selected_ids):
         if self.window.element_table.isVisible():
             self.window.element_table.select_rows_by_ids(selected_ids)
         self.update_delete_button_state()
 
+    @perf.measure("controller.node_table_selection")
     def on_node_table_selection(self, selected_ids):
         self.window.central_container.viewport.set_selection(node_ids=selected_ids)
         self.update_delete_button_state()
 
+    @perf.measure("controller.frame_table_selection")
     def on_frame_table_selection(self, selected_ids):
         self.window.central_container.viewport.set_selection(frame_ids=selected_ids)
         self.update_delete_button_state()
 
     def update_delete_button_state(self):
-        vp = self.window.central_container.viewport
-        count = len(vp.selected_node_ids) + len(vp.selected_frame_ids)
+        count = self.window.central_container.viewport.selection.count()
         if count > 0:
             self.delete_action.setEnabled(True)
             self.delete_action.setText(f"Delete ({count})")
@@ -142,29 +603,87 @@ class MainController:
             self.delete_action.setEnabled(False)
             self.delete_action.setText("Delete Selected")
 
+    @perf.measure("controller.delete_selected")
     def delete_selected_items(self):
         vp = self.window.central_container.viewport
-        nodes = vp.selected_node_ids.copy()
-        frames = vp.selected_frame_ids.copy()
-        
-        for fid in frames:
-            self.model.delete_element(fid)
-            self.window.terminal.print_message(f">> Frame {fid} deleted.")
-        for nid in nodes:
-            self.model.delete_node(nid)
-            self.window.terminal.print_message(f">> Node {nid} deleted.")
+        nodes = vp.selected_node_ids.selected_ids()
+        frames = vp.selected_frame_ids.selected_ids()
+
+        self.model.delete_elements(frames)
+        self.model.delete_nodes(nodes)
+        self.window.terminal.print_bulk("Deleted", "frame", frames)
+        self.window.terminal.print_bulk("Deleted", "node", nodes)
             
         vp.set_selection([], [])
         self._refresh_all_views()
         self.update_delete_button_state()
 
+    # --- SELECT (consultas vectorizadas sobre las columnas del modelo) ---
+    def select_all(self):
+        self.window.central_container.viewport.select_all()
+
+    def select_none(self):
+        self.window.central_container.viewport.clear_selection()
+
+    def select_invert(self):
+        self.window.central_container.viewport.invert_selection()
+
+    def _run_selection_query(self, dialog_cls):
+        dialog = dialog_cls(self.window)
+        if not dialog.exec():
+            return None, None
+        return dialog.get_query(), dialog.get_mode()
+
+    @perf.measure("controller.select_query")
+    def _apply_query(self, mode, node_mask=None, frame_mask=None):
+        vp = self.window.central_container.viewport
+        vp.select_masked(node_ids=self.model.node_ids, node_mask=node_mask,
+                         frame_ids=self.model.element_ids, frame_mask=frame_mask, mode=mode)
+        self.window.statusBar().showMessage(
+            f"Selected: {vp.selection.nodes.count()} nodes, {vp.selection.frames.count()} frames", 5000)
+
+    def select_nodes_in_range(self):
+        query, mode = self._run_selection_query(dialogs.SelectNodesInRangeDialog)
+        if query is not None:
+            lo, hi = query
+            self._apply_query(mode, node_mask=selection.nodes_in_box(self.model.node_coords, lo, hi))
+
+    def select_nodes_on_plane(self):
+        query, mode = self._run_selection_query(dialogs.SelectNodesOnPlaneDialog)
+        if query is not None:
+            point, normal, tol = query
+            self._apply_query(mode, node_mask=selection.nodes_on_plane(self.model.node_coords, point, normal, tol))
+
+    def select_frames_by_orientation(self):
+        query, mode = self._run_selection_query(dialogs.SelectFramesByOrientationDialog)
+        if query is not None:
+            kind, angle_tol = query
+            mask = selection.frame_orientation_mask(self.model.element_vectors(), kind, angle_tol)
+            self._apply_query(mode, frame_mask=mask)
+
+    def select_frames_by_length(self):
+        query, mode = self._run_selection_query(dialogs.SelectFramesByLengthDialog)
+        if query is not None:
+            min_length, max_length = query
+            mask = selection.frames_by_length(self.model.element_vectors(), min_length, max_length)
+            self._apply_query(mode, frame_mask=mask)
+
+    def select_frames_by_property(self):
+        dialog = dialogs.SelectFramesByPropertyDialog(self.model.get_materials_data(),
+                                                      self.model.get_sections_data(), self.window)
+        if not dialog.exec():
+            return
+        kind, value = dialog.get_query()
+        column = self.model.element_section_ids if kind == "section" else self.model.element_material_ids
+        self._apply_query(dialog.get_mode(), frame_mask=selection.frames_with_attribute(column, value))
+
     # --- PANELS ---
+    @perf.measure("controller.tree_item_selected")
     def on_tree_item_selected(self, item_name):
         vp = self.window.central_container.viewport
         if item_name == "Geometry":
             self.window.set_right_panel("Geometry")
-            _, full_data = self.model.get_nodes_data()
-            self.window.node_table.update_data(full_data)
+            self.window.node_table.update_data(self.model.nodes)
             self.window.node_table.select_rows_by_ids(vp.selected_node_ids)
         elif item_name == "Elements": 
             self.window.set_right_panel("Elements")
@@ -175,28 +694,149 @@ class MainController:
             self.window.set_right_panel("Materials")
             materials = self.model.get_materials_data()
             self.window.material_table.update_data(materials)
+        elif item_name == "Sections":
+            self.window.set_right_panel("Sections")
+            self.window.section_table.update_data(self.model.get_sections_data())
         else:
             self.window.set_right_panel("Editor")
 
     # --- ADD NODE & REFRESH ---
     def open_add_node_dialog(self):
-        dialog = AddNodeDialog(self.window)
+        dialog = dialogs.AddNodeDialog(self.window)
         if dialog.exec():
             x, y, z = dialog.get_coordinates()
             nid = self.model.add_node(x, y, z)
             self.window.terminal.print_message(f">> Joint Added: {nid}")
             self._refresh_all_views()
-            # Ajustar grid solo si es necesario (opcional)
-            self.window.central_container.viewport.auto_adjust_grid(self.model.get_model_bounds())
 
+    @perf.measure("controller.refresh_all_views")
     def _refresh_all_views(self):
-        coords, nodes = self.model.get_nodes_data()
+        # Lista de tuplas cacheada del modelo (sin la copia float32 de get_nodes_data)
+        nodes = self.model.nodes
         elems = self.model.get_elements_data()
-        self.window.central_container.viewport.update_scene_data(nodes, elems)
-        self.window.node_table.update_data(nodes)
-        self.window.element_table.update_data(elems)
-        self.window.central_container.viewport.auto_adjust_grid(self.model.get_model_bounds())
+        # Con Help -> Track Allocations, lo que reservan escena y tablas queda en el informe
+        with allocations.track("refresh_all_views"):
+            self.window.central_container.viewport.update_scene_data(nodes, elems)
+            self.window.node_table.update_data(nodes)
+            self.window.element_table.update_data(elems)
+        if self.shown_load_pattern is not None:
+            self._refresh_load_arrows()
+        # El viewport omite el ajuste si la revisión de la caja no cambió
+        bounds, bounds_rev = self.model.get_bounds_with_revision()
+        self.window.central_container.viewport.auto_adjust_grid(bounds, bounds_rev)
+
+    def zoom_extents(self):
+        bounds, bounds_rev = self.model.get_bounds_with_revision()
+        for vp in self.window.central_container.viewports:
+            vp.fit_to_bounds(bounds, bounds_rev)
+
+    def set_view_layout(self, count):
+        with perf.timed("controller.set_view_layout"):
+            self.window.central_container.set_pane_count(count)
+        self.window.statusBar().showMessage(f"Layout: {count} view{'s' if count > 1 else ''}", 3000)
+
+    # --- SCRIPTS (hilo de trabajo, cambios por transacciones) ---
+    def _get_script_runner(self):
+        if self.script_runner is None:
+            runner = script_runner.ScriptRunner(self.model, self.tasks)
+            runner.output.connect(self.window.terminal.print_message)
+            runner.committed.connect(self._refresh_all_views)
+            runner.finished.connect(self.on_script_finished)
+            self.script_runner = runner
+        return self.script_runner
+
+    def run_script(self, source, filename):
+        if self._get_script_runner().run(source, filename):
+            self.window.script_editor.set_running(True)
+            self.window.terminal.print_message(f">> Running script {filename} ...")
+
+    def run_console_line(self, line):
+        self.window.terminal.print_message(f">>> {line}")
+        if self._get_script_runner().run(line, "<console>", namespace=self._console_namespace):
+            self.window.script_editor.set_running(True)
+
+    def stop_script(self):
+        if self.script_runner is not None and self.script_runner.is_running():
+            self.window.terminal.print_message(">> Stopping script ...")
+            self.script_runner.cancel()
+
+    def on_script_finished(self, result):
+        self.window.script_editor.set_running(False)
+        c = result["committed"]
+        parts = [f"{sign}{c[key]} {noun}" for key, sign, noun in (
+            ("nodes", "+", "nodes"), ("elements", "+", "frames"),
+            ("deleted_nodes", "-", "nodes"), ("deleted_elements", "-", "frames")) if c[key]]
+        summary = ", ".join(parts) or "no model changes"
+        if c["merged_nodes"]:
+            summary += f" ({c['merged_nodes']} nodes merged on insert)"
+        if c["rejected_elements"]:
+            # Sus IDs los devolvió add_element(s) al script, pero no existen en el modelo
+            ids = c["rejected_element_ids"]
+            shown = ", ".join(str(i) for i in ids[:10]) + (", ..." if len(ids) > 10 else "")
+            summary += f" ({c['rejected_elements']} duplicate or zero-length frames skipped: ids {shown})"
+        if result["cancelled"]:
+            self.window.terminal.print_message(f">> Script cancelled after {result['elapsed']:.2f} s (applied: {summary})")
+        elif result["error"]:
+            self.window.terminal.print_message(result["error"].rstrip())
+            self.window.terminal.print_message(f">> Script failed after {result['elapsed']:.2f} s (applied: {summary})")
+        elif result["script"] != "<console>":
+            self.window.terminal.print_message(f">> Script finished in {result['elapsed']:.2f} s: {summary}")
+
+    # --- AUTOSAVE ---
+    AUTOSAVE_CHECK_MS = 10000
+
+    def start_autosave(self):
+        """Ofrece recuperar la sesión anterior (si no se cerró limpiamente) y empieza el journal."""
+        terminal = self.window.terminal
+        self.journal = journal.Journal()
+        directory = self.journal.directory
+        if journal.has_recovery(directory):
+            answer = QMessageBox.question(
+                self.window, "Recover Model",
+                "The previous session did not close cleanly.\nRecover the autosaved model?")
+            if answer == QMessageBox.StandardButton.Yes:
+                try:
+                    stats = journal.recover(self.model, directory)
+                except (OSError, ValueError, KeyError) as exc:
+                    terminal.print_message(f">> Autosave recovery failed: {exc}")
+                    journal.discard_files(directory)
+                else:
+                    note = " (incomplete tail ignored)" if stats["truncated"] else ""
+                    terminal.print_message(
+                        f">> Recovered {stats['nodes']} nodes, {stats['elements']} frames from autosave: "
+                        f"{stats['records']} journal records in {stats['elapsed']:.2f} s{note}")
+                    self._refresh_all_views()
+                    self.zoom_extents()
+            else:
+                journal.discard_files(directory)
+        # El primer snapshot sustituye a los archivos recuperados (nueva generación)
+        try:
+            self.journal.start(self.model)
+        except OSError as exc:
+            terminal.print_message(f">> Autosave disabled: {exc}")
+            return
+        self._autosave_timer = QTimer(self.window)
+        self._autosave_timer.timeout.connect(self._check_autosave)
+        self._autosave_timer.start(self.AUTOSAVE_CHECK_MS)
+
+    def _check_autosave(self):
+        if self.journal.error is not None:
+            self.window.terminal.print_message(f">> Autosave stopped: {self.journal.error}")
+            self._autosave_timer.stop()
+        elif self.journal.snapshot_due():
+            self.journal.snapshot()
+
+    def stop_autosave(self):
+        # Cierre limpio: no queda nada que recuperar
+        if self._autosave_timer is not None:
+            self._autosave_timer.stop()
+        if self.journal is not None:
+            self.journal.close(discard=True)
 
     def run(self):
+        self.app.aboutToQuit.connect(self.tasks.shutdown)
+        self.app.aboutToQuit.connect(self.window.terminal.close_log_file)
+        self.app.aboutToQuit.connect(self.stop_autosave)
         self.window.show()
+        self.start_autosave()
         sys.exit(self.app.exec())
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+Ejecución de scripts de usuario como tarea en segundo plano (app/controllers/tasks.py).
+
+El script recibe un ModelTransaction (app/models/transaction.py) como `model`;
+todo acceso real al DocumentModel se hace en el hilo de la GUI a través de
+`ctx.call_in_gui`, de modo que el event loop sigue respondiendo mientras el
+script genera geometría. Stop = flag cooperativo + excepción asíncrona (la
+tarea es 'interruptible', para bucles que no llaman al modelo).
+"""
+import io
+import time
+import traceback
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from app.batch import build_namespace
+from app.controllers.tasks import TaskCancelled
+from app.models.transaction import ModelTransaction, ScriptCancelled
+
+
+class ScriptRunner(QObject):
+    output = pyqtSignal(str)
+    committed = pyqtSignal()        # tras cada checkpoint aplicado (refrescar vistas)
+    finished = pyqtSignal(dict)     # resumen: ok, cancelled, error, elapsed, committed
+
+    def __init__(self, model, tasks, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.tasks = tasks
+        self._handle = None
+
+    def is_running(self):
+        return self._handle is not None and not self._handle.done
+
+    # --- API ---
+    def run(self, source, filename="<editor>", params=None, namespace=None):
+        """Lanza el script. `namespace` permite conservar variables entre ejecuciones (consola)."""
+        if self.is_running():
+            return False
+        name = "Console" if filename == "<console>" else f"Script {filename}"
+        started = time.perf_counter()
+
+        def aborted(error=None):
+            # La tarea terminó sin devolver resumen (excepción fuera del script)
+            self.finished.emit({"script": filename, "ok": False, "cancelled": error is None,
+                                "error": error, "committed": ModelTransaction.empty_summary(),
+                                "elapsed": time.perf_counter() - started})
+
+        self._handle = self.tasks.submit(name, self._execute, source, filename, params, namespace,
+                                         on_result=self.finished.emit, on_error=aborted,
+                                         on_cancel=aborted, interruptible=True)
+        return True
+
+    def cancel(self):
+        if self.is_running():
+            self._handle.cancel()
+
+    # --- Hilo de trabajo ---
+    def _print(self, *args, sep=" ", end="\n", file=None, flush=False):
+        buf = io.StringIO()
+        print(*args, sep=sep, end=end, file=buf)
+        text = buf.getvalue()
+        if text.endswith("\n"):
+            text = text[:-1]
+        self.output.emit(text)
+
+    def _execute(self, ctx, source, filename, params, namespace):
+        t0 = time.perf_counter()
+        tx = ModelTransaction(self.model, ctx.call_in_gui, ctx.cancel_event, on_commit=self.committed.emit)
+        result = {"script": filename, "ok": False, "cancelled": False, "error": None}
+        try:
+            try:
+                code, is_expr = _compile(source, filename, interactive=namespace is not None)
+                ns = build_namespace(model=tx, params=params, script_path=filename)
+                if namespace is not None:
+                    # Consola: variables del usuario persistentes, modelo nuevo en cada ejecución
+                    namespace.update({k: v for k, v in ns.items() if k not in namespace or k == "model"})
+                    ns = namespace
+                ns["print"] = self._print
+                ns["checkpoint"] = tx.checkpoint
+                ns["progress"] = ctx.progress
+                if is_expr:
+                    value = eval(code, ns)
+                    if value is not None:
+                        self._print(repr(value))
+                else:
+                    exec(code, ns)
+                tx.checkpoint()
+                result["ok"] = True
+            except (ScriptCancelled, TaskCancelled):
+                tx.discard()
+                result["cancelled"] = True
+            except SystemExit as e:
+                tx.checkpoint()
+                result["ok"] = e.code in (None, 0)
+                if not result["ok"]:
+                    result["error"] = f"SystemExit({e.code})"
+            except Exception as e:
+                tx.discard()
+                # Sin el marco del propio runner: la traza empieza en el script
+                result["error"] = "".join(traceback.format_exception(type(e), e, e.__traceback__.tb_next))
+        except (ScriptCancelled, TaskCancelled):
+            # La excepción asíncrona puede llegar ya dentro de los manejadores
+            tx.discard()
+            result["cancelled"] = True
+        result["committed"] = dict(tx.committed, rejected_element_ids=list(tx.committed["rejected_element_ids"]))
+        result["elapsed"] = time.perf_counter() - t0
+        return result
+
+
+def _compile(source, filename, interactive):
+    """En la consola una expresión suelta se evalúa y se imprime su valor (como en el REPL)."""
+    if interactive:
+        try:
+            return compile(source, filename, "eval"), True
+        except SyntaxError:
+            pass
+    return compile(source, filename, "exec"), False
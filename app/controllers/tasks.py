@@ -0,0 +1,242 @@
+"""
+Tareas en segundo plano (QThreadPool) con progreso, cancelación cooperativa
+y entrega del resultado en el hilo de la GUI.
+
+    handle = tasks.submit("Merge nodes", fn, coords, tol, on_result=apply)
+
+`fn(ctx, *args)` corre en un hilo del pool y NO debe mutar el modelo:
+trabaja sobre copias y devuelve un resultado que `on_result` aplica en el
+hilo de la GUI (o usa `ctx.call_in_gui(fn)` para aplicar cambios a mitad de
+tarea). DocumentModel.bind_to_current_thread() hace cumplir esta regla.
+"""
+import ctypes
+import itertools
+import threading
+import time
+import traceback
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, Qt
+
+
+class TaskCancelled(Exception):
+    """Se lanza dentro de la tarea cuando se cancela."""
+
+
+class WorkerSignals(QObject):
+    # Emitidas desde el hilo del pool; al vivir en el hilo GUI llegan encoladas
+    progress = pyqtSignal(object, float, str)    # (handle, fracción 0..1 o -1 = indeterminado, mensaje)
+    finished = pyqtSignal(object, object)        # (handle, resultado)
+    failed = pyqtSignal(object, str)             # (handle, traceback)
+    cancelled = pyqtSignal(object)               # (handle)
+
+
+class TaskContext:
+    """Lo que ve la función de la tarea: progreso, cancelación y llamadas al hilo GUI."""
+    PROGRESS_INTERVAL_S = 0.05
+
+    def __init__(self, handle, manager):
+        self._handle = handle
+        self._manager = manager
+        self._last_progress = 0.0
+
+    @property
+    def cancelled(self):
+        return self._handle._cancel.is_set()
+
+    @property
+    def cancel_event(self):
+        """threading.Event de la cancelación (para código que no conoce TaskContext)."""
+        return self._handle._cancel
+
+    def check_cancelled(self):
+        if self._handle._cancel.is_set():
+            raise TaskCancelled()
+
+    def progress(self, done, total=None, message=""):
+        """Informa del avance (limitado a ~20 emisiones/s). total=None -> indeterminado."""
+        self.check_cancelled()
+        now = time.monotonic()
+        final = total is not None and done >= total
+        if not final and now - self._last_progress < self.PROGRESS_INTERVAL_S:
+            return
+        self._last_progress = now
+        fraction = -1.0 if not total else min(1.0, done / total)
+        self._handle.signals.progress.emit(self._handle, fraction, message)
+
+    def call_in_gui(self, fn):
+        """Ejecuta fn() en el hilo GUI y devuelve su resultado (bloquea a la tarea)."""
+        future = Future()
+        self._manager._call.emit((fn, future))
+        while True:
+            try:
+                return future.result(timeout=0.1)
+            except FutureTimeout:
+                # Si aún no empezó, se puede abandonar; si ya corre, hay que esperar
+                if self.cancelled and future.cancel():
+                    raise TaskCancelled()
+
+
+class TaskHandle:
+    def __init__(self, task_id, name, interruptible):
+        self.id = task_id
+        self.name = name
+        self.interruptible = interruptible
+        self.signals = WorkerSignals()
+        self.fraction = -1.0
+        self.message = ""
+        self.done = False
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._thread_ident = None
+
+    def cancel(self):
+        """Cancelación cooperativa; las tareas 'interruptible' reciben además una excepción asíncrona."""
+        self._cancel.set()
+        if not self.interruptible:
+            return
+        with self._lock:
+            if self._thread_ident is not None:
+                ctypes.pythonapi.PyThreadState_SetAsyncExc(
+                    ctypes.c_ulong(self._thread_ident), ctypes.py_object(TaskCancelled))
+
+    @property
+    def cancel_requested(self):
+        return self._cancel.is_set()
+
+
+class _Task(QRunnable):
+    def __init__(self, handle, context, fn, args, kwargs):
+        super().__init__()
+        self.handle = handle
+        self.context = context
+        self.fn, self.args, self.kwargs = fn, args, kwargs
+        self._ended = False
+
+    def run(self):
+        # Ninguna excepción puede escapar de QRunnable.run (PyQt abortaría)
+        try:
+            self._run()
+        except BaseException:
+            pass
+        # Una cancelación asíncrona pudo cortar _run en sus manejadores, antes de
+        # emitir: sin alguna señal final la tarea quedaría activa para siempre
+        while not self._ended:
+            try:
+                self._detach_thread()
+                if self.handle._cancel.is_set():
+                    self.handle.signals.cancelled.emit(self.handle)
+                else:
+                    self.handle.signals.failed.emit(self.handle, "Task aborted before reporting its outcome")
+                self._ended = True
+            except BaseException:
+                pass
+
+    def _detach_thread(self):
+        # Tras esto handle.cancel() ya no puede lanzar excepciones asíncronas a este hilo
+        handle = self.handle
+        with handle._lock:
+            ident, handle._thread_ident = handle._thread_ident, None
+            if ident is not None:
+                # Descartar una excepción asíncrona que no llegó a entregarse
+                ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(ident), None)
+
+    def _run(self):
+        handle = self.handle
+        with handle._lock:
+            handle._thread_ident = threading.get_ident()
+        outcome, payload = "cancelled", None
+        try:
+            if handle._cancel.is_set():
+                raise TaskCancelled()
+            payload = self.fn(self.context, *self.args, **self.kwargs)
+            outcome = "finished"
+        except TaskCancelled:
+            outcome = "cancelled"
+        except BaseException as e:
+            outcome = "failed"
+            payload = "".join(traceback.format_exception(type(e), e, e.__traceback__))
+        finally:
+            self._detach_thread()
+        if outcome == "finished":
+            handle.signals.finished.emit(handle, payload)
+        elif outcome == "failed":
+            handle.signals.failed.emit(handle, payload)
+        else:
+            handle.signals.cancelled.emit(handle)
+        self._ended = True
+
+
+class TaskManager(QObject):
+    taskStarted = pyqtSignal(object)
+    taskProgress = pyqtSignal(object)
+    taskEnded = pyqtSignal(object)
+    # Fallo de una tarea sin on_error propio: (handle, traceback)
+    taskFailed = pyqtSignal(object, str)
+    _call = pyqtSignal(object)
+
+    def __init__(self, max_threads=None, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        if max_threads:
+            self.pool.setMaxThreadCount(max_threads)
+        self._ids = itertools.count(1)
+        self._active = {}
+        self._call.connect(self._on_call, Qt.ConnectionType.QueuedConnection)
+
+    def _on_call(self, job):
+        fn, future = job
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+
+    # --- API ---
+    def submit(self, name, fn, *args, on_result=None, on_error=None, on_cancel=None,
+               interruptible=False, **kwargs):
+        """
+        Lanza fn(ctx, *args, **kwargs) en el pool. Los callbacks se ejecutan en
+        el hilo GUI: on_result(resultado), on_error(traceback), on_cancel().
+        Sin on_error, el fallo se emite en taskFailed(handle, traceback).
+        interruptible=True permite cortar bucles que nunca consultan ctx (scripts).
+        """
+        handle = TaskHandle(next(self._ids), name, interruptible)
+        context = TaskContext(handle, self)
+
+        def ended(h, callback, *payload):
+            h.done = True
+            self._active.pop(h.id, None)
+            self.taskEnded.emit(h)
+            if callback is not None:
+                callback(*payload)
+
+        handle.signals.progress.connect(self._on_progress)
+        handle.signals.finished.connect(lambda h, r: ended(h, on_result, r))
+        if on_error is None:
+            on_error = lambda tb: self.taskFailed.emit(handle, tb)
+        handle.signals.failed.connect(lambda h, tb: ended(h, on_error, tb))
+        handle.signals.cancelled.connect(lambda h: ended(h, on_cancel))
+
+        self._active[handle.id] = handle
+        self.taskStarted.emit(handle)
+        self.pool.start(_Task(handle, context, fn, args, kwargs))
+        return handle
+
+    def _on_progress(self, handle, fraction, message):
+        if handle.done:
+            return
+        handle.fraction, handle.message = fraction, message
+        self.taskProgress.emit(handle)
+
+    def active_tasks(self):
+        return list(self._active.values())
+
+    def cancel_all(self):
+        for handle in self.active_tasks():
+            handle.cancel()
+
+    def shutdown(self, timeout_ms=3000):
+        self.cancel_all()
+        self.pool.waitForDone(timeout_ms)
@@ -0,0 +1,25 @@
+"""
+Import perezoso de subsistemas pesados (análisis, importadores, exportadores,
+visores de resultados...). El módulo no se ejecuta hasta el primer acceso a
+uno de sus atributos, así que no cuenta para el tiempo de arranque.
+
+    dialogs = lazy_import("app.views.dialogs")
+    ...
+    dialogs.AddNodeDialog(parent)   # <- aquí se importa de verdad
+"""
+import sys
+import importlib.util
+
+
+def lazy_import(name):
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,266 @@
+"""
+Contabilidad de memoria por subsistema (sin dependencias de Qt).
+
+Cada dueño de datos grandes (modelo, journal, escena del viewport, tablas)
+implementa `memory_footprint(report)` y anota sus partidas con
+report.add(subsistema, partida, bytes). El informe no cuenta dos veces el
+mismo objeto: la lista de tuplas que comparten modelo y viewport, o las
+vistas de un array, se atribuyen al primero que las declara.
+
+    from app.memory import MemoryReport, allocations
+
+    report = MemoryReport.collect(model, journal, viewport.scene)
+    print(report.format())
+    report.bytes_per_node(len(model.node_ids))
+
+    allocations.start()                       # tracemalloc, opcional
+    with allocations.track("replicate"):
+        model.replicate(...)
+    print(allocations.report())
+
+Los arrays numpy se miden exactos (nbytes de su buffer propio); las
+estructuras Python se miden con sys.getsizeof recursivo (por muestreo en
+listas grandes) y los objetos de Qt se estiman (no son visibles desde Python).
+"""
+import contextlib
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+SUBSYSTEMS = ("model arrays", "render buffers", "table models", "caches", "undo journal")
+# Estimación por celda de QTableWidget: QTableWidgetItem + QVariant + texto corto (C++, no medible)
+TABLE_CELL_BYTES = 160
+# Listas/tuplas más largas que esto se miden por muestreo
+_SAMPLE_THRESHOLD = 4096
+_SAMPLE_SIZE = 1024
+# Ruido que tracemalloc no debe atribuir a la aplicación (él mismo, este módulo e importaciones)
+_TRACE_FILTERS = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__),
+                  tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                  tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>")]
+
+
+def _format_bytes(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024.0
+
+
+def process_rss():
+    """Memoria residente actual del proceso en bytes (None si el sistema no la expone)."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Pico (no actual) donde no hay /proc: KB en Linux, bytes en macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MemoryReport:
+    def __init__(self):
+        self.items = {name: {} for name in SUBSYSTEMS}  # subsistema -> {partida: bytes}
+        self.disk = {}                                   # partida -> bytes (fuera de memoria)
+        self._seen = set()
+
+    @classmethod
+    def collect(cls, *owners):
+        """Informe con las partidas de cada dueño (los None se ignoran)."""
+        report = cls()
+        for owner in owners:
+            if owner is not None:
+                owner.memory_footprint(report)
+        return report
+
+    # --- Medición (sin contar dos veces) ---
+    def nbytes(self, *arrays):
+        """Bytes de buffers numpy; una vista cuenta como su base, y cada base una sola vez."""
+        total = 0
+        for a in arrays:
+            if not isinstance(a, np.ndarray):
+                continue
+            base = a
+            while isinstance(getattr(base, "base", None), np.ndarray):
+                base = base.base
+            if id(base) in self._seen:
+                continue
+            self._seen.add(id(base))
+            total += base.nbytes
+        return total
+
+    def sizeof(self, obj):
+        """Tamaño profundo de estructuras Python (listas, tuplas, dicts, arrays dentro)."""
+        return self._sizeof(obj)
+
+    def _sizeof(self, obj):
+        if isinstance(obj, np.ndarray):
+            return self.nbytes(obj)
+        if id(obj) in self._seen:
+            return 0
+        self._seen.add(id(obj))
+        size = sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            return size + sum(self._sizeof(k) + self._sizeof(v) for k, v in obj.items())
+        if isinstance(obj, (list, tuple, set, frozenset)):
+            n = len(obj)
+            if n > _SAMPLE_THRESHOLD and isinstance(obj, (list, tuple)):
+                # Listas homogéneas grandes (filas de tablas): se extrapola una muestra
+                picks = np.linspace(0, n - 1, _SAMPLE_SIZE).astype(np.int64)
+                sample = sum(self._sizeof(obj[i]) for i in picks.tolist())
+                return size + int(sample * n / len(picks))
+            return size + sum(self._sizeof(v) for v in obj)
+        if type(obj).__module__.startswith("app."):
+            # Objetos propios: se recorren sus atributos (los de Qt/pyqtgraph no)
+            for name in getattr(type(obj), "__slots__", ()):
+                size += self._sizeof(getattr(obj, name, None))
+            if hasattr(obj, "__dict__"):
+                size += self._sizeof(vars(obj))
+        return size
+
+    # --- Partidas ---
+    def add(self, subsystem, item, nbytes):
+        if subsystem not in self.items:
+            raise ValueError(f"Unknown subsystem '{subsystem}' (expected one of {SUBSYSTEMS})")
+        bucket = self.items[subsystem]
+        bucket[item] = bucket.get(item, 0) + int(nbytes)
+
+    def add_disk(self, item, nbytes):
+        self.disk[item] = self.disk.get(item, 0) + int(nbytes)
+
+    # --- Consulta ---
+    def subsystem_total(self, subsystem):
+        return sum(self.items[subsystem].values())
+
+    @property
+    def total(self):
+        return sum(self.subsystem_total(name) for name in SUBSYSTEMS)
+
+    def bytes_per_node(self, n_nodes, subsystem=None):
+        """Bytes por nodo del total (o de un subsistema); sirve para presupuestos por escala."""
+        total = self.total if subsystem is None else self.subsystem_total(subsystem)
+        return total / max(int(n_nodes), 1)
+
+    def to_dict(self):
+        return {"subsystems": {name: {"total": self.subsystem_total(name), "items": dict(self.items[name])}
+                               for name in SUBSYSTEMS},
+                "total": self.total, "disk": dict(self.disk), "process_rss": process_rss()}
+
+    def format(self, n_nodes=None):
+        """Tabla de texto apta para el terminal."""
+        lines = [f"{'memory':44s} {'bytes':>12s}"]
+        for name in SUBSYSTEMS:
+            lines.append(f"{name:44s} {_format_bytes(self.subsystem_total(name)):>12s}")
+            for item, nbytes in sorted(self.items[name].items(), key=lambda kv: -kv[1]):
+                lines.append(f"  {item:42s} {_format_bytes(nbytes):>12s}")
+        lines.append(f"{'total (tracked)':44s} {_format_bytes(self.total):>12s}")
+        if n_nodes:
+            lines.append(f"{'per node':44s} {_format_bytes(self.bytes_per_node(n_nodes)):>12s}")
+        rss = process_rss()
+        if rss is not None:
+            lines.append(f"{'process resident':44s} {_format_bytes(rss):>12s}")
+        for item, nbytes in self.disk.items():
+            lines.append(f"{item + ' (disk)':44s} {_format_bytes(nbytes):>12s}")
+        return "\n".join(lines)
+
+
+class AllocationTracker:
+    """
+    Snapshots de tracemalloc con nombre y diferencias entre ellos. Sin
+    start() no hace nada (tracemalloc ralentiza cada asignación).
+    """
+
+    def __init__(self, frames=1):
+        self.frames = frames
+        self.snapshots = {}  # nombre -> tracemalloc.Snapshot
+        self.diffs = {}      # nombre -> [(ubicación, bytes, bloques)]
+        self._last = None
+        self._reports = 0
+
+    @property
+    def active(self):
+        return tracemalloc.is_tracing()
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+
+    def stop(self):
+        tracemalloc.stop()
+        self.snapshots.clear()
+        self._last = None
+
+    def traced(self):
+        """(bytes actuales, pico) asignados desde start()."""
+        return tracemalloc.get_traced_memory() if self.active else (0, 0)
+
+    def snapshot(self, name=None):
+        """Guarda un snapshot (nombre por defecto: hora); None si no está activo."""
+        if not self.active:
+            return None
+        snap = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+        name = name or time.strftime("%H:%M:%S")
+        self.snapshots[name] = snap
+        return name
+
+    def diff(self, before, after, top=10, key="lineno"):
+        """[(ubicación, bytes, bloques)] de las `top` mayores diferencias entre dos snapshots."""
+        stats = self.snapshots[after].compare_to(self.snapshots[before], key)
+        return [(str(s.traceback), s.size_diff, s.count_diff) for s in stats[:top]]
+
+    def since_last(self, top=10):
+        """Diferencia respecto al snapshot anterior tomado por since_last (None la primera vez)."""
+        self._reports += 1
+        name = self.snapshot(f"report {self._reports}")
+        if name is None:
+            return None
+        previous, self._last = self._last, name
+        if previous is None:
+            return None
+        rows = self.diff(previous, name, top)
+        # Solo se conserva el último: cada snapshot retiene todas las trazas
+        del self.snapshots[previous]
+        return rows
+
+    @contextlib.contextmanager
+    def track(self, name, top=10):
+        """Diferencia de asignaciones del bloque, guardada en diffs[name] (no-op si no está activo)."""
+        if not self.active:
+            yield
+            return
+        self.snapshot(name + ":before")
+        try:
+            yield
+        finally:
+            self.snapshot(name + ":after")
+            self.diffs[name] = self.diff(name + ":before", name + ":after", top)
+            del self.snapshots[name + ":before"], self.snapshots[name + ":after"]
+
+    @staticmethod
+    def format_diff(rows):
+        if not rows:
+            return "(no allocation changes)"
+        return "\n".join(f"{_format_bytes(size):>10s} {count:+8d} blocks  {where}" for where, size, count in rows)
+
+    def report(self):
+        if not self.active:
+            return "(allocation tracking off; enable with Help -> Track Allocations)"
+        current, peak = self.traced()
+        lines = [f"traced: {_format_bytes(current)} (peak {_format_bytes(peak)})"]
+        for name, rows in self.diffs.items():
+            lines.append(f"{name}:")
+            lines.append(self.format_diff(rows))
+        return "\n".join(lines)
+
+
+# Instancia global de la aplicación. APP_TRACEMALLOC=1 la activa desde el arranque.
+allocations = AllocationTracker()
+if os.environ.get("APP_TRACEMALLOC", "") not in ("", "0"):
+    allocations.start()
@@ -0,0 +1,92 @@
+"""
+Comprobaciones previas al análisis (numpy, sin Qt). La conectividad se trata
+como un grafo disperso: grados con bincount y subestructuras con
+connected_labels (union-find vectorizado).
+
+    issues = run_checks(model.node_ids, model.node_coords, model.element_ids, model.element_conn)
+    for issue in issues: print(issue.title, issue.count)
+
+Cada CheckIssue trae los IDs afectados para poder seleccionarlos.
+"""
+import numpy as np
+
+from app.models.spatial import connected_labels
+
+
+class CheckIssue:
+    def __init__(self, key, title, description, node_ids=None, element_ids=None):
+        self.key = key
+        self.title = title
+        self.description = description
+        self.node_ids = np.zeros(0, dtype=np.int64) if node_ids is None else node_ids
+        self.element_ids = np.zeros(0, dtype=np.int64) if element_ids is None else element_ids
+
+    @property
+    def count(self):
+        return len(self.node_ids) + len(self.element_ids)
+
+    def __repr__(self):
+        return f"CheckIssue({self.key}: {len(self.node_ids)} nodes, {len(self.element_ids)} frames)"
+
+
+def _rows_for(ids, values):
+    # Fila de cada valor en `ids` (-1 si no está) vía tabla de búsqueda densa (como node_rows)
+    lookup = np.full(int(ids.max(initial=0)) + 1, -1, dtype=np.int64)
+    lookup[ids] = np.arange(len(ids))
+    inside = (values > 0) & (values < len(lookup))
+    return np.where(inside, lookup[np.where(inside, values, 0)], -1)
+
+
+def run_checks(node_ids, coords, element_ids, conn, length_tol=1e-9):
+    """
+    Devuelve la lista de CheckIssue con algún elemento (vacía = modelo limpio):
+    frames con nodos inexistentes, frames de longitud ~0, nodos sin frames y
+    subestructuras desconectadas de la principal (la de más nodos).
+    """
+    node_ids = np.asarray(node_ids, dtype=np.int64)
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+    element_ids = np.asarray(element_ids, dtype=np.int64)
+    conn = np.asarray(conn, dtype=np.int64).reshape(-1, 2)
+    issues = []
+
+    # 1. Referencias a nodos inexistentes
+    rows = _rows_for(node_ids, conn)
+    missing = (rows < 0).any(axis=1)
+    if missing.any():
+        issues.append(CheckIssue("missing_nodes", "Frames with missing nodes",
+                                 "Frames that reference a node id that does not exist.",
+                                 element_ids=element_ids[missing]))
+    valid = ~missing
+    vrows = rows[valid]
+
+    # 2. Longitud nula
+    d = coords[vrows[:, 1]] - coords[vrows[:, 0]]
+    zero = np.einsum("ij,ij->i", d, d) <= length_tol * length_tol
+    if zero.any():
+        issues.append(CheckIssue("zero_length", "Zero-length frames",
+                                 f"Frames shorter than {length_tol:g}.",
+                                 element_ids=element_ids[valid][zero]))
+
+    # 3. Nodos huérfanos (grado 0)
+    degree = np.bincount(vrows.reshape(-1), minlength=len(node_ids))
+    orphan = degree == 0
+    if orphan.any():
+        issues.append(CheckIssue("orphan_nodes", "Free (orphan) nodes",
+                                 "Nodes not connected to any frame.",
+                                 node_ids=node_ids[orphan]))
+
+    # 4. Subestructuras desconectadas (sin contar huérfanos)
+    if len(vrows):
+        labels = connected_labels(len(node_ids), vrows[:, 0], vrows[:, 1])
+        sizes = np.bincount(labels[~orphan], minlength=len(node_ids))
+        n_components = int(np.count_nonzero(sizes))
+        if n_components > 1:
+            main = int(np.argmax(sizes))
+            off_nodes = ~orphan & (labels != main)
+            off_elems = labels[vrows[:, 0]] != main
+            issues.append(CheckIssue("disconnected", "Disconnected sub-structures",
+                                     f"{n_components - 1} groups not connected to the main structure "
+                                     f"({int(sizes[main])} nodes).",
+                                     node_ids=node_ids[off_nodes],
+                                     element_ids=element_ids[valid][off_elems]))
+    return issues
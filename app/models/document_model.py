@@ -1,72 +1,1017 @@
+import threading
+
 import numpy as np
 
+from app.lazy import lazy_import
+from app.models.loads import LoadTable, fixed_end_forces, assemble_nodal, self_weight_loads
+from app.models.sections import SectionLibrary, make_section
+
+# Geometría pesada: se importa al primer uso (no cuenta en el arranque)
+spatial = lazy_import("app.models.spatial")
+replicate = lazy_import("app.models.replicate")
+meshing = lazy_import("app.models.meshing")
+checks = lazy_import("app.models.checks")
+
+# Clave única de una arista sin orden (A-B == B-A)
+def _edge_keys(conn):
+    conn = np.asarray(conn, dtype=np.int64).reshape(-1, 2)
+    return (np.minimum(conn[:, 0], conn[:, 1]) << 32) | np.maximum(conn[:, 0], conn[:, 1])
+
+
+def _as_id_array(ids):
+    if isinstance(ids, (set, frozenset)):
+        ids = list(ids)
+    return np.asarray(ids, dtype=np.int64).reshape(-1)
+
+
+def _column_extents(coords):
+    """(min, max) por columna de un array (N,3). Por columnas es ~8x más rápido que min(axis=0)."""
+    return ([float(coords[:, k].min()) for k in range(3)],
+            [float(coords[:, k].max()) for k in range(3)])
+
+
+class GrowableArray:
+    """Array numpy con capacidad amortizada (append O(1)) y compactación por máscara."""
+
+    def __init__(self, dtype, width=None, capacity=64):
+        self._shape_tail = () if width is None else (width,)
+        self._buf = np.zeros((capacity,) + self._shape_tail, dtype=dtype)
+        self._n = 0
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def data(self):
+        return self._buf[:self._n]
+
+    def _reserve(self, extra):
+        need = self._n + extra
+        if need > len(self._buf):
+            cap = max(need, 2 * len(self._buf))
+            new = np.zeros((cap,) + self._shape_tail, dtype=self._buf.dtype)
+            new[:self._n] = self._buf[:self._n]
+            self._buf = new
+
+    def append(self, row):
+        self._reserve(1)
+        self._buf[self._n] = row
+        self._n += 1
+
+    def extend(self, rows):
+        rows = np.asarray(rows, dtype=self._buf.dtype).reshape((-1,) + self._shape_tail)
+        self._reserve(len(rows))
+        self._buf[self._n:self._n + len(rows)] = rows
+        self._n += len(rows)
+
+    def keep(self, mask):
+        kept = self._buf[:self._n][mask]
+        self._buf[:len(kept)] = kept
+        self._n = len(kept)
+
+
 class DocumentModel:
     def __init__(self):
-        self.nodes = [] 
-        self.elements = []
+        # Almacenamiento columnar: una fila por nodo / elemento, en orden de inserción
+        self._node_ids = GrowableArray(np.int64)
+        self._node_coords = GrowableArray(np.float64, 3)
+        self._elem_ids = GrowableArray(np.int64)
+        self._elem_conn = GrowableArray(np.int64, 2)
+        # Atributos por frame (0 = sin asignar): se indexan en bloque, sin objetos por frame
+        self._elem_material = GrowableArray(np.int64)
+        self._elem_section = GrowableArray(np.int64)
         self.materials = [] # Lista de materiales
-        
+        self.sections = SectionLibrary()
+        # Cargas: patrones (id, nombre, multiplicador de peso propio) y tablas de todos los patrones
+        self.load_patterns = []
+        self.nodal_loads = LoadTable(6)
+        self.member_loads = LoadTable(3)
+
         self.next_node_id = 1
         self.next_element_id = 1
-        self.next_material_id = 1 
+        self.next_material_id = 1
+        self.next_pattern_id = 1
+        # Protege la asignación de IDs: un script en un hilo de trabajo puede
+        # reservar IDs mientras el hilo de la GUI inserta (ver transaction.py)
+        self._id_lock = threading.Lock()
+        # Hilo dueño: si se fija, solo él puede mutar el modelo (None = sin comprobar, p.ej. batch)
+        self._owner_thread = None
+
+        # Cambia con cada mutación; sirve para invalidar cachés derivadas
+        self.revision = 0
+        self._tuple_cache = {}
+
+        # Fusión al insertar: None = desactivada, float = tolerancia
+        self.merge_tolerance = None
+        # Rejilla de coincidencias (spatial.PointGrid) sobre node_coords: se
+        # amplía con las filas añadidas y se descarta al borrar nodos o al
+        # cambiar la tolerancia
+        self._merge_grid = None
+
+        # Bounds incrementales: O(1) al insertar; al borrar solo se recalculan
+        # (de forma perezosa) si el nodo eliminado tocaba la caja
+        self._bounds_min = None
+        self._bounds_max = None
+        self._bounds_dirty = False
+        self.bounds_revision = 0
+
+        # Observadores de mutaciones (p.ej. el journal de autoguardado): fn(op, ids, data)
+        self._observers = []
+
+    # --- Acceso columnar (vistas de solo lectura por convención) ---
+    @property
+    def node_ids(self):
+        return self._node_ids.data
+
+    @property
+    def node_coords(self):
+        return self._node_coords.data
+
+    @property
+    def element_ids(self):
+        return self._elem_ids.data
 
+    @property
+    def element_conn(self):
+        return self._elem_conn.data
+
+    @property
+    def element_material_ids(self):
+        return self._elem_material.data
+
+    @property
+    def element_section_ids(self):
+        return self._elem_section.data
+
+    def _extend_elements(self, ids, conn, material_ids=0, section_ids=0):
+        ids = np.asarray(ids, dtype=np.int64).reshape(-1)
+        self._elem_ids.extend(ids)
+        self._elem_conn.extend(conn)
+        self._elem_material.extend(np.broadcast_to(material_ids, ids.shape))
+        self._elem_section.extend(np.broadcast_to(section_ids, ids.shape))
+
+    def _keep_elements(self, mask):
+        for column in (self._elem_ids, self._elem_conn, self._elem_material, self._elem_section):
+            column.keep(mask)
+
+    def _keep_nodes(self, mask):
+        self._node_ids.keep(mask)
+        self._node_coords.keep(mask)
+        # Las filas se renumeran: la rejilla de coincidencias ya no vale
+        self._merge_grid = None
+
+    # --- Vistas como listas de tuplas (compatibles con las tablas/viewport) ---
+    @property
+    def nodes(self):
+        return self._cached_tuples("nodes", lambda: list(zip(self.node_ids.tolist(), *self.node_coords.T.tolist())))
+
+    @property
+    def elements(self):
+        return self._cached_tuples("elements", lambda: list(zip(self.element_ids.tolist(), *self.element_conn.T.tolist())))
+
+    def _cached_tuples(self, name, build):
+        rev, value = self._tuple_cache.get(name, (None, None))
+        if rev != self.revision:
+            value = build()
+            self._tuple_cache[name] = (self.revision, value)
+        return value
+
+    def _touch(self):
+        self.revision += 1
+
+    # --- OBSERVADORES ---
+    # Cada mutación se notifica como deltas de bajo nivel (ver journal.py):
+    #   "nodes+" (ids, coords)  "elems+" (ids, conn)  "nodes-" / "elems-" (ids, None)
+    #   "conn=" (ids de frame, conn nueva)  "material" (id, (name, E, nu, rho))
+    #   "pattern" (id, (name, self_weight))  "section" (id, (shape, name, params))
+    #   "elem_props" (ids de frame, [material, sección] resultantes)
+    #   "nodal_loads" / "member_loads" (ids, [patrón, valores...] resultantes; cero = sin carga)
+    # Los arrays que se pasan no se reutilizan después (el observador puede guardarlos).
+    def add_observer(self, fn):
+        self._observers.append(fn)
+
+    def remove_observer(self, fn):
+        if fn in self._observers:
+            self._observers.remove(fn)
+
+    def _notify(self, op, ids, data=None):
+        for fn in self._observers:
+            fn(op, ids, data)
+
+    def _grow_bounds(self, lo, hi):
+        # Listas de floats: en add_node esto es O(1) y sin llamadas a numpy
+        if self._bounds_dirty:
+            return  # se recalculará entera al consultarla
+        if self._bounds_min is None:
+            self._bounds_min, self._bounds_max = [float(v) for v in lo], [float(v) for v in hi]
+            self.bounds_revision += 1
+            return
+        bmin, bmax = self._bounds_min, self._bounds_max
+        changed = False
+        for k in range(3):
+            if lo[k] < bmin[k]:
+                bmin[k] = float(lo[k]); changed = True
+            if hi[k] > bmax[k]:
+                bmax[k] = float(hi[k]); changed = True
+        if changed:
+            self.bounds_revision += 1
+
+    def _shrink_bounds(self, removed_coords):
+        """Marca la caja como sucia solo si algún nodo eliminado estaba sobre ella."""
+        if self._bounds_min is None or self._bounds_dirty or len(removed_coords) == 0:
+            return
+        if np.any(removed_coords <= self._bounds_min) or np.any(removed_coords >= self._bounds_max):
+            self._bounds_dirty = True
+
+    # --- HILO DUEÑO ---
+    def bind_to_current_thread(self):
+        """Las mutaciones desde otro hilo lanzarán RuntimeError (la GUI llama a esto al arrancar)."""
+        self._owner_thread = threading.get_ident()
+
+    def _assert_owner(self):
+        if self._owner_thread is not None and threading.get_ident() != self._owner_thread:
+            raise RuntimeError("DocumentModel modified outside its owner thread "
+                               "(apply changes through TaskContext.call_in_gui or on_result)")
+
+    # --- RESERVA DE IDs (segura entre hilos) ---
+    def _allocate(self, counter, count):
+        with self._id_lock:
+            start = getattr(self, counter)
+            setattr(self, counter, start + count)
+        return start
+
+    def reserve_node_ids(self, count=1):
+        """Reserva `count` IDs de nodo consecutivos (para insertarlos después con add_nodes(ids=...))."""
+        start = self._allocate("next_node_id", count)
+        return np.arange(start, start + count, dtype=np.int64)
+
+    def reserve_element_ids(self, count=1):
+        start = self._allocate("next_element_id", count)
+        return np.arange(start, start + count, dtype=np.int64)
+
+    def node_rows(self, node_ids):
+        """Fila de cada id de nodo (-1 si no existe)."""
+        node_ids = np.asarray(node_ids, dtype=np.int64)
+        lookup = np.full(self.next_node_id + 1, -1, dtype=np.int64)
+        lookup[self.node_ids] = np.arange(len(self.node_ids))
+        valid = (node_ids > 0) & (node_ids < len(lookup))
+        return np.where(valid, lookup[np.where(valid, node_ids, 0)], -1)
+
+    def element_rows(self, element_ids):
+        """Fila de cada id de frame (-1 si no existe)."""
+        element_ids = np.asarray(element_ids, dtype=np.int64)
+        lookup = np.full(self.next_element_id + 1, -1, dtype=np.int64)
+        lookup[self.element_ids] = np.arange(len(self.element_ids))
+        valid = (element_ids > 0) & (element_ids < len(lookup))
+        return np.where(valid, lookup[np.where(valid, element_ids, 0)], -1)
+
+    # --- NODOS ---
     def add_node(self, x, y, z):
-        node_id = self.next_node_id
-        self.nodes.append((node_id, x, y, z))
-        self.next_node_id += 1
+        self._assert_owner()
+        if self.merge_tolerance is not None and len(self._node_ids):
+            existing = self._find_coincident_node(x, y, z, self.merge_tolerance)
+            if existing is not None:
+                return existing
+        with self._id_lock:
+            node_id = self.next_node_id
+            self.next_node_id += 1
+        self._node_ids.append(node_id)
+        self._node_coords.append((x, y, z))
+        self._grow_bounds((x, y, z), (x, y, z))
+        self._touch()
+        if self._observers:
+            self._notify("nodes+", (node_id,), ((x, y, z),))
         return node_id
 
+    def add_nodes(self, coords, ids=None, merge=None):
+        """
+        Inserción masiva. Devuelve el array de IDs (uno por fila de coords).
+        Con merge_tolerance activo, las filas coincidentes con nodos
+        existentes (o entre sí) reciben el ID ya existente.
+        Con `ids` (reservados con reserve_node_ids) se insertan tal cual, sin
+        fusión; con merge=True se fusionan igualmente y los IDs reservados de
+        las filas fusionadas quedan sin usar.
+        """
+        self._assert_owner()
+        coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+        if len(coords) == 0:
+            return np.zeros(0, dtype=np.int64)
+        if ids is not None:
+            ids = np.asarray(ids, dtype=np.int64).reshape(-1)
+            if len(ids) != len(coords):
+                raise ValueError("ids and coords must have the same length")
+        if merge is None:
+            merge = ids is None
+
+        if not merge or self.merge_tolerance is None:
+            new_ids = self.reserve_node_ids(len(coords)) if ids is None else ids
+            self._node_ids.extend(new_ids)
+            self._node_coords.extend(coords)
+            self._grow_bounds(*_column_extents(coords))
+            self._touch()
+            if self._observers:
+                self._notify("nodes+", new_ids.copy(), coords.copy())
+            return new_ids
+        return self._add_nodes_merged(coords, self.merge_tolerance, ids)
+
+    def _add_nodes_merged(self, coords, tol, reserved=None):
+        # Filas a distancia <= tol de un nodo existente (o entre sí) reutilizan su ID
+        n_old = len(self._node_ids)
+        groups = spatial.coincident_representatives(coords, tol)
+        # Fila existente más baja que toca cada grupo (n_old = ninguna)
+        group_hit = np.full(len(coords), n_old, dtype=np.int64)
+        if n_old:
+            query, rows = self._coincidence_grid(tol).pairs_within(self.node_coords, coords, tol)
+            np.minimum.at(group_hit, groups[query], rows)
+        merged = group_hit[groups] < n_old
+        ids = np.empty(len(coords), dtype=np.int64)
+        ids[merged] = self.node_ids[group_hit[groups[merged]]]
+        # Representante nuevo -> ID recién asignado (o el reservado), compartido por su grupo
+        is_new = ~merged & (groups == np.arange(len(coords)))
+        ids[is_new] = self.reserve_node_ids(int(is_new.sum())) if reserved is None else reserved[is_new]
+        ids[~merged] = ids[groups[~merged]]
+
+        self._node_ids.extend(ids[is_new])
+        self._node_coords.extend(coords[is_new])
+        if is_new.any():
+            self._grow_bounds(*_column_extents(coords[is_new]))
+            if self._observers:
+                self._notify("nodes+", ids[is_new], coords[is_new])
+        self._touch()
+        return ids
+
+    def _find_coincident_node(self, x, y, z, tol):
+        point = np.array([x, y, z], dtype=np.float64)
+        _, rows = self._coincidence_grid(tol).pairs_within(self.node_coords, point, tol)
+        if not len(rows):
+            return None
+        d = self.node_coords[rows] - point
+        return int(self.node_ids[rows[np.argmin(np.einsum("ij,ij->i", d, d))]])
+
+    def _coincidence_grid(self, tol):
+        """Rejilla de coincidencias para `tol`, al día con las filas de node_coords."""
+        grid = self._merge_grid
+        if grid is None or grid.tol != tol:
+            grid = self._merge_grid = spatial.PointGrid(tol, self.node_coords)
+        elif grid.size < len(self._node_ids):
+            # Solo se añaden nodos desde la última consulta: se indexan las filas nuevas
+            grid.add(self.node_coords[grid.size:])
+        return grid
+
+    # --- ELEMENTOS ---
     def add_element(self, n_start_id, n_end_id):
+        self._assert_owner()
         if n_start_id == n_end_id:
             return None
-        
+
         # Verificar duplicados (A-B o B-A)
-        for e in self.elements:
-            if (e[1] == n_start_id and e[2] == n_end_id) or (e[1] == n_end_id and e[2] == n_start_id):
-                return None 
+        key = _edge_keys([(n_start_id, n_end_id)])[0]
+        if len(self._elem_ids) and np.any(_edge_keys(self.element_conn) == key):
+            return None
 
-        elem_id = self.next_element_id
-        self.elements.append((elem_id, n_start_id, n_end_id))
-        self.next_element_id += 1
+        with self._id_lock:
+            elem_id = self.next_element_id
+            self.next_element_id += 1
+        self._elem_ids.append(elem_id)
+        self._elem_conn.append((n_start_id, n_end_id))
+        self._elem_material.append(0)
+        self._elem_section.append(0)
+        self._touch()
+        if self._observers:
+            self._notify("elems+", (elem_id,), ((n_start_id, n_end_id),))
         return elem_id
-    
+
+    def add_elements(self, conn, ids=None, material_ids=0, section_ids=0):
+        """
+        Inserción masiva de frames (E,2) por IDs de nodo. Devuelve un array
+        de IDs con 0 donde el frame se rechazó (degenerado o duplicado).
+        Con `ids` (reservados con reserve_element_ids) se usan esos IDs.
+        material_ids / section_ids: un valor común o uno por frame (0 = sin asignar).
+        """
+        self._assert_owner()
+        conn = np.asarray(conn, dtype=np.int64).reshape(-1, 2)
+        reserved = None if ids is None else np.asarray(ids, dtype=np.int64).reshape(-1)
+        if reserved is not None and len(reserved) != len(conn):
+            raise ValueError("ids and conn must have the same length")
+        ids = np.zeros(len(conn), dtype=np.int64)
+        if len(conn) == 0:
+            return ids
+        keys = _edge_keys(conn)
+        ok = conn[:, 0] != conn[:, 1]
+        if len(self._elem_ids):
+            ok &= ~np.isin(keys, _edge_keys(self.element_conn))
+        # Duplicados dentro del propio lote: gana la primera aparición
+        _, first = np.unique(keys, return_index=True)
+        first_mask = np.zeros(len(conn), dtype=bool)
+        first_mask[first] = True
+        ok &= first_mask
+
+        ids[ok] = reserved[ok] if reserved is not None else self.reserve_element_ids(int(ok.sum()))
+        props = np.empty((len(conn), 2), dtype=np.int64)
+        props[:, 0] = material_ids
+        props[:, 1] = section_ids
+        props = props[ok]
+        self._extend_elements(ids[ok], conn[ok], props[:, 0], props[:, 1])
+        self._touch()
+        if self._observers and ok.any():
+            self._notify("elems+", ids[ok], conn[ok])
+            assigned = props.any(axis=1)
+            if assigned.any():
+                self._notify("elem_props", ids[ok][assigned], props[assigned])
+        return ids
+
+    # --- REPLICACIÓN ---
+    def replicate(self, node_ids, element_ids, rotations, translations, merge_tol=None):
+        """
+        Copia los nodos y frames dados (más los nodos extremos de esos frames)
+        con una transformación afín por copia (ver app/models/replicate.py).
+        Con merge_tol, los nodos copiados que caen sobre nodos existentes u
+        otras copias (las "costuras") se fusionan; los frames que quedan
+        degenerados o duplicados se descartan.
+        Devuelve (ids de nodos nuevos, ids de frames nuevos).
+        """
+        self._assert_owner()
+        element_ids = _as_id_array(element_ids)
+        elem_rows = np.flatnonzero(np.isin(self.element_ids, element_ids))
+        conn = self.element_conn[elem_rows]
+        # Nodos fuente ordenados por ID: la conectividad pasa a índices con searchsorted
+        src_ids = np.union1d(_as_id_array(node_ids), conn.reshape(-1))
+        src_rows = self.node_rows(src_ids)
+        found = src_rows >= 0
+        src_ids, src_rows = src_ids[found], src_rows[found]
+        conn_idx = np.searchsorted(src_ids, conn)
+        conn_ok = (conn_idx < len(src_ids)).all(axis=1)
+        conn_ok[conn_ok] = (src_ids[conn_idx[conn_ok]] == conn[conn_ok]).all(axis=1)
+        conn_idx = conn_idx[conn_ok]
+        # Las copias conservan material y sección de su frame original
+        copy_rows = np.tile(elem_rows[conn_ok], len(rotations))
+
+        new_coords, new_conn = replicate.replicate_arrays(self.node_coords[src_rows], conn_idx, rotations, translations)
+        if not len(new_coords):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        before = self.next_node_id
+        if merge_tol is None:
+            # IDs explícitos: sin fusión aunque merge_tolerance esté activo
+            ids = self.add_nodes(new_coords, ids=self.reserve_node_ids(len(new_coords)))
+        else:
+            ids = self._add_nodes_merged(new_coords, merge_tol)
+        elem_ids = self.add_elements(ids[new_conn], material_ids=self.element_material_ids[copy_rows],
+                                     section_ids=self.element_section_ids[copy_rows])
+        new_nodes = np.unique(ids[ids >= before])
+        return new_nodes, elem_ids[elem_ids > 0]
+
+    # --- DIVISIÓN DE FRAMES ---
+    def split_elements(self, element_ids, params, merge_tol=None):
+        """
+        Parte el frame element_ids[k] en el parámetro params[k] (0 < s < 1,
+        desde su nodo inicial); un mismo frame puede tener varios cortes.
+        Cada frame partido se sustituye por la cadena de tramos entre sus
+        cortes, en una sola actualización del modelo. Con merge_tol los
+        nodos de corte se fusionan con nodos existentes o entre sí (cruces).
+        Devuelve (ids de nodos nuevos, ids de frames nuevos, frames eliminados).
+        """
+        self._assert_owner()
+        empty = np.zeros(0, dtype=np.int64)
+        if not len(self._elem_ids):
+            return empty, empty, 0
+        rows = self.element_rows(_as_id_array(element_ids))
+        params = np.asarray(params, dtype=np.float64).reshape(-1)
+        conn = self.element_conn[np.maximum(rows, 0)]
+        ends = self.node_rows(conn)
+        ok = (rows >= 0) & (params > 0.0) & (params < 1.0) & (ends >= 0).all(axis=1)
+        if not ok.any():
+            return empty, empty, 0
+        rows, params, conn, ends = rows[ok], params[ok], conn[ok], ends[ok]
+        order = np.lexsort((params, rows))
+        rows, params, conn, ends = rows[order], params[order], conn[order], ends[order]
+
+        coords = self.node_coords
+        p0, p1 = coords[ends[:, 0]], coords[ends[:, 1]]
+        points = p0 + (p1 - p0) * params[:, None]
+        before = self.next_node_id
+        if merge_tol is None:
+            mid_ids = self.add_nodes(points, ids=self.reserve_node_ids(len(points)))
+        else:
+            mid_ids = self._add_nodes_merged(points, merge_tol)
+
+        # Cadena por frame: inicio -> corte 1 -> ... -> corte k -> fin
+        first = np.r_[True, rows[1:] != rows[:-1]]
+        last = np.r_[rows[1:] != rows[:-1], True]
+        seg_start = np.where(first, conn[:, 0], np.roll(mid_ids, 1))
+        new_conn = np.vstack([np.column_stack([seg_start, mid_ids]),
+                              np.column_stack([mid_ids[last], conn[last, 1]])])
+        # Tramos agrupados por frame original y en orden a lo largo de él
+        seg_order = np.lexsort((np.r_[params, np.full(int(last.sum()), 2.0)], np.r_[rows, rows[last]]))
+        new_conn = new_conn[seg_order]
+        parent_ids = self.element_ids[rows]
+        seg_parent = np.r_[parent_ids, parent_ids[last]][seg_order]
+        # Los tramos heredan material y sección de su frame
+        seg_rows = np.r_[rows, rows[last]][seg_order]
+        seg_material = self.element_material_ids[seg_rows]
+        seg_section = self.element_section_ids[seg_rows]
+
+        keep = np.ones(len(self._elem_ids), dtype=bool)
+        keep[rows] = False
+        if self._observers:
+            self._notify("elems-", self.element_ids[~keep])
+        self._keep_elements(keep)
+        new_elems = self.add_elements(new_conn, material_ids=seg_material, section_ids=seg_section)
+        # Los tramos heredan las cargas uniformes de su frame original
+        made = new_elems > 0
+        self._inherit_member_loads(seg_parent[made], new_elems[made])
+        new_nodes = np.unique(mid_ids[mid_ids >= before])
+        return new_nodes, new_elems[new_elems > 0], int((~keep).sum())
+
+    def divide_elements(self, element_ids, n):
+        """Divide cada frame en n tramos iguales."""
+        ids = _as_id_array(element_ids)
+        rows, params = meshing.division_splits(np.arange(len(ids)), n)
+        return self.split_elements(ids[rows], params)
+
+    def find_intersection_splits(self, tol, element_ids=None):
+        """
+        Cortes (ids de frame, s, cruces) en los cruces entre frames a
+        distancia <= tol, sin modificar el modelo. element_ids limita la
+        búsqueda a esos frames (None = todos).
+        """
+        ids, conn, p0, p1 = self.frame_endpoints(element_ids)
+        idx, params, pairs = meshing.intersection_splits(p0, p1, conn, tol)
+        return ids[idx], params, pairs
+
+    def split_at_intersections(self, tol, element_ids=None, splits=None):
+        """
+        Parte los frames en sus cruces (ver find_intersection_splits; `splits`
+        permite pasar su resultado ya calculado). Los nodos de un mismo cruce
+        se fusionan con tolerancia tol.
+        """
+        if splits is None:
+            splits = self.find_intersection_splits(tol, element_ids)
+        ids, params, _ = splits
+        return self.split_elements(ids, params, merge_tol=max(tol, 1e-12))
+
     def add_material(self, name, E, nu, rho):
+        self._assert_owner()
         mat_id = self.next_material_id
         # Estructura: (ID, Name, E, Nu, Density)
         self.materials.append((mat_id, name, E, nu, rho))
         self.next_material_id += 1
+        if self._observers:
+            self._notify("material", mat_id, (name, E, nu, rho))
         return mat_id
 
+    # --- SECCIONES Y PROPIEDADES POR FRAME ---
+    def add_section(self, shape, name, **params):
+        """Nueva sección paramétrica (ver app/models/sections.py); ValueError si las dimensiones no valen."""
+        self._assert_owner()
+        section_id = self.sections.add(make_section(shape, name, **params))
+        if self._observers:
+            self._notify("section", section_id, self.sections.get(section_id).to_record())
+        return section_id
+
+    def get_sections_data(self):
+        """[(id, nombre, forma, A, Iy, Iz, J)] para la tabla de secciones."""
+        return [(sid, sec.name, sec.SHAPE, *sec.properties) for sid, sec in self.sections]
+
+    def assign_frame_properties(self, element_ids, material_id=None, section_id=None):
+        """
+        Asigna material y/o sección (None = no cambiar, 0 = quitar) a los
+        frames: una escritura indexada por columna. Devuelve cuántos frames.
+        """
+        self._assert_owner()
+        if material_id and material_id not in {m[0] for m in self.materials}:
+            raise ValueError(f"Unknown material {material_id}")
+        if section_id and section_id not in self.sections:
+            raise ValueError(f"Unknown section {section_id}")
+        rows = self.element_rows(_as_id_array(element_ids))
+        rows = np.unique(rows[rows >= 0])
+        if material_id is not None:
+            self._elem_material.data[rows] = material_id
+        if section_id is not None:
+            self._elem_section.data[rows] = section_id
+        if self._observers and len(rows):
+            self._notify("elem_props", self.element_ids[rows],
+                         np.column_stack([self.element_material_ids[rows], self.element_section_ids[rows]]))
+        return len(rows)
+
+    def _material_lookup(self):
+        """(max_id + 1, 3) E, nu, densidad indexada por id de material (NaN = no existe)."""
+        lookup = np.full((self.next_material_id, 3), np.nan)
+        for mat_id, _, E, nu, rho in self.materials:
+            lookup[mat_id] = (E, nu, rho)
+        return lookup
+
+    def element_properties(self, rows=None):
+        """
+        Propiedades de los frames (filas `rows`, None = todos) reunidas por
+        indexado de las tablas densas de materiales y secciones:
+        {"A", "Iy", "Iz", "J", "E", "G", "gamma"} -> (E,) con NaN donde falta asignación.
+        """
+        material_ids = self.element_material_ids if rows is None else self.element_material_ids[rows]
+        section_ids = self.element_section_ids if rows is None else self.element_section_ids[rows]
+        section = self.sections.gather(section_ids)
+        lookup = self._material_lookup()
+        valid = (material_ids >= 0) & (material_ids < len(lookup))
+        material = lookup[np.where(valid, material_ids, 0)]
+        E, nu = material[:, 0], material[:, 1]
+        return {"A": section[:, 0], "Iy": section[:, 1], "Iz": section[:, 2], "J": section[:, 3],
+                "E": E, "G": E / (2.0 * (1.0 + nu)), "gamma": material[:, 2]}
+
+    # --- CARGAS ---
+    def add_load_pattern(self, name, self_weight=0.0):
+        """Nuevo patrón de carga; self_weight multiplica el peso propio de los frames (0 = sin él)."""
+        self._assert_owner()
+        pattern_id = self.next_pattern_id
+        self.load_patterns.append((pattern_id, name, float(self_weight)))
+        self.next_pattern_id += 1
+        if self._observers:
+            self._notify("pattern", pattern_id, (name, float(self_weight)))
+        return pattern_id
+
+    def get_load_pattern(self, pattern_id):
+        for pattern in self.load_patterns:
+            if pattern[0] == pattern_id:
+                return pattern
+        raise ValueError(f"Unknown load pattern {pattern_id}")
+
+    def set_nodal_loads(self, pattern_id, node_ids, values, add=False):
+        """
+        Asigna (o suma, add=True) a los nodos la carga `values` (Fx, Fy, Fz, Mx, My, Mz):
+        una fila común o una por nodo; con 3 columnas solo fuerzas. Una sola
+        actualización de la tabla. Devuelve cuántos nodos existentes se cargaron.
+        """
+        return self._set_loads(self.nodal_loads, "nodal_loads", self.node_rows, pattern_id, node_ids, values, add)
+
+    def set_member_loads(self, pattern_id, element_ids, values, add=False):
+        """Igual que set_nodal_loads para cargas uniformes (wx, wy, wz) por unidad de longitud, en ejes globales."""
+        return self._set_loads(self.member_loads, "member_loads", self.element_rows,
+                               pattern_id, element_ids, values, add)
+
+    def _set_loads(self, table, op, rows_of, pattern_id, ids, values, add):
+        self._assert_owner()
+        self.get_load_pattern(pattern_id)
+        ids = _as_id_array(ids)
+        values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+        if values.shape[1] > table.width or len(values) not in (1, len(ids)):
+            raise ValueError(f"Expected {table.width} load components for 1 or {len(ids)} rows, "
+                             f"got shape {values.shape}")
+        if values.shape[1] < table.width:
+            values = np.hstack([values, np.zeros((len(values), table.width - values.shape[1]))])
+        exists = rows_of(ids) >= 0
+        ids = ids[exists]
+        if len(values) > 1:
+            values = values[exists]
+        if not len(ids):
+            return 0
+        patterns, changed, new_values = table.upsert(pattern_id, ids, values, add)
+        if self._observers:
+            self._notify(op, changed, np.column_stack([patterns, new_values]))
+        return len(changed)
+
+    def _move_loads(self, table, op, rows_of, targets, moved_rows):
+        """Suma las cargas de las filas moved_rows (máscara sobre la tabla del modelo) en targets[fila]."""
+        if not len(table):
+            return
+        rows = rows_of(table.ids)
+        moved = rows >= 0
+        moved[moved] = moved_rows[rows[moved]]
+        if not moved.any():
+            return
+        patterns, changed, new_values = table.upsert(
+            table.patterns[moved], targets[rows[moved]], table.values[moved], add=True)
+        if self._observers:
+            self._notify(op, changed, np.column_stack([patterns, new_values]))
+
+    def _inherit_member_loads(self, parent_ids, child_ids):
+        """Copia las cargas de cada frame parent_ids[k] (en todos los patrones) a child_ids[k]."""
+        table = self.member_loads
+        loaded = np.flatnonzero(np.isin(table.ids, parent_ids))
+        if not len(loaded):
+            return
+        order = np.argsort(parent_ids, kind="stable")
+        sorted_parents = parent_ids[order]
+        lo = np.searchsorted(sorted_parents, table.ids[loaded], side="left")
+        counts = np.searchsorted(sorted_parents, table.ids[loaded], side="right") - lo
+        # Cada fila cargada se repite una vez por tramo de su frame
+        src = np.repeat(loaded, counts)
+        pos = np.arange(len(src)) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(lo, counts)
+        patterns, values = table.patterns[src], table.values[src]
+        table.drop_ids(parent_ids)
+        patterns, changed, new_values = table.upsert(patterns, child_ids[order[pos]], values)
+        if self._observers:
+            self._notify("member_loads", changed, np.column_stack([patterns, new_values]))
+
+    def prune_loads(self):
+        """Quita las cargas de nodos / frames que ya no existen."""
+        self.nodal_loads.keep(self.node_rows(self.nodal_loads.ids) >= 0)
+        self.member_loads.keep(self.element_rows(self.member_loads.ids) >= 0)
+
+    def frame_weight_per_length(self):
+        """(E,) peso por unidad de longitud (densidad en peso x área); 0 en frames sin material o sección."""
+        props = self.element_properties()
+        return np.nan_to_num(props["gamma"] * props["A"])
+
+    def equivalent_nodal_loads(self, pattern_id):
+        """
+        (N,6) cargas del patrón sobre cada nodo (alineado con node_ids): cargas
+        nodales + equivalentes de las cargas uniformes y del peso propio de
+        todos los frames, ensambladas en una sola pasada.
+        """
+        _, _, self_weight = self.get_load_pattern(pattern_id)
+        n_elems = len(self._elem_ids)
+        w = np.zeros((n_elems, 3))
+        member_ids, member_w = self.member_loads.of_pattern(pattern_id)
+        w[self.element_rows(member_ids)] = member_w
+        if self_weight:
+            w += self_weight_loads(self.frame_weight_per_length(), self_weight)
+        ends = self.node_rows(self.element_conn.reshape(-1)).reshape(-1, 2)
+        active = w.any(axis=1) & (ends >= 0).all(axis=1)
+        ends, w = ends[active], w[active]
+        coords = self.node_coords
+        force, moment = fixed_end_forces(coords[ends[:, 0]], coords[ends[:, 1]], w)
+        node_ids, nodal = self.nodal_loads.of_pattern(pattern_id)
+        return assemble_nodal(len(self._node_ids), self.node_rows(node_ids), nodal,
+                              ends[:, 0], ends[:, 1], force, moment)
+
+    # --- BORRADO ---
     def delete_node(self, node_id):
-        self.nodes = [n for n in self.nodes if n[0] != node_id]
-        # Eliminar elementos conectados al nodo borrado
-        self.elements = [e for e in self.elements if e[1] != node_id and e[2] != node_id]
+        self.delete_nodes([node_id])
+
+    def delete_nodes(self, node_ids):
+        self._assert_owner()
+        node_ids = _as_id_array(node_ids)
+        if len(node_ids) == 0:
+            return
+        keep = ~np.isin(self.node_ids, node_ids)
+        self._shrink_bounds(self.node_coords[~keep])
+        if self._observers:
+            self._notify("nodes-", self.node_ids[~keep])
+        self._keep_nodes(keep)
+        # Eliminar elementos conectados a los nodos borrados
+        keep_elems = ~np.isin(self.element_conn, node_ids).any(axis=1)
+        if self._observers:
+            self._notify("elems-", self.element_ids[~keep_elems])
+        self.nodal_loads.drop_ids(node_ids)
+        self.member_loads.drop_ids(self.element_ids[~keep_elems])
+        self._keep_elements(keep_elems)
+        self._touch()
 
     def delete_element(self, element_id):
-        self.elements = [e for e in self.elements if e[0] != element_id]
+        self.delete_elements([element_id])
+
+    def delete_elements(self, element_ids):
+        self._assert_owner()
+        element_ids = _as_id_array(element_ids)
+        if len(element_ids) == 0:
+            return
+        keep = ~np.isin(self.element_ids, element_ids)
+        if self._observers:
+            self._notify("elems-", self.element_ids[~keep])
+        self.member_loads.drop_ids(element_ids)
+        self._keep_elements(keep)
+        self._touch()
+
+    # --- FUSIÓN DE NODOS COINCIDENTES ---
+    def merge_coincident_nodes(self, tol, reps=None):
+        """
+        Fusiona nodos a distancia <= tol (se conserva el de menor fila, es
+        decir el más antiguo), remapea la conectividad en una pasada y
+        elimina frames que quedan degenerados o duplicados.
+        `reps` permite pasar coincident_representatives(node_coords, tol) ya
+        calculado (p.ej. en segundo plano) para la revisión actual del modelo.
+        Devuelve (nodos_eliminados, frames_eliminados).
+        """
+        self._assert_owner()
+        n = len(self._node_ids)
+        if n < 2:
+            return 0, 0
+        if reps is None or len(reps) != n:
+            reps = spatial.coincident_representatives(self.node_coords, tol)
+        keep_nodes = reps == np.arange(n)
+        if keep_nodes.all():
+            return 0, 0
+
+        # Remapeo de conectividad: id -> fila -> fila representante -> id
+        conn = self.element_conn
+        rows = self.node_rows(conn)
+        found = rows >= 0
+        new_conn = conn.copy()
+        new_conn[found] = self.node_ids[reps[rows[found]]]
+
+        degenerate = new_conn[:, 0] == new_conn[:, 1]
+        keys = _edge_keys(new_conn)
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        first_mask = np.zeros(len(keys), dtype=bool)
+        first_mask[first] = True
+        keep_elems = ~degenerate & first_mask
+
+        # Las cargas de lo que desaparece se suman a lo que queda: nodo -> su representante,
+        # frame duplicado -> el frame que se conserva (los degenerados pierden la suya)
+        self._move_loads(self.nodal_loads, "nodal_loads", self.node_rows,
+                         self.node_ids[reps], ~keep_nodes)
+        self._move_loads(self.member_loads, "member_loads", self.element_rows,
+                         self.element_ids[first[inverse.reshape(-1)]], ~degenerate & ~first_mask)
+        self.nodal_loads.drop_ids(self.node_ids[~keep_nodes])
+        self.member_loads.drop_ids(self.element_ids[~keep_elems])
+
+        self._shrink_bounds(self.node_coords[~keep_nodes])
+        if self._observers:
+            changed = (new_conn != conn).any(axis=1)
+            self._notify("conn=", self.element_ids[changed], new_conn[changed])
+            self._notify("elems-", self.element_ids[~keep_elems])
+            self._notify("nodes-", self.node_ids[~keep_nodes])
+        self._elem_conn.data[:] = new_conn
+        self._keep_elements(keep_elems)
+        self._keep_nodes(keep_nodes)
+        self._touch()
+        return int(n - keep_nodes.sum()), int(len(keep_elems) - keep_elems.sum())
 
+    def find_coincident_nodes(self, tol):
+        """Pares (id_a, id_b) de nodos a distancia <= tol, sin modificar el modelo."""
+        a, b = spatial.find_close_pairs(self.node_coords, tol)
+        return self.node_ids[a], self.node_ids[b]
+
+    # --- MEMORIA (ver app/memory.py) ---
+    def memory_footprint(self, report):
+        """Partidas de memoria del modelo: columnas (con su capacidad reservada), cargas, definiciones y cachés."""
+        report.add("model arrays", "node columns", report.nbytes(self.node_ids, self.node_coords))
+        report.add("model arrays", "element columns",
+                   report.nbytes(self.element_ids, self.element_conn, self.element_material_ids,
+                                 self.element_section_ids))
+        for name, table in (("nodal loads", self.nodal_loads), ("member loads", self.member_loads)):
+            report.add("model arrays", name, report.nbytes(table.patterns, table.ids, table.values))
+        report.add("model arrays", "materials / load patterns", report.sizeof([self.materials, self.load_patterns]))
+        self.sections.memory_footprint(report)
+        # Listas de tuplas para tablas y viewport (las comparte el viewport: se cuentan aquí)
+        report.add("caches", "node / element tuple lists", report.sizeof(self._tuple_cache))
+        if self._merge_grid is not None:
+            report.add("caches", "merge-on-insert grid", self._merge_grid.nbytes)
+
+    # --- ESTADO COMPLETO / REPLAY (autoguardado, ver journal.py) ---
+    def state_arrays(self):
+        """Copia independiente de todo el estado del modelo (para escribir un snapshot)."""
+        return {
+            "node_ids": self.node_ids.copy(),
+            "node_coords": self.node_coords.copy(),
+            "element_ids": self.element_ids.copy(),
+            "element_conn": self.element_conn.copy(),
+            "element_material": self.element_material_ids.copy(),
+            "element_section": self.element_section_ids.copy(),
+            "counters": np.array([self.next_node_id, self.next_element_id, self.next_material_id,
+                                  self.next_pattern_id], dtype=np.int64),
+            "materials": list(self.materials),
+            "sections": self.sections.records(),
+            "load_patterns": list(self.load_patterns),
+            "nodal_loads": self.nodal_loads.rows(),
+            "member_loads": self.member_loads.rows(),
+        }
+
+    def load_state(self, state):
+        """Sustituye el contenido del modelo por `state` (formato de state_arrays)."""
+        self._assert_owner()
+        for column, key in ((self._node_ids, "node_ids"), (self._node_coords, "node_coords"),
+                            (self._elem_ids, "element_ids"), (self._elem_conn, "element_conn")):
+            column.keep(np.zeros(len(column), dtype=bool))
+            column.extend(state[key])
+        self._merge_grid = None
+        n_elems = len(self._elem_ids)
+        for column, key in ((self._elem_material, "element_material"), (self._elem_section, "element_section")):
+            column.keep(np.zeros(len(column), dtype=bool))
+            column.extend(state.get(key, np.zeros(n_elems, dtype=np.int64)))
+        self.materials = [tuple(m) for m in state["materials"]]
+        self.sections.clear()
+        for section_id, shape, name, params in state.get("sections", []):
+            self.sections.add(make_section(shape, name, **params), section_id)
+        self.load_patterns = [tuple(p) for p in state.get("load_patterns", [])]
+        self.nodal_loads.load_rows(state.get("nodal_loads", np.zeros((0, 8))))
+        self.member_loads.load_rows(state.get("member_loads", np.zeros((0, 5))))
+        counters = [int(c) for c in state["counters"]] + [1]
+        self.next_node_id, self.next_element_id, self.next_material_id, self.next_pattern_id = counters[:4]
+        self._bounds_dirty = True
+        self._touch()
+
+    def apply_recorded(self, op, ids, data=None):
+        """
+        Aplica un delta tal como se notificó a los observadores (replay del
+        journal): sin fusión ni validación, para reproducir el estado exacto.
+        """
+        self._assert_owner()
+        if op == "material":
+            self.materials.append((int(ids), *data))
+            self.next_material_id = max(self.next_material_id, int(ids) + 1)
+            return
+        if op == "pattern":
+            self.load_patterns.append((int(ids), *data))
+            self.next_pattern_id = max(self.next_pattern_id, int(ids) + 1)
+            return
+        if op == "section":
+            shape, name, params = data
+            self.sections.add(make_section(shape, name, **params), int(ids))
+            return
+        ids = np.asarray(ids, dtype=np.int64).reshape(-1)
+        if op in ("nodal_loads", "member_loads"):
+            table = self.nodal_loads if op == "nodal_loads" else self.member_loads
+            data = np.asarray(data, dtype=np.float64).reshape(len(ids), -1)
+            table.upsert(data[:, 0].astype(np.int64), ids, data[:, 1:])
+            return
+        if op == "nodes+":
+            coords = np.asarray(data, dtype=np.float64).reshape(-1, 3)
+            self._node_ids.extend(ids)
+            self._node_coords.extend(coords)
+            if len(ids):
+                self._grow_bounds(*_column_extents(coords))
+                self.next_node_id = max(self.next_node_id, int(ids.max()) + 1)
+        elif op == "elems+":
+            self._extend_elements(ids, np.asarray(data, dtype=np.int64).reshape(-1, 2))
+            if len(ids):
+                self.next_element_id = max(self.next_element_id, int(ids.max()) + 1)
+        elif op == "nodes-":
+            keep = ~np.isin(self.node_ids, ids)
+            self._shrink_bounds(self.node_coords[~keep])
+            self._keep_nodes(keep)
+            self.nodal_loads.drop_ids(ids)
+        elif op == "elems-":
+            keep = ~np.isin(self.element_ids, ids)
+            self.member_loads.drop_ids(ids)
+            self._keep_elements(keep)
+        elif op == "conn=":
+            rows = self.element_rows(ids)
+            found = rows >= 0
+            self._elem_conn.data[rows[found]] = np.asarray(data, dtype=np.int64).reshape(-1, 2)[found]
+        elif op == "elem_props":
+            rows = self.element_rows(ids)
+            found = rows >= 0
+            props = np.asarray(data, dtype=np.int64).reshape(-1, 2)[found]
+            self._elem_material.data[rows[found]] = props[:, 0]
+            self._elem_section.data[rows[found]] = props[:, 1]
+        else:
+            raise ValueError(f"Unknown recorded operation '{op}'")
+        self._touch()
+
+    # --- CONSULTAS ---
     def get_nodes_data(self):
-        if not self.nodes:
+        if not len(self._node_ids):
             return np.zeros((0, 3)), []
-        coords = np.array([n[1:] for n in self.nodes], dtype=np.float32)
+        coords = self.node_coords.astype(np.float32)
         return coords, self.nodes
 
     def get_elements_data(self):
         return self.elements
-        
+
+    def element_vectors(self):
+        """(E,3) vector fin - inicio de cada frame (NaN si falta algún nodo)."""
+        rows = self.node_rows(self.element_conn.reshape(-1)).reshape(-1, 2)
+        coords = self.node_coords
+        if not len(coords):
+            return np.full((len(rows), 3), np.nan)
+        vectors = coords[rows[:, 1]] - coords[rows[:, 0]]
+        vectors[(rows < 0).any(axis=1)] = np.nan
+        return vectors
+
+    def frame_endpoints(self, element_ids=None):
+        """
+        (ids, conn, p0, p1) de los frames dados (None = todos) cuyos dos nodos
+        existen: copias independientes del modelo (aptas para tareas en segundo plano).
+        """
+        rows = np.arange(len(self._elem_ids)) if element_ids is None else \
+            self.element_rows(_as_id_array(element_ids))
+        rows = rows[rows >= 0]
+        ends = self.node_rows(self.element_conn[rows])
+        ok = (ends >= 0).all(axis=1)
+        rows, ends = rows[ok], ends[ok]
+        coords = self.node_coords
+        return self.element_ids[rows], self.element_conn[rows], coords[ends[:, 0]], coords[ends[:, 1]]
+
+    def check(self, length_tol=1e-9):
+        """Comprobaciones previas al análisis (lista de CheckIssue, ver app/models/checks.py)."""
+        return checks.run_checks(self.node_ids, self.node_coords, self.element_ids, self.element_conn, length_tol)
+
     def get_materials_data(self):
         return self.materials
 
     # --- NUEVO: Cálculo de la "Caja" del modelo para escalar el Grid ---
     def get_model_bounds(self):
         """Devuelve (min_x, max_x, min_y, max_y, min_z, max_z)"""
-        if not self.nodes:
+        return self.get_bounds_with_revision()[0]
+
+    def get_bounds_with_revision(self):
+        """
+        ((min_x, max_x, min_y, max_y, min_z, max_z), bounds_revision).
+        La revisión solo cambia cuando cambia la caja, así que el grid y el
+        encuadre de cámara pueden saltarse el trabajo si no varía.
+        """
+        if self._bounds_dirty:
+            self._bounds_dirty = False
+            old = (self._bounds_min, self._bounds_max)
+            if len(self._node_ids):
+                self._bounds_min, self._bounds_max = _column_extents(self.node_coords)
+            else:
+                self._bounds_min = self._bounds_max = None
+            if old != (self._bounds_min, self._bounds_max):
+                self.bounds_revision += 1
+
+        if self._bounds_min is None:
             # Valores por defecto si está vacío para mantener un grid visible
-            return (-10, 10, -10, 10, 0, 0)
-            
-        coords = np.array([n[1:] for n in self.nodes])
-        
-        min_x, min_y, min_z = np.min(coords, axis=0)
-        max_x, max_y, max_z = np.max(coords, axis=0)
-        
-        return (min_x, max_x, min_y, max_y, min_z, max_z)
\ No newline at end of file
+            return (-10, 10, -10, 10, 0, 0), self.bounds_revision
+
+        (min_x, min_y, min_z), (max_x, max_y, max_z) = self._bounds_min, self._bounds_max
+        return (min_x, max_x, min_y, max_y, min_z, max_z), self.bounds_revision
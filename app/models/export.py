@@ -0,0 +1,295 @@
+"""
+Exportación del modelo a decks de OpenSees (Tcl / Python) y CSV, sin Qt.
+Las cargas de cada patrón se exportan como cargas nodales equivalentes.
+
+Las filas se formatean por bloques: una sola operación `%` sobre la plantilla
+de fila repetida (fmt * n) % valores, en lugar de un f-string por fila, y se
+escriben a un archivo con buffer grande. La memoria queda acotada por el
+tamaño de bloque. Se escribe a `<ruta>.part` y se renombra al terminar, así
+que una exportación cancelada no deja un archivo a medias.
+
+    stats = export_model(model, "modelo.tcl")            # formato por extensión
+    stats = export(snapshot(model), "m.py", "py", progress=cb)
+"""
+import csv
+import io
+import os
+import time
+
+import numpy as np
+
+# Filas por bloque formateado (~3-4 MB de texto por bloque)
+CHUNK_ROWS = 65536
+_BUFFER_BYTES = 1 << 20
+
+FORMATS = {"tcl": "OpenSees Tcl", "py": "OpenSees Python", "csv": "CSV"}
+_EXTENSIONS = {".tcl": "tcl", ".py": "py", ".csv": "csv"}
+
+# Propiedades de reserva para frames sin sección asignada (se cuentan en "unassigned_elements")
+DEFAULT_SECTION = {"A": 1.0, "Iy": 1.0, "Iz": 1.0, "J": 1.0}
+# Orden de las propiedades en la línea de elemento de elasticBeamColumn
+_ELEMENT_PROPS = ("A", "E", "G", "J", "Iy", "Iz")
+
+# Transformaciones geométricas: 1 = general (vecxz = Z), 2 = frames verticales (vecxz = X)
+_TRANSF_GENERAL, _TRANSF_VERTICAL = 1, 2
+
+
+def snapshot(model):
+    """Copias de las columnas del modelo (se puede exportar en otro hilo mientras la GUI sigue)."""
+    return {
+        "node_ids": np.array(model.node_ids, dtype=np.int64),
+        "node_coords": np.array(model.node_coords, dtype=np.float64),
+        "element_ids": np.array(model.element_ids, dtype=np.int64),
+        "element_conn": np.array(model.element_conn, dtype=np.int64),
+        "element_material": np.array(model.element_material_ids, dtype=np.int64),
+        "element_section": np.array(model.element_section_ids, dtype=np.int64),
+        "element_props": model.element_properties(),
+        "materials": list(model.materials),
+        "sections": model.get_sections_data(),
+        "loads": _pattern_loads(model),
+    }
+
+
+def _pattern_loads(model):
+    """
+    [(id, nombre, ids de nodo, cargas (K,6))] por patrón: el vector de cargas
+    nodales equivalentes (nodales + frames + peso propio), solo nodos cargados.
+    """
+    loads = []
+    for pattern_id, name, _ in model.load_patterns:
+        forces = model.equivalent_nodal_loads(pattern_id)
+        rows = np.flatnonzero(forces.any(axis=1))
+        loads.append((pattern_id, name, model.node_ids[rows], forces[rows]))
+    return loads
+
+
+def format_for_path(path):
+    return _EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def export_model(model, path, fmt=None, progress=None):
+    fmt = fmt or format_for_path(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format for '{path}' (expected one of {sorted(FORMATS)})")
+    return export(snapshot(model), path, fmt, progress)
+
+
+def export(data, path, fmt, progress=None, chunk_rows=CHUNK_ROWS):
+    """
+    Escribe `data` (ver snapshot) en `path`. progress(filas_hechas, filas_totales, bytes)
+    se llama tras cada bloque (puede lanzar una excepción para cancelar).
+    Devuelve {"paths", "bytes", "rows", "skipped_elements", "unassigned_elements", "elapsed", "mb_per_s"}.
+    """
+    start = time.perf_counter()
+    load_rows = sum(len(ids) for _, _, ids, _ in data.get("loads", []))
+    writer = _BlockWriter(progress, len(data["node_ids"]) + len(data["element_ids"]) + load_rows, chunk_rows)
+    if fmt == "csv":
+        paths = _write_csv(data, path, writer)
+    elif fmt in ("tcl", "py"):
+        with writer.open(path):
+            _write_opensees(data, writer, python=(fmt == "py"))
+        paths = [path]
+    else:
+        raise ValueError(f"Unknown export format '{fmt}'")
+    elapsed = time.perf_counter() - start
+    return {"paths": paths, "bytes": writer.bytes, "rows": writer.rows,
+            "skipped_elements": writer.skipped, "unassigned_elements": writer.unassigned, "elapsed": elapsed,
+            "mb_per_s": writer.bytes / 1e6 / elapsed if elapsed > 0 else 0.0}
+
+
+class _BlockWriter:
+    def __init__(self, progress, total_rows, chunk_rows):
+        self.progress = progress
+        self.total_rows = total_rows
+        self.chunk_rows = chunk_rows
+        self.bytes = 0
+        self.rows = 0
+        self.skipped = 0
+        self.unassigned = 0
+        self._file = None
+
+    def open(self, path):
+        return _AtomicFile(self, path)
+
+    def text(self, s):
+        data = s.encode("utf-8")
+        self._file.write(data)
+        self.bytes += len(data)
+
+    def table(self, row_fmt, values):
+        """
+        values (N,k) float64; row_fmt con k campos ('%d' admite floats enteros
+        exactos hasta 2**53). Un `%` por bloque de chunk_rows filas.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        for start in range(0, len(values), self.chunk_rows):
+            block = values[start:start + self.chunk_rows]
+            data = ((row_fmt * len(block)) % tuple(block.ravel().tolist())).encode("ascii")
+            self._file.write(data)
+            self.bytes += len(data)
+            self.rows += len(block)
+            if self.progress is not None:
+                self.progress(self.rows, self.total_rows, self.bytes)
+
+
+class _AtomicFile:
+    """Contexto: escribe en <path>.part y lo renombra a <path> solo si todo fue bien."""
+
+    def __init__(self, writer, path):
+        self.writer = writer
+        self.path = path
+        self.tmp = path + ".part"
+
+    def __enter__(self):
+        self.writer._file = open(self.tmp, "wb", buffering=_BUFFER_BYTES)
+        return self.writer
+
+    def __exit__(self, exc_type, exc, tb):
+        self.writer._file.close()
+        self.writer._file = None
+        if exc_type is None:
+            os.replace(self.tmp, self.path)
+        else:
+            try:
+                os.remove(self.tmp)
+            except OSError:
+                pass
+        return False
+
+
+def _element_table(data):
+    """(ids, conn, transf, filas) de los frames con ambos nodos existentes; cuenta los omitidos."""
+    node_ids, coords = data["node_ids"], data["node_coords"]
+    ids, conn = data["element_ids"], data["element_conn"]
+    lookup = np.full(int(node_ids.max(initial=0)) + 1, -1, dtype=np.int64)
+    lookup[node_ids] = np.arange(len(node_ids))
+    inside = (conn > 0) & (conn < len(lookup))
+    rows = np.where(inside, lookup[np.where(inside, conn, 0)], -1)
+    ok = (rows >= 0).all(axis=1)
+    rows = rows[ok]
+    v = coords[rows[:, 1]] - coords[rows[:, 0]]
+    # Vertical: la componente horizontal es despreciable frente a la longitud
+    horiz = v[:, 0] ** 2 + v[:, 1] ** 2
+    vertical = horiz <= 1e-12 * np.einsum("ij,ij->i", v, v)
+    transf = np.where(vertical, _TRANSF_VERTICAL, _TRANSF_GENERAL)
+    return ids[ok], conn[ok], transf, np.flatnonzero(ok), int((~ok).sum())
+
+
+def _elastic_constants(materials):
+    if not materials:
+        return 1.0, 1.0
+    _, _, E, nu, _ = materials[0]
+    return float(E), float(E) / (2.0 * (1.0 + float(nu)))
+
+
+def _element_properties(data, rows):
+    """
+    (E,6) A, E, G, J, Iy, Iz de las filas dadas, ya reunidas por frame en el
+    snapshot; lo no asignado toma el primer material y DEFAULT_SECTION.
+    Devuelve también cuántos frames usaron algún valor de reserva.
+    """
+    props = data.get("element_props")
+    fallback_E, fallback_G = _elastic_constants(data["materials"])
+    fallback = dict(DEFAULT_SECTION, E=fallback_E, G=fallback_G)
+    if props is None:
+        return np.tile([fallback[k] for k in _ELEMENT_PROPS], (len(rows), 1)), len(rows)
+    table = np.column_stack([props[k][rows] for k in _ELEMENT_PROPS])
+    missing = np.isnan(table)
+    table[missing] = np.broadcast_to([fallback[k] for k in _ELEMENT_PROPS], table.shape)[missing]
+    return table, int(missing.any(axis=1).sum())
+
+
+def _write_material_comments(w, materials):
+    # elasticBeamColumn lleva E y G en línea: un nDMaterial no lo usaría ningún elemento
+    if materials:
+        w.text("# Materials (E, G written inline in each element)\n")
+    for mat_id, name, mE, mnu, mrho in materials:
+        w.text(f"# material {mat_id} {name}: E={mE!r} nu={mnu!r} rho={mrho!r}\n")
+
+
+def _write_opensees(data, w, python):
+    materials = data["materials"]
+    elem_ids, conn, transf, rows, skipped = _element_table(data)
+    props, unassigned = _element_properties(data, rows)
+    w.skipped, w.unassigned = skipped, unassigned
+    n_nodes, n_elems = len(data["node_ids"]), len(elem_ids)
+    note = (f"# {unassigned} frames without material/section use E, G of the first material "
+            f"and A = Iy = Iz = J = 1\n" if unassigned else "")
+    values = np.column_stack([elem_ids, conn, props, transf])
+
+    if python:
+        w.text(f"# OpenSees model: {n_nodes} nodes, {n_elems} elasticBeamColumn elements\n"
+               "import openseespy.opensees as ops\n\n"
+               "ops.wipe()\n"
+               "ops.model('basic', '-ndm', 3, '-ndf', 6)\n\n")
+        _write_material_comments(w, materials)
+        w.text(f"\nops.geomTransf('Linear', {_TRANSF_GENERAL}, 0.0, 0.0, 1.0)\n"
+               f"ops.geomTransf('Linear', {_TRANSF_VERTICAL}, 1.0, 0.0, 0.0)  # vertical members\n\n")
+        w.table("ops.node(%d, %.12g, %.12g, %.12g)\n",
+                np.column_stack([data["node_ids"], data["node_coords"]]))
+        w.text("\n# element id, i, j, A, E, G, J, Iy, Iz, transf\n" + note)
+        w.table("ops.element('elasticBeamColumn', %d, %d, %d, %.12g, %.12g, %.12g, %.12g, %.12g, %.12g, %d)\n",
+                values)
+        for pattern_id, name, node_ids, forces in data.get("loads", []):
+            w.text(f"\n# Load pattern {name}: equivalent nodal loads (joint + frame + self weight)\n"
+                   f"ops.timeSeries('Linear', {pattern_id})\n"
+                   f"ops.pattern('Plain', {pattern_id}, {pattern_id})\n")
+            w.table("ops.load(%d, %.12g, %.12g, %.12g, %.12g, %.12g, %.12g)\n",
+                    np.column_stack([node_ids, forces]))
+    else:
+        w.text(f"# OpenSees model: {n_nodes} nodes, {n_elems} elasticBeamColumn elements\n"
+               "wipe\n"
+               "model BasicBuilder -ndm 3 -ndf 6\n\n")
+        _write_material_comments(w, materials)
+        w.text(f"\ngeomTransf Linear {_TRANSF_GENERAL} 0.0 0.0 1.0\n"
+               f"geomTransf Linear {_TRANSF_VERTICAL} 1.0 0.0 0.0 ;# vertical members\n\n")
+        w.table("node %d %.12g %.12g %.12g\n",
+                np.column_stack([data["node_ids"], data["node_coords"]]))
+        w.text("\n# element elasticBeamColumn id i j A E G J Iy Iz transf\n" + note)
+        w.table("element elasticBeamColumn %d %d %d %.12g %.12g %.12g %.12g %.12g %.12g %d\n", values)
+        for pattern_id, name, node_ids, forces in data.get("loads", []):
+            w.text(f"\n# Load pattern {name}: equivalent nodal loads (joint + frame + self weight)\n"
+                   f"timeSeries Linear {pattern_id}\n"
+                   f"pattern Plain {pattern_id} {pattern_id} {{\n")
+            w.table("    load %d %.12g %.12g %.12g %.12g %.12g %.12g\n", np.column_stack([node_ids, forces]))
+            w.text("}\n")
+
+
+def _write_csv(data, path, w):
+    """<base>_nodes.csv, <base>_elements.csv y, si hay, <base>_materials/sections/loads.csv."""
+    base = os.path.splitext(path)[0]
+    paths = [f"{base}_nodes.csv", f"{base}_elements.csv"]
+    with w.open(paths[0]):
+        w.text("id,x,y,z\n")
+        w.table("%d,%.12g,%.12g,%.12g\n", np.column_stack([data["node_ids"], data["node_coords"]]))
+    with w.open(paths[1]):
+        n_elems = len(data["element_ids"])
+        w.text("id,node_i,node_j,material,section\n")
+        w.table("%d,%d,%d,%d,%d\n", np.column_stack([
+            data["element_ids"], data["element_conn"],
+            data.get("element_material", np.zeros(n_elems)), data.get("element_section", np.zeros(n_elems))]))
+    if data["materials"]:
+        paths.append(f"{base}_materials.csv")
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        writer.writerow(["id", "name", "E", "nu", "rho"])
+        writer.writerows(data["materials"])
+        with w.open(paths[-1]):
+            w.text(buf.getvalue())
+    if data.get("sections"):
+        paths.append(f"{base}_sections.csv")
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        writer.writerow(["id", "name", "shape", "A", "Iy", "Iz", "J"])
+        writer.writerows(data["sections"])
+        with w.open(paths[-1]):
+            w.text(buf.getvalue())
+    loads = data.get("loads", [])
+    if loads:
+        paths.append(f"{base}_loads.csv")
+        with w.open(paths[-1]):
+            w.text("pattern,node,Fx,Fy,Fz,Mx,My,Mz\n")
+            for pattern_id, _, node_ids, forces in loads:
+                w.table("%d,%d,%.12g,%.12g,%.12g,%.12g,%.12g,%.12g\n",
+                        np.column_stack([np.full(len(node_ids), pattern_id), node_ids, forces]))
+    return paths
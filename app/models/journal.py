@@ -0,0 +1,408 @@
+"""
+Autoguardado con journal binario de solo-añadir y recuperación tras un cierre inesperado (sin Qt).
+
+El Journal observa el DocumentModel (add_observer): cada mutación llega como
+un delta de bajo nivel y se encola (deque.append, O(1) en el hilo GUI). Un
+hilo escritor vacía la cola cada FLUSH_INTERVAL_S, agrupa los deltas
+consecutivos del mismo tipo en un solo registro (1M add_node -> unos pocos
+registros) y hace fsync como mucho cada FSYNC_INTERVAL_S.
+
+Cada cierto tiempo (snapshot_due) se escribe un snapshot completo (.npz) y el
+journal se compacta: se empieza uno vacío. Snapshot y journal llevan una
+generación; un journal solo se reaplica sobre el snapshot de su misma
+generación, así que un fallo entre ambos renombrados no duplica cambios.
+
+    journal = Journal(directory)
+    if has_recovery(directory):
+        recover(model, directory)          # snapshot + replay del journal
+    journal.start(model)
+    ...
+    journal.close(discard=True)            # cierre limpio: no hay nada que recuperar
+
+Formato del registro: cabecera <BxxxIII (op, filas, bytes, crc32) + ids int64
++ datos (float64 x3 / int64 x2 / patrón + cargas float64 / JSON). Un final truncado o corrupto se ignora.
+"""
+import collections
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+
+import numpy as np
+
+SNAPSHOT_FILE = "model.snap"
+JOURNAL_FILE = "model.journal"
+
+_MAGIC = b"S3DJRNL1"
+_FILE_HEADER = struct.Struct("<8sQ")
+_RECORD = struct.Struct("<BxxxIII")
+# Filas máximas por registro (los lotes grandes se parten)
+_MAX_ROWS = 1 << 20
+
+# op -> (código, dtype de los datos, columnas); columnas 0 = solo ids
+_OPS = {
+    "nodes+": (1, np.float64, 3),
+    "elems+": (2, np.int64, 2),
+    "nodes-": (3, None, 0),
+    "elems-": (4, None, 0),
+    "conn=": (5, np.int64, 2),
+    "material": (6, None, 0),
+    "pattern": (7, None, 0),
+    "nodal_loads": (8, np.float64, 7),
+    "member_loads": (9, np.float64, 4),
+    "section": (10, None, 0),
+    "elem_props": (11, np.int64, 2),
+}
+# Registros de metadatos (un id + JSON), nunca se agrupan
+_JSON_OPS = ("material", "pattern", "section")
+_OP_NAMES = {code: name for name, (code, _, _) in _OPS.items()}
+
+
+def default_directory():
+    return os.environ.get("STRUCTURAL3D_AUTOSAVE_DIR") or \
+        os.path.join(os.path.expanduser("~"), ".structural_3d", "autosave")
+
+
+class Journal:
+    FLUSH_INTERVAL_S = 0.2
+    FSYNC_INTERVAL_S = 1.0
+    # Snapshot si el journal crece más de esto, o cada SNAPSHOT_INTERVAL_S si hubo cambios
+    SNAPSHOT_JOURNAL_BYTES = 64 << 20
+    SNAPSHOT_INTERVAL_S = 300.0
+
+    def __init__(self, directory=None):
+        self.directory = directory or default_directory()
+        self.snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        self.journal_path = os.path.join(self.directory, JOURNAL_FILE)
+        self._queue = collections.deque()
+        self._stop = threading.Event()
+        self._thread = None
+        self._file = None
+        self._model = None
+        self._generation = 0
+        self._last_snapshot = time.monotonic()
+        self._dirty = False
+        self._last_fsync = 0.0
+        self.error = None
+        # Estadísticas (las actualiza el hilo escritor)
+        self.journal_bytes = 0
+        self.records_written = 0
+        self.snapshots_written = 0
+        self.fsyncs = 0
+
+    @property
+    def active(self):
+        return self._thread is not None and self.error is None
+
+    # --- Hilo dueño del modelo ---
+    def start(self, model):
+        """Empieza a registrar `model`: primero un snapshot de su estado actual (nueva generación)."""
+        os.makedirs(self.directory, exist_ok=True)
+        self._model = model
+        self.snapshot()
+        model.add_observer(self.record)
+        self._thread = threading.Thread(target=self._run, name="autosave-journal", daemon=True)
+        self._thread.start()
+
+    def record(self, op, ids, data=None):
+        # Observador del modelo: solo encola; el hilo escritor codifica y escribe
+        if self.error is None:
+            self._queue.append((op, ids, data))
+
+    def memory_footprint(self, report):
+        """Partidas de memoria: registros aún sin escribir (en memoria) y archivos (en disco)."""
+        pending = list(self._queue)  # copia atómica: el hilo escritor vacía la cola a la vez
+        report.add("undo journal", f"pending records ({len(pending)})", report.sizeof(pending))
+        report.add_disk("autosave journal", self.journal_bytes)
+        if os.path.exists(self.snapshot_path):
+            report.add_disk("autosave snapshot", os.path.getsize(self.snapshot_path))
+
+    def snapshot(self):
+        """Encola un snapshot completo (la copia se toma ahora, se escribe en el hilo escritor)."""
+        self._queue.append(("snapshot", None, self._model.state_arrays()))
+        self._last_snapshot = time.monotonic()
+
+    def snapshot_due(self):
+        if not self.active:
+            return False
+        if self.journal_bytes >= self.SNAPSHOT_JOURNAL_BYTES:
+            return True
+        return self.records_written > 0 and time.monotonic() - self._last_snapshot >= self.SNAPSHOT_INTERVAL_S
+
+    def close(self, discard=True):
+        """Detiene el registro; discard=True borra los archivos (cierre limpio)."""
+        if self._model is not None:
+            self._model.remove_observer(self.record)
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if discard:
+            discard_files(self.directory)
+
+    # --- Hilo escritor ---
+    def _run(self):
+        try:
+            while not self._stop.wait(self.FLUSH_INTERVAL_S):
+                self._drain()
+                if self._dirty and time.monotonic() - self._last_fsync >= self.FSYNC_INTERVAL_S:
+                    self._fsync()
+            self._drain()
+            if self._dirty:
+                self._fsync()
+        except Exception as exc:  # disco lleno, permisos...: se deja de registrar
+            self.error = exc
+            self._queue.clear()
+
+    def _drain(self):
+        # Agrupa los deltas consecutivos del mismo tipo (materiales y patrones van siempre solos)
+        group_op, group = None, []
+        while self._queue:
+            op, ids, data = self._queue.popleft()
+            if op != group_op or op in _JSON_OPS:
+                self._write_group(group_op, group)
+                group_op, group = op, []
+            if op == "snapshot":
+                self._write_snapshot(data)
+                group_op = None
+                continue
+            group.append((ids, data))
+        self._write_group(group_op, group)
+
+    def _write_group(self, op, group):
+        if not group:
+            return
+        code, dtype, width = _OPS[op]
+        if op in _JSON_OPS:
+            item_id, values = group[0]
+            self._write_record(code, np.array([item_id], dtype=np.int64), json.dumps(values).encode("utf-8"))
+            return
+        ids = _concat([g[0] for g in group], np.int64, 0)
+        data = _concat([g[1] for g in group], dtype, width) if width else None
+        for start in range(0, len(ids), _MAX_ROWS):
+            chunk = None if data is None else data[start:start + _MAX_ROWS].tobytes()
+            self._write_record(code, ids[start:start + _MAX_ROWS], chunk)
+
+    def _write_record(self, code, ids, data):
+        payload = ids.tobytes() + (data or b"")
+        header = _RECORD.pack(code, len(ids), len(payload), zlib.crc32(payload))
+        self._file.write(header)
+        self._file.write(payload)
+        self.journal_bytes += len(header) + len(payload)
+        self.records_written += 1
+        self._dirty = True
+
+    def _fsync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._dirty = False
+        self._last_fsync = time.monotonic()
+        self.fsyncs += 1
+
+    def _write_snapshot(self, state):
+        # 1) snapshot de la nueva generación; 2) journal vacío de esa misma generación
+        generation = time.time_ns()
+        tmp = self.snapshot_path + ".part"
+        with open(tmp, "wb") as f:
+            np.savez(f, node_ids=state["node_ids"], node_coords=state["node_coords"],
+                     element_ids=state["element_ids"], element_conn=state["element_conn"],
+                     element_material=state["element_material"], element_section=state["element_section"],
+                     sections=_json_bytes(state["sections"]),
+                     counters=state["counters"], generation=np.int64(generation),
+                     materials=_json_bytes(state["materials"]),
+                     load_patterns=_json_bytes(state["load_patterns"]),
+                     nodal_loads=state["nodal_loads"], member_loads=state["member_loads"])
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+
+        if self._file is not None:
+            self._file.close()
+        tmp = self.journal_path + ".part"
+        f = open(tmp, "wb", buffering=1 << 20)
+        f.write(_FILE_HEADER.pack(_MAGIC, generation))
+        f.flush()
+        os.fsync(f.fileno())
+        os.replace(tmp, self.journal_path)
+        _fsync_directory(self.directory)
+        self._file = f
+        self._generation = generation
+        self.journal_bytes = 0
+        self.snapshots_written += 1
+        self._dirty = False
+
+
+def _json_bytes(value):
+    return np.frombuffer(json.dumps(value).encode("utf-8"), dtype=np.uint8)
+
+
+def _concat(pieces, dtype, width):
+    """Une piezas (arrays o tuplas de Python de los add_node/add_element sueltos) en un array."""
+    shape = (-1, width) if width else (-1,)
+    arrays, loose = [], []
+    for piece in pieces:
+        if isinstance(piece, np.ndarray):
+            if loose:
+                arrays.append(np.array(loose, dtype=dtype).reshape(shape))
+                loose = []
+            arrays.append(piece.astype(dtype, copy=False).reshape(shape))
+        else:
+            loose.extend(piece)
+    if loose:
+        arrays.append(np.array(loose, dtype=dtype).reshape(shape))
+    return arrays[0] if len(arrays) == 1 else np.concatenate(arrays)
+
+
+def _fsync_directory(directory):
+    # Hace duraderos los renombrados (no disponible en Windows)
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+# --- RECUPERACIÓN ---
+def has_recovery(directory=None):
+    """True si quedaron archivos de una sesión que no se cerró limpiamente."""
+    directory = directory or default_directory()
+    return os.path.exists(os.path.join(directory, SNAPSHOT_FILE))
+
+
+def discard_files(directory=None):
+    directory = directory or default_directory()
+    for name in (SNAPSHOT_FILE, JOURNAL_FILE, SNAPSHOT_FILE + ".part", JOURNAL_FILE + ".part"):
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError:
+            pass
+
+
+def load_snapshot(path):
+    """(estado en formato de DocumentModel.state_arrays, generación)."""
+    with np.load(path, allow_pickle=False) as z:
+        state = {key: z[key] for key in ("node_ids", "node_coords", "element_ids", "element_conn", "counters")}
+        state["materials"] = json.loads(z["materials"].tobytes().decode("utf-8"))
+        # Snapshots anteriores a las cargas / secciones no tienen estas claves
+        if "sections" in z.files:
+            state["sections"] = json.loads(z["sections"].tobytes().decode("utf-8"))
+            state["element_material"] = z["element_material"]
+            state["element_section"] = z["element_section"]
+        if "load_patterns" in z.files:
+            state["load_patterns"] = json.loads(z["load_patterns"].tobytes().decode("utf-8"))
+            state["nodal_loads"] = z["nodal_loads"]
+            state["member_loads"] = z["member_loads"]
+        return state, int(z["generation"])
+
+
+def read_journal(path):
+    """
+    (generación, lista de (op, ids, data), truncado). Lee hasta el primer
+    registro incompleto o con crc incorrecto (escritura interrumpida).
+    """
+    with open(path, "rb") as f:
+        buf = f.read()
+    if len(buf) < _FILE_HEADER.size:
+        return None, [], bool(buf)
+    magic, generation = _FILE_HEADER.unpack_from(buf, 0)
+    if magic != _MAGIC:
+        return None, [], True
+    records = []
+    pos, end = _FILE_HEADER.size, len(buf)
+    while pos < end:
+        if pos + _RECORD.size > end:
+            return generation, records, True
+        code, n, size, crc = _RECORD.unpack_from(buf, pos)
+        start = pos + _RECORD.size
+        payload = buf[start:start + size]
+        op = _OP_NAMES.get(code)
+        if op is None or len(payload) != size or zlib.crc32(payload) != crc:
+            return generation, records, True
+        ids = np.frombuffer(payload, dtype=np.int64, count=n)
+        _, dtype, width = _OPS[op]
+        if op in _JSON_OPS:
+            data = json.loads(payload[8 * n:].decode("utf-8"))
+            records.append((op, int(ids[0]), tuple(data)))
+        else:
+            data = np.frombuffer(payload, dtype=dtype, offset=8 * n).reshape(-1, width) if width else None
+            records.append((op, ids, data))
+        pos = start + size
+    return generation, records, False
+
+
+def recover(model, directory=None):
+    """
+    Carga el último snapshot en `model` y reaplica su journal. Devuelve un
+    resumen {"nodes", "elements", "records", "truncated", "elapsed"}.
+    """
+    directory = directory or default_directory()
+    start = time.perf_counter()
+    state, generation = load_snapshot(os.path.join(directory, SNAPSHOT_FILE))
+    model.load_state(state)
+
+    records, truncated = [], False
+    journal_path = os.path.join(directory, JOURNAL_FILE)
+    if os.path.exists(journal_path):
+        journal_gen, records, truncated = read_journal(journal_path)
+        if journal_gen != generation:
+            records = []  # journal de otra generación: ya está dentro del snapshot
+    replay(model, records)
+    return {"nodes": len(model.node_ids), "elements": len(model.element_ids), "records": len(records),
+            "truncated": truncated, "elapsed": time.perf_counter() - start}
+
+
+def replay(model, records):
+    """
+    Aplica los registros en orden equivalente al original, por tablas: las
+    operaciones sobre nodos y sobre frames son independientes entre sí, y
+    como los IDs no se reutilizan, las altas, cambios y bajas de cada tabla
+    se pueden aplicar en bloque (todas las altas, luego cambios, luego bajas).
+    Si algún ID se añadió dos veces se reaplica esa tabla registro a registro.
+    Las cargas van al final (valores resultantes: en cada tabla vale el
+    último) y luego se quitan las de nodos / frames que ya no existen.
+    """
+    buckets = collections.defaultdict(list)
+    for op, ids, data in records:
+        buckets[op].append((ids, data))
+    for op in _JSON_OPS:
+        for item_id, values in buckets.pop(op, []):
+            model.apply_recorded(op, item_id, values)
+
+    for table, existing, stream in (("nodes", model.node_ids, ("nodes+", "nodes-")),
+                                    ("elems", model.element_ids, ("elems+", "conn=", "elem_props", "elems-"))):
+        added = [ids for ids, _ in buckets[table + "+"]]
+        all_ids = np.concatenate([existing] + added)
+        if len(np.unique(all_ids)) != len(all_ids):
+            for op, ids, data in records:
+                if op in stream:
+                    model.apply_recorded(op, ids, data)
+            continue
+        for op in stream:
+            group = buckets[op]
+            if not group:
+                continue
+            ids = np.concatenate([g[0] for g in group])
+            data = np.concatenate([g[1] for g in group]) if _OPS[op][2] else None
+            if op in ("conn=", "elem_props"):
+                # Varios cambios del mismo frame: vale el último
+                _, last = np.unique(ids[::-1], return_index=True)
+                keep = len(ids) - 1 - last
+                ids, data = ids[keep], data[keep]
+            model.apply_recorded(op, ids, data)
+
+    for op in ("nodal_loads", "member_loads"):
+        group = buckets[op]
+        if group:
+            model.apply_recorded(op, np.concatenate([g[0] for g in group]),
+                                 np.concatenate([g[1] for g in group]))
+    model.prune_loads()
@@ -0,0 +1,174 @@
+"""
+Cargas por patrón en arrays columnares (solo numpy, sin Qt).
+
+Un patrón de carga es una fila de metadatos (id, nombre, multiplicador de
+peso propio). Las cargas de todos los patrones viven en dos tablas:
+nodales (Fx, Fy, Fz, Mx, My, Mz) y uniformes sobre frames (wx, wy, wz por
+unidad de longitud, ejes globales). Asignar una carga a N nodos es una sola
+actualización de la tabla, no N objetos.
+
+Las cargas nodales equivalentes de todos los frames se calculan en bloque
+(empotramiento perfecto de una carga uniforme) y se acumulan por nodo con
+bincount:
+
+    F_i = F_j = w L / 2        M_i = (L / 12) d x w = -M_j        (d = p_j - p_i)
+"""
+import numpy as np
+
+NODAL_COMPONENTS = ("Fx", "Fy", "Fz", "Mx", "My", "Mz")
+MEMBER_COMPONENTS = ("wx", "wy", "wz")
+# Dirección del peso propio (gravedad en -Z)
+GRAVITY = np.array([0.0, 0.0, -1.0])
+
+# Clave de fila: patrón en los bits altos, id en los 40 bajos
+_ID_BITS = 40
+
+
+def _keys(patterns, ids):
+    return (np.asarray(patterns, dtype=np.int64) << _ID_BITS) | np.asarray(ids, dtype=np.int64)
+
+
+class LoadTable:
+    """
+    Filas (patrón, id, valores[width]) de todos los patrones, ordenadas por
+    (patrón, id) y sin duplicados. Una fila con todos los valores a cero no se guarda.
+    """
+
+    def __init__(self, width):
+        self.width = width
+        self.clear()
+
+    def clear(self):
+        self.patterns = np.zeros(0, dtype=np.int64)
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.values = np.zeros((0, self.width), dtype=np.float64)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def keys(self):
+        return _keys(self.patterns, self.ids)
+
+    def upsert(self, patterns, ids, values, add=False):
+        """
+        Asigna (add=False) o suma (add=True) `values` a las filas (patrón, id);
+        patterns es un escalar o un array por fila y values una fila (width,)
+        o (K, width). Los ids repetidos de la entrada se suman con add y, sin
+        él, vale el último. Devuelve (patrones, ids, valores) resultantes de
+        las filas tocadas (valores a cero = fila eliminada).
+        """
+        ids = np.asarray(ids, dtype=np.int64).reshape(-1)
+        patterns = np.broadcast_to(np.asarray(patterns, dtype=np.int64), ids.shape)
+        values = np.broadcast_to(np.asarray(values, dtype=np.float64), (len(ids), self.width))
+        keys, inverse, last = _group_keys(_keys(patterns, ids))
+        if add:
+            new_values = np.empty((len(keys), self.width))
+            for k in range(self.width):
+                new_values[:, k] = np.bincount(inverse, weights=values[:, k], minlength=len(keys))
+        else:
+            new_values = values[last]  # en asignaciones repetidas gana la última
+
+        old_keys = self.keys
+        pos = np.searchsorted(old_keys, keys)
+        found = pos < len(old_keys)
+        found[found] = old_keys[pos[found]] == keys[found]
+        if add:
+            new_values[found] += self.values[pos[found]]
+
+        # Tabla nueva: filas sin tocar + filas resultantes no nulas, en orden de clave
+        keep = np.ones(len(old_keys), dtype=bool)
+        keep[pos[found]] = False
+        nonzero = new_values.any(axis=1)
+        merged_keys = np.concatenate([old_keys[keep], keys[nonzero]])
+        order = np.argsort(merged_keys, kind="stable")
+        merged_values = np.concatenate([self.values[keep], new_values[nonzero]])[order]
+        merged_keys = merged_keys[order]
+        self.patterns = merged_keys >> _ID_BITS
+        self.ids = merged_keys & ((1 << _ID_BITS) - 1)
+        self.values = merged_values
+        return keys >> _ID_BITS, keys & ((1 << _ID_BITS) - 1), new_values
+
+    def keep(self, mask):
+        self.patterns = self.patterns[mask]
+        self.ids = self.ids[mask]
+        self.values = self.values[mask]
+
+    def drop_ids(self, ids):
+        """Quita las filas de esos ids en todos los patrones; devuelve cuántas."""
+        gone = np.isin(self.ids, np.asarray(ids, dtype=np.int64))
+        if gone.any():
+            self.keep(~gone)
+        return int(gone.sum())
+
+    def of_pattern(self, pattern_id):
+        """(ids, valores) del patrón: un corte contiguo de la tabla."""
+        lo, hi = np.searchsorted(self.patterns, [pattern_id, pattern_id + 1])
+        return self.ids[lo:hi], self.values[lo:hi]
+
+    def rows(self):
+        """(K, 2 + width) float64: patrón, id, valores (para snapshots)."""
+        return np.column_stack([self.patterns, self.ids, self.values]).astype(np.float64)
+
+    def load_rows(self, rows):
+        rows = np.asarray(rows, dtype=np.float64).reshape(-1, 2 + self.width)
+        self.clear()
+        self.upsert(rows[:, 0].astype(np.int64), rows[:, 1].astype(np.int64), rows[:, 2:])
+
+
+def _group_keys(keys):
+    """
+    (claves únicas ordenadas, grupo de cada clave de entrada, última aparición
+    de cada clave única). Por ordenación: con claves ya ordenadas, sin argsort.
+    """
+    if len(keys) < 2 or bool((keys[1:] > keys[:-1]).all()):
+        index = np.arange(len(keys))
+        return keys, index, index
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    last = np.r_[sorted_keys[1:] != sorted_keys[:-1], True]
+    inverse = np.empty(len(keys), dtype=np.int64)
+    inverse[order] = np.cumsum(np.r_[True, last[:-1]]) - 1
+    return sorted_keys[last], inverse, order[last]
+
+
+def fixed_end_forces(p0, p1, w):
+    """
+    Cargas nodales equivalentes de cargas uniformes globales w (E,3) por
+    unidad de longitud sobre los frames p0 -> p1: (fuerza, momento), cada uno
+    (E,3), en el nodo inicial; en el final la fuerza es la misma y el momento el opuesto.
+    """
+    d = p1 - p0
+    length = np.sqrt(np.einsum("ij,ij->i", d, d))
+    force = w * (0.5 * length)[:, None]
+    moment = np.empty_like(d)
+    for k in range(3):
+        a, b = (k + 1) % 3, (k + 2) % 3
+        moment[:, k] = d[:, a] * w[:, b] - d[:, b] * w[:, a]
+    moment *= (length / 12.0)[:, None]
+    return force, moment
+
+
+def assemble_nodal(n_nodes, rows, values, rows_i=None, rows_j=None, force=None, moment=None):
+    """
+    (n_nodes, 6) suma de las cargas nodales values (K,6) en los nodos rows y,
+    si se dan, de las equivalentes de frames (ver fixed_end_forces) en sus
+    nodos inicial rows_i y final rows_j. Un bincount por componente.
+    """
+    out = np.empty((n_nodes, 6))
+    for k in range(6):
+        out[:, k] = np.bincount(rows, weights=values[:, k], minlength=n_nodes)
+        if force is None:
+            continue
+        column = force[:, k] if k < 3 else moment[:, k - 3]
+        out[:, k] += np.bincount(rows_i, weights=column, minlength=n_nodes)
+        if k < 3:
+            out[:, k] += np.bincount(rows_j, weights=column, minlength=n_nodes)
+        else:
+            out[:, k] -= np.bincount(rows_j, weights=column, minlength=n_nodes)
+    return out
+
+
+def self_weight_loads(weight_per_length, multiplier=1.0):
+    """(E,3) carga uniforme global del peso propio: w = multiplicador * gamma * A en -Z."""
+    return np.outer(np.asarray(weight_per_length, dtype=np.float64) * multiplier, GRAVITY)
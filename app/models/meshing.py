@@ -0,0 +1,51 @@
+"""
+División de frames (numpy, sin Qt): parámetros de corte para subdividir en
+n tramos y para partir frames en sus cruces con otros frames.
+
+Un corte es (fila del frame, s) con 0 < s < 1 sobre el frame inicio -> fin;
+DocumentModel.split_elements() aplica una lista de cortes de una vez.
+"""
+import numpy as np
+
+from app.models.spatial import segment_candidate_pairs, segment_closest_params
+
+
+def division_splits(rows, n):
+    """Cortes para dividir cada frame de `rows` en n tramos iguales."""
+    rows = np.asarray(rows, dtype=np.int64).reshape(-1)
+    if n < 2:
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+    fractions = np.arange(1, n) / n
+    return np.repeat(rows, n - 1), np.tile(fractions, len(rows))
+
+
+def intersection_splits(p0, p1, conn, tol):
+    """
+    Cortes en los cruces entre frames (p0[i]-p1[i]; conn son los IDs de sus
+    nodos). Fase amplia con rejilla uniforme, fase fina con el punto más
+    cercano entre segmentos. Un cruce a distancia <= tol parte cada frame
+    cuyo punto de cruce no está en uno de sus extremos (cruces en X y
+    uniones en T); frames que ya comparten un nodo no se comparan.
+    Devuelve (filas, s, pares) con pares = número de cruces encontrados.
+    """
+    p0 = np.asarray(p0, dtype=np.float64)
+    p1 = np.asarray(p1, dtype=np.float64)
+    conn = np.asarray(conn, dtype=np.int64).reshape(-1, 2)
+    lengths = np.sqrt(np.einsum("ij,ij->i", p1 - p0, p1 - p0))
+    valid = np.flatnonzero(lengths > tol)
+
+    i, j = segment_candidate_pairs(p0[valid], p1[valid], pad=tol)
+    i, j = valid[i], valid[j]
+    shared = ((conn[i, 0] == conn[j, 0]) | (conn[i, 0] == conn[j, 1]) |
+              (conn[i, 1] == conn[j, 0]) | (conn[i, 1] == conn[j, 1]))
+    i, j = i[~shared], j[~shared]
+
+    s, t, dist = segment_closest_params(p0[i], p1[i], p0[j], p1[j])
+    hit = dist <= tol
+    i, j, s, t = i[hit], j[hit], s[hit], t[hit]
+    # Interior en unidades de longitud: un cruce a menos de tol de un extremo no parte ese frame
+    inner_i = (s * lengths[i] > tol) & ((1.0 - s) * lengths[i] > tol)
+    inner_j = (t * lengths[j] > tol) & ((1.0 - t) * lengths[j] > tol)
+    rows = np.concatenate([i[inner_i], j[inner_j]])
+    params = np.concatenate([s[inner_i], t[inner_j]])
+    return rows, params, int(len(i))
@@ -0,0 +1,60 @@
+"""
+Replicación vectorizada de geometría (numpy, sin Qt): copias lineales,
+radiales y espejo.
+
+Una transformación afín por copia: p' = R @ p + t, con R (K,3,3) y t (K,3).
+Todas las copias salen de una sola operación broadcast (K,N,3); la
+conectividad de la copia k es la del original desplazada k*N filas.
+"""
+import numpy as np
+
+_AXES = {"X": 0, "Y": 1, "Z": 2}
+
+
+def linear_transforms(offset, count):
+    """`count` copias desplazadas k*offset (k = 1..count)."""
+    steps = np.arange(1, count + 1, dtype=np.float64)[:, None]
+    rotations = np.broadcast_to(np.eye(3), (count, 3, 3))
+    return rotations, steps * np.asarray(offset, dtype=np.float64)
+
+
+def radial_transforms(angle_deg, count, axis="Z", center=(0.0, 0.0, 0.0)):
+    """`count` copias giradas k*angle_deg alrededor de un eje paralelo a X/Y/Z que pasa por `center`."""
+    a = np.radians(angle_deg) * np.arange(1, count + 1)
+    c, s = np.cos(a), np.sin(a)
+    i = _AXES[axis.upper()]
+    j, k = (i + 1) % 3, (i + 2) % 3
+    rotations = np.zeros((count, 3, 3))
+    rotations[:, i, i] = 1.0
+    rotations[:, j, j] = c
+    rotations[:, j, k] = -s
+    rotations[:, k, j] = s
+    rotations[:, k, k] = c
+    center = np.asarray(center, dtype=np.float64)
+    # Giro alrededor de center: p' = R (p - c) + c
+    return rotations, center - rotations @ center
+
+
+def mirror_transform(point, normal):
+    """Una copia reflejada respecto del plano (punto, normal)."""
+    n = np.asarray(normal, dtype=np.float64)
+    n = n / (np.linalg.norm(n) or 1.0)
+    reflection = np.eye(3) - 2.0 * np.outer(n, n)
+    offset = 2.0 * np.dot(np.asarray(point, dtype=np.float64), n) * n
+    return reflection[None], offset[None]
+
+
+def replicate_arrays(coords, conn_rows, rotations, translations):
+    """
+    coords (N,3) y conn_rows (E,2) (filas de coords) -> (K*N,3) y (K*E,2).
+    La copia k ocupa las filas [k*N, (k+1)*N) y sus frames las [k*E, (k+1)*E).
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+    conn_rows = np.asarray(conn_rows, dtype=np.int64).reshape(-1, 2)
+    rotations = np.asarray(rotations, dtype=np.float64).reshape(-1, 3, 3)
+    translations = np.asarray(translations, dtype=np.float64).reshape(-1, 3)
+    n = len(coords)
+    new_coords = np.einsum("kij,nj->kni", rotations, coords) + translations[:, None, :]
+    offsets = np.arange(len(rotations), dtype=np.int64)[:, None, None] * n
+    new_conn = conn_rows[None, :, :] + offsets
+    return new_coords.reshape(-1, 3), new_conn.reshape(-1, 2)
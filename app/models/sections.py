@@ -0,0 +1,235 @@
+"""
+Biblioteca de secciones paramétricas (solo numpy, sin Qt).
+
+Cada forma calcula sus propiedades (A, Iy, Iz, J) una sola vez
+(cached_property). Convención de ejes locales: el canto h va según z y el
+ancho b según y, así que Iy = flexión fuerte (b h³ / 12 en un rectángulo).
+
+Las propiedades se consultan por frame con indexado: property_lookup() es
+una tabla densa (id de sección -> fila) que se indexa con la columna de
+secciones de todos los frames a la vez, sin diccionarios por frame.
+
+    lib = SectionLibrary()
+    sid = lib.add(make_section("rectangle", "V30x60", b=0.3, h=0.6))
+    props = lib.gather(section_ids)                    # (E,4): A, Iy, Iz, J
+"""
+import math
+from functools import cached_property
+
+import numpy as np
+
+PROPERTY_NAMES = ("A", "Iy", "Iz", "J")
+
+
+class Section:
+    SHAPE = None
+    # (parámetro, etiqueta, valor por defecto) en el orden del constructor
+    PARAMETERS = ()
+
+    def __init__(self, name, **params):
+        missing = [p for p, _, _ in self.PARAMETERS if p not in params]
+        if missing:
+            raise ValueError(f"Section '{name}': missing parameters {missing}")
+        for p, _, _ in self.PARAMETERS:
+            value = float(params[p])
+            if not value > 0:
+                raise ValueError(f"Section '{name}': {p} must be positive")
+            setattr(self, p, value)
+        self.name = name
+        self._validate()
+
+    def _validate(self):
+        pass
+
+    @property
+    def params(self):
+        return {p: getattr(self, p) for p, _, _ in self.PARAMETERS}
+
+    def to_record(self):
+        """(forma, nombre, parámetros): serializable en JSON (journal / snapshots)."""
+        return self.SHAPE, self.name, self.params
+
+    @cached_property
+    def properties(self):
+        """(A, Iy, Iz, J) calculadas una vez."""
+        return (self.A, self.Iy, self.Iz, self.J)
+
+    def __repr__(self):
+        params = ", ".join(f"{k}={v:g}" for k, v in self.params.items())
+        return f"{type(self).__name__}({self.name!r}, {params})"
+
+
+class RectangleSection(Section):
+    SHAPE = "rectangle"
+    PARAMETERS = (("b", "Width (b)", 0.3), ("h", "Depth (h)", 0.5))
+
+    @cached_property
+    def A(self):
+        return self.b * self.h
+
+    @cached_property
+    def Iy(self):
+        return self.b * self.h ** 3 / 12.0
+
+    @cached_property
+    def Iz(self):
+        return self.h * self.b ** 3 / 12.0
+
+    @cached_property
+    def J(self):
+        # Saint-Venant para rectángulo macizo (lado largo a, corto c)
+        a, c = max(self.b, self.h), min(self.b, self.h)
+        return a * c ** 3 * (1.0 / 3.0 - 0.21 * (c / a) * (1.0 - c ** 4 / (12.0 * a ** 4)))
+
+
+class ISection(Section):
+    SHAPE = "I"
+    PARAMETERS = (("h", "Depth (h)", 0.4), ("bf", "Flange width (bf)", 0.2),
+                  ("tf", "Flange thickness (tf)", 0.015), ("tw", "Web thickness (tw)", 0.01))
+
+    def _validate(self):
+        if 2 * self.tf >= self.h or self.tw >= self.bf:
+            raise ValueError(f"Section '{self.name}': flanges/web do not fit (2 tf < h, tw < bf)")
+
+    @cached_property
+    def A(self):
+        return 2 * self.bf * self.tf + (self.h - 2 * self.tf) * self.tw
+
+    @cached_property
+    def Iy(self):
+        hw = self.h - 2 * self.tf
+        return (self.bf * self.h ** 3 - (self.bf - self.tw) * hw ** 3) / 12.0
+
+    @cached_property
+    def Iz(self):
+        return (2 * self.tf * self.bf ** 3 + (self.h - 2 * self.tf) * self.tw ** 3) / 12.0
+
+    @cached_property
+    def J(self):
+        # Sección abierta de pared delgada: suma de b t³ / 3
+        return (2 * self.bf * self.tf ** 3 + (self.h - 2 * self.tf) * self.tw ** 3) / 3.0
+
+
+class PipeSection(Section):
+    SHAPE = "pipe"
+    PARAMETERS = (("d", "Outside diameter (d)", 0.3), ("t", "Wall thickness (t)", 0.01))
+
+    def _validate(self):
+        if 2 * self.t > self.d:
+            raise ValueError(f"Section '{self.name}': wall thickness exceeds the radius")
+
+    @cached_property
+    def A(self):
+        return math.pi / 4.0 * (self.d ** 2 - (self.d - 2 * self.t) ** 2)
+
+    @cached_property
+    def Iy(self):
+        return math.pi / 64.0 * (self.d ** 4 - (self.d - 2 * self.t) ** 4)
+
+    @cached_property
+    def Iz(self):
+        return self.Iy
+
+    @cached_property
+    def J(self):
+        return 2.0 * self.Iy
+
+
+class BoxSection(Section):
+    SHAPE = "box"
+    PARAMETERS = (("h", "Depth (h)", 0.3), ("b", "Width (b)", 0.2),
+                  ("tf", "Flange thickness (tf)", 0.01), ("tw", "Web thickness (tw)", 0.01))
+
+    def _validate(self):
+        if 2 * self.tf >= self.h or 2 * self.tw >= self.b:
+            raise ValueError(f"Section '{self.name}': walls do not fit (2 tf < h, 2 tw < b)")
+
+    @cached_property
+    def A(self):
+        return self.b * self.h - (self.b - 2 * self.tw) * (self.h - 2 * self.tf)
+
+    @cached_property
+    def Iy(self):
+        return (self.b * self.h ** 3 - (self.b - 2 * self.tw) * (self.h - 2 * self.tf) ** 3) / 12.0
+
+    @cached_property
+    def Iz(self):
+        return (self.h * self.b ** 3 - (self.h - 2 * self.tf) * (self.b - 2 * self.tw) ** 3) / 12.0
+
+    @cached_property
+    def J(self):
+        # Sección cerrada de pared delgada (Bredt) sobre la línea media
+        bm, hm = self.b - self.tw, self.h - self.tf
+        return 2.0 * self.tw * self.tf * bm ** 2 * hm ** 2 / (bm * self.tw + hm * self.tf)
+
+
+SHAPES = {cls.SHAPE: cls for cls in (RectangleSection, ISection, PipeSection, BoxSection)}
+
+
+def make_section(shape, name, **params):
+    cls = SHAPES.get(shape)
+    if cls is None:
+        raise ValueError(f"Unknown section shape '{shape}' (expected one of {sorted(SHAPES)})")
+    return cls(name, **params)
+
+
+class SectionLibrary:
+    """Secciones por id (empezando en 1; 0 = frame sin sección) y su tabla densa de propiedades."""
+
+    def __init__(self):
+        self._sections = {}
+        self.next_id = 1
+        self._lookup = None
+
+    def __len__(self):
+        return len(self._sections)
+
+    def __iter__(self):
+        return iter(self._sections.items())
+
+    def __contains__(self, section_id):
+        return section_id in self._sections
+
+    def get(self, section_id):
+        return self._sections[section_id]
+
+    def add(self, section, section_id=None):
+        if section_id is None:
+            section_id = self.next_id
+        self._sections[int(section_id)] = section
+        self.next_id = max(self.next_id, int(section_id) + 1)
+        self._lookup = None
+        return int(section_id)
+
+    def clear(self):
+        self._sections.clear()
+        self.next_id = 1
+        self._lookup = None
+
+    def records(self):
+        """[(id, forma, nombre, parámetros)] (ver Section.to_record)."""
+        return [(sid, *section.to_record()) for sid, section in self._sections.items()]
+
+    def memory_footprint(self, report):
+        """Partidas de memoria (ver app/memory.py)."""
+        report.add("model arrays", "section definitions", report.sizeof(self._sections))
+        report.add("caches", "section property table", report.nbytes(self._lookup))
+
+    def property_lookup(self):
+        """
+        (max_id + 1, 4) A, Iy, Iz, J indexada por id de sección; la fila 0 y
+        los huecos son NaN (sin sección). Se rehace solo al añadir secciones.
+        """
+        if self._lookup is None:
+            lookup = np.full((self.next_id, len(PROPERTY_NAMES)), np.nan)
+            for sid, section in self._sections.items():
+                lookup[sid] = section.properties
+            self._lookup = lookup
+        return self._lookup
+
+    def gather(self, section_ids):
+        """(E,4) propiedades de cada frame por su id de sección (NaN si no tiene o no existe)."""
+        lookup = self.property_lookup()
+        section_ids = np.asarray(section_ids, dtype=np.int64)
+        valid = (section_ids >= 0) & (section_ids < len(lookup))
+        return lookup[np.where(valid, section_ids, 0)]
@@ -0,0 +1,253 @@
+"""
+Selecciones como máscaras booleanas sobre arrays de IDs (solo numpy, sin Qt).
+
+    sel = SelectionSet(model.node_ids, model.element_ids)
+    sel.frames.set(frame_orientation_mask(model.element_vectors(), "column"))
+    sel = sel | other        # unión; también &, -, ~ (invertir)
+
+Las consultas son funciones vectorizadas que devuelven una máscara por fila;
+no dependen de Qt y se pueden usar desde scripts y modo batch.
+"""
+import numpy as np
+
+# Modos de combinación de una consulta con la selección actual
+MODES = ("replace", "add", "remove", "intersect")
+
+
+class IdMask:
+    """
+    Subconjunto de `ids` guardado como máscara booleana por fila. Se comporta
+    como un conjunto de IDs (in, len, iter, bool) para el código existente.
+    """
+    __slots__ = ("ids", "mask", "_sorted")
+
+    def __init__(self, ids, mask=None):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.mask = np.zeros(len(self.ids), dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+        self._sorted = None
+
+    # --- Construcción / reasignación ---
+    def rows_of(self, id_values):
+        """Filas de los IDs dados que existen en `ids`."""
+        id_values = _as_ids(id_values)
+        if len(self.ids) == 0 or len(id_values) == 0:
+            return np.zeros(0, dtype=np.int64)
+        if self._sorted is None:
+            order = np.argsort(self.ids, kind="stable")
+            self._sorted = (order, self.ids[order])
+        order, sorted_ids = self._sorted
+        pos = np.clip(np.searchsorted(sorted_ids, id_values), 0, len(sorted_ids) - 1)
+        return order[pos[sorted_ids[pos] == id_values]]
+
+    def set(self, rows_or_mask, mode="replace"):
+        """Combina una máscara (o filas) con la selección actual según `mode`."""
+        other = self._as_mask(rows_or_mask)
+        if mode == "replace":
+            self.mask = other
+        elif mode == "add":
+            self.mask = self.mask | other
+        elif mode == "remove":
+            self.mask = self.mask & ~other
+        elif mode == "intersect":
+            self.mask = self.mask & other
+        else:
+            raise ValueError(f"Unknown selection mode '{mode}' (expected one of {MODES})")
+
+    def set_ids(self, id_values, mode="replace"):
+        if isinstance(id_values, IdMask):
+            self.set_masked(id_values.ids, id_values.mask, mode)
+        else:
+            self.set(self.rows_of(id_values), mode)
+
+    def set_masked(self, id_values, mask, mode="replace"):
+        """Como set(), con una máscara sobre otro array de IDs (p.ej. las filas del modelo)."""
+        id_values = np.asarray(id_values)
+        if id_values is self.ids or (len(id_values) == len(self.ids) and np.array_equal(id_values, self.ids)):
+            self.set(mask, mode)
+        else:
+            self.set(self.rows_of(id_values[np.asarray(mask, dtype=bool)]), mode)
+
+    def toggle_row(self, row):
+        self.mask[row] = not self.mask[row]
+
+    def clear(self):
+        self.mask = np.zeros(len(self.ids), dtype=bool)
+
+    def rebase(self, new_ids):
+        """Misma selección (por ID) sobre otro array de IDs (tras cambiar el modelo)."""
+        new_ids = np.asarray(new_ids, dtype=np.int64)
+        if len(new_ids) == len(self.ids) and np.array_equal(new_ids, self.ids):
+            return self
+        result = IdMask(new_ids)
+        if self.mask.any():
+            result.mask[result.rows_of(self.ids[self.mask])] = True
+        return result
+
+    def _as_mask(self, rows_or_mask):
+        arr = rows_or_mask.mask if isinstance(rows_or_mask, IdMask) else np.asarray(rows_or_mask)
+        if arr.dtype == bool:
+            if arr.shape != self.mask.shape:
+                raise ValueError("mask length does not match the id array")
+            return arr.copy()
+        mask = np.zeros(len(self.ids), dtype=bool)
+        mask[arr.astype(np.int64)] = True
+        return mask
+
+    # --- Consulta ---
+    def selected_ids(self):
+        return self.ids[self.mask]
+
+    def count(self):
+        return int(np.count_nonzero(self.mask))
+
+    def __len__(self):
+        return self.count()
+
+    def __bool__(self):
+        return bool(self.mask.any())
+
+    def __iter__(self):
+        return iter(self.selected_ids().tolist())
+
+    def __contains__(self, id_value):
+        rows = self.rows_of([id_value])
+        return bool(len(rows) and self.mask[rows[0]])
+
+    # --- Álgebra (sobre el mismo array de IDs) ---
+    def _combine(self, other, op):
+        if not isinstance(other, IdMask) or len(other.ids) != len(self.ids):
+            return NotImplemented
+        return IdMask(self.ids, op(self.mask, other.mask))
+
+    def __or__(self, other):
+        return self._combine(other, np.logical_or)
+
+    def __and__(self, other):
+        return self._combine(other, np.logical_and)
+
+    def __sub__(self, other):
+        return self._combine(other, lambda a, b: a & ~b)
+
+    def __invert__(self):
+        return IdMask(self.ids, ~self.mask)
+
+    def copy(self):
+        return IdMask(self.ids, self.mask.copy())
+
+    def __repr__(self):
+        return f"IdMask({self.count()} of {len(self.ids)})"
+
+
+class SelectionSet:
+    """Selección de nodos y frames (una IdMask para cada uno)."""
+
+    def __init__(self, node_ids=(), elem_ids=()):
+        self.nodes = node_ids if isinstance(node_ids, IdMask) else IdMask(node_ids)
+        self.frames = elem_ids if isinstance(elem_ids, IdMask) else IdMask(elem_ids)
+
+    def rebase(self, node_ids, elem_ids):
+        return SelectionSet(self.nodes.rebase(node_ids), self.frames.rebase(elem_ids))
+
+    def clear(self):
+        self.nodes.clear()
+        self.frames.clear()
+
+    def is_empty(self):
+        return not (self.nodes or self.frames)
+
+    def count(self):
+        return self.nodes.count() + self.frames.count()
+
+    def copy(self):
+        return SelectionSet(self.nodes.copy(), self.frames.copy())
+
+    def __or__(self, other):
+        return SelectionSet(self.nodes | other.nodes, self.frames | other.frames)
+
+    def __and__(self, other):
+        return SelectionSet(self.nodes & other.nodes, self.frames & other.frames)
+
+    def __sub__(self, other):
+        return SelectionSet(self.nodes - other.nodes, self.frames - other.frames)
+
+    def __invert__(self):
+        return SelectionSet(~self.nodes, ~self.frames)
+
+    def __repr__(self):
+        return f"SelectionSet(nodes={self.nodes.count()}, frames={self.frames.count()})"
+
+
+def _as_ids(values):
+    if isinstance(values, IdMask):
+        return values.selected_ids()
+    if isinstance(values, (set, frozenset)):
+        return np.fromiter(values, dtype=np.int64, count=len(values))
+    return np.asarray(values, dtype=np.int64).reshape(-1)
+
+
+# --- CONSULTAS (una expresión vectorizada cada una) ---
+
+def nodes_in_box(coords, lo=(None, None, None), hi=(None, None, None)):
+    """Nodos con lo <= coord <= hi por eje (None = sin límite)."""
+    coords = np.asarray(coords, dtype=np.float64)
+    lo = np.array([-np.inf if v is None else v for v in lo])
+    hi = np.array([np.inf if v is None else v for v in hi])
+    return np.all((coords >= lo) & (coords <= hi), axis=1)
+
+
+def nodes_on_plane(coords, point, normal, tol=1e-6):
+    """Nodos a distancia <= tol del plano (punto, normal)."""
+    normal = np.asarray(normal, dtype=np.float64)
+    normal = normal / (np.linalg.norm(normal) or 1.0)
+    return np.abs((np.asarray(coords, dtype=np.float64) - np.asarray(point, dtype=np.float64)) @ normal) <= tol
+
+
+def frame_lengths(vectors):
+    return np.sqrt(np.einsum("ij,ij->i", vectors, vectors))
+
+
+def frames_by_length(vectors, min_length=None, max_length=None):
+    lengths = frame_lengths(vectors)
+    mask = np.isfinite(lengths)
+    if min_length is not None:
+        mask &= lengths >= min_length
+    if max_length is not None:
+        mask &= lengths <= max_length
+    return mask
+
+
+def frames_by_direction(vectors, direction, angle_tol_deg=1.0):
+    """Frames paralelos (en cualquier sentido) a `direction`, dentro de angle_tol_deg."""
+    direction = np.asarray(direction, dtype=np.float64)
+    direction = direction / (np.linalg.norm(direction) or 1.0)
+    lengths = frame_lengths(vectors)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cos = np.abs(vectors @ direction) / lengths
+    return np.nan_to_num(cos) >= np.cos(np.radians(angle_tol_deg))
+
+
+def frame_orientation_mask(vectors, kind, angle_tol_deg=1.0):
+    """
+    'column': vertical (paralelo a Z); 'beam': horizontal (perpendicular a Z);
+    'brace': el resto (ni vertical ni horizontal). Frames de longitud nula o
+    con nodos inexistentes (NaN) no entran en ninguna categoría.
+    Se compara vz² con cos²·L² para evitar raíces y divisiones.
+    """
+    sq = np.einsum("ij,ij->i", vectors, vectors)
+    vz2 = vectors[:, 2] * vectors[:, 2]
+    tol = np.radians(angle_tol_deg)
+    valid = sq > 0
+    column = vz2 >= np.cos(tol) ** 2 * sq
+    beam = vz2 <= np.sin(tol) ** 2 * sq
+    if kind == "column":
+        return column & valid
+    if kind == "beam":
+        return beam & valid
+    if kind == "brace":
+        return valid & ~column & ~beam
+    raise ValueError(f"Unknown frame orientation '{kind}' (expected column, beam or brace)")
+
+
+def frames_with_attribute(column, values):
+    """Frames cuyo valor en `column` (p. ej. ids de sección o material por frame) está en `values`."""
+    return np.isin(np.asarray(column), np.asarray(values).reshape(-1))
@@ -0,0 +1,294 @@
+"""
+Utilidades espaciales vectorizadas (numpy): búsqueda de pares cercanos con
+rejilla hash 3D, rejilla persistente con inserción incremental (PointGrid),
+componentes conexas (union-find por propagación de mínimos) y pares de
+segmentos próximos (rejilla uniforme + punto más cercano).
+"""
+import numpy as np
+
+# Celdas por eje como máximo, para que la clave empaquetada quepa en int64
+_MAX_CELLS_PER_AXIS = 1 << 20
+
+# Vecinos "hacia delante" de una celda 3D (13) + la propia celda
+_HALF_NEIGHBORS = np.array(
+    [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+     if (dx, dy, dz) > (0, 0, 0)], dtype=np.int64)
+
+
+def _cross_pairs(start_a, count_a, start_b, count_b):
+    """Todos los pares (i, j) entre los rangos [start_a, start_a+count_a) y [start_b, ...)."""
+    tot = count_a * count_b
+    if tot.sum() == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    gid = np.repeat(np.arange(len(tot)), tot)
+    local = np.arange(tot.sum()) - np.repeat(np.cumsum(tot) - tot, tot)
+    cb = count_b[gid]
+    return start_a[gid] + local // cb, start_b[gid] + local % cb
+
+
+def find_close_pairs(coords, tol):
+    """
+    Pares (i, j), i < j, de puntos a distancia <= tol.
+    Rejilla hash de celda >= tol: solo se comparan puntos de celdas vecinas.
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    n = len(coords)
+    empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+    if n < 2:
+        return empty
+    tol = float(tol)
+    lo = coords.min(axis=0)
+    span = float((coords.max(axis=0) - lo).max())
+    # Celdas más grandes que tol siguen siendo correctas (solo más candidatos)
+    cell = max(tol, span / (_MAX_CELLS_PER_AXIS - 2), 1e-12)
+
+    c = np.floor((coords - lo) / cell).astype(np.int64) + 1  # +1: margen para el vecino -1
+    dims = c.max(axis=0) + 2
+
+    def pack(cells):
+        return (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+
+    keys = pack(c)
+    order = np.argsort(keys, kind="stable")
+    skeys = keys[order]
+    ucells, starts, counts = np.unique(skeys, return_index=True, return_counts=True)
+    ucell_xyz = c[order[starts]]
+
+    ia, ib = [], []
+    # Misma celda
+    multi = counts > 1
+    a, b = _cross_pairs(starts[multi], counts[multi], starts[multi], counts[multi])
+    keep = a < b
+    ia.append(a[keep]); ib.append(b[keep])
+    # Celdas vecinas (cada par de celdas una sola vez)
+    for off in _HALF_NEIGHBORS:
+        nkeys = pack(ucell_xyz + off)
+        pos = np.clip(np.searchsorted(ucells, nkeys), 0, len(ucells) - 1)
+        hit = ucells[pos] == nkeys
+        if not hit.any():
+            continue
+        src = np.flatnonzero(hit)
+        dst = pos[hit]
+        a, b = _cross_pairs(starts[src], counts[src], starts[dst], counts[dst])
+        ia.append(a); ib.append(b)
+
+    a = order[np.concatenate(ia)]
+    b = order[np.concatenate(ib)]
+    d = coords[a] - coords[b]
+    close = np.einsum("ij,ij->i", d, d) <= tol * tol
+    a, b = a[close], b[close]
+    return np.minimum(a, b), np.maximum(a, b)
+
+
+def connected_labels(n, a, b):
+    """
+    Componentes conexas de un grafo de n vértices con aristas (a, b).
+    Devuelve labels (n,) donde labels[i] es el menor vértice de su componente.
+    """
+    labels = np.arange(n, dtype=np.int64)
+    a = np.asarray(a, dtype=np.int64)
+    b = np.asarray(b, dtype=np.int64)
+    while len(a):
+        la, lb = labels[a], labels[b]
+        m = np.minimum(la, lb)
+        if np.array_equal(la, lb):
+            break
+        # "Hooking": cada raíz apunta a la menor etiqueta vecina
+        np.minimum.at(labels, la, m)
+        np.minimum.at(labels, lb, m)
+        # Pointer jumping hasta que cada vértice apunte a su raíz
+        while True:
+            nxt = labels[labels]
+            if np.array_equal(nxt, labels):
+                break
+            labels = nxt
+    return labels
+
+
+def coincident_representatives(coords, tol):
+    """Para cada punto, la fila (la menor) del grupo de puntos coincidentes al que pertenece."""
+    a, b = find_close_pairs(coords, tol)
+    return connected_labels(len(coords), a, b)
+
+
+# --- REJILLA PERSISTENTE ---
+# Hash de la celda (ix, iy, iz): las colisiones solo añaden candidatos (se filtra por distancia)
+_HASH_PRIMES = np.array([73856093, 19349663, 83492791], dtype=np.int64)
+_NEIGHBORS = np.array([(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)],
+                      dtype=np.int64)
+# Celda mínima: con tol = 0 solo se buscan puntos idénticos, que caen en la misma celda
+_MIN_CELL = 1e-6
+# Consultas por bloque (cada una genera 27 claves)
+_QUERY_BLOCK = 65536
+
+
+class PointGrid:
+    """
+    Rejilla hash de puntos con celda >= tol, persistente: las filas nuevas
+    se añaden al final sin reconstruir y las consultas solo miran las 27
+    celdas vecinas. Las claves viven ordenadas en arrays; las inserciones
+    sueltas van a un búfer que se fusiona al llenarse.
+
+        grid = PointGrid(tol, coords)
+        query, rows = grid.pairs_within(coords, points, tol)
+        grid.add(new_coords)                   # filas len(coords)...
+    """
+    PENDING_LIMIT = 4096
+
+    def __init__(self, tol, coords=None):
+        self.tol = float(tol)
+        self.cell = max(self.tol, _MIN_CELL)
+        self.size = 0
+        self._keys = np.zeros(0, dtype=np.int64)
+        self._rows = np.zeros(0, dtype=np.int64)
+        self._pending_keys = []
+        self._pending_rows = []
+        if coords is not None and len(coords):
+            self.add(coords)
+
+    @property
+    def nbytes(self):
+        return self._keys.nbytes + self._rows.nbytes + 16 * len(self._pending_keys)
+
+    def _cells(self, points):
+        return np.floor(np.asarray(points, dtype=np.float64).reshape(-1, 3) / self.cell).astype(np.int64)
+
+    @staticmethod
+    def _hash(cells):
+        h = cells * _HASH_PRIMES
+        return h[..., 0] ^ h[..., 1] ^ h[..., 2]
+
+    def add(self, points):
+        """Añade filas size, size+1, ... con las coordenadas `points` (K,3)."""
+        keys = self._hash(self._cells(points))
+        rows = np.arange(self.size, self.size + len(keys), dtype=np.int64)
+        self.size += len(keys)
+        if len(keys) == 1:
+            self._pending_keys.append(int(keys[0]))
+            self._pending_rows.append(int(rows[0]))
+            if len(self._pending_keys) >= self.PENDING_LIMIT:
+                self._flush()
+        elif len(keys):
+            self._flush()
+            self._merge(keys, rows)
+
+    def _merge(self, keys, rows):
+        order = np.argsort(keys, kind="stable")
+        keys, rows = keys[order], rows[order]
+        pos = np.searchsorted(self._keys, keys, side="right")
+        self._keys = np.insert(self._keys, pos, keys)
+        self._rows = np.insert(self._rows, pos, rows)
+
+    def _flush(self):
+        if self._pending_keys:
+            keys = np.array(self._pending_keys, dtype=np.int64)
+            rows = np.array(self._pending_rows, dtype=np.int64)
+            self._pending_keys, self._pending_rows = [], []
+            self._merge(keys, rows)
+
+    def pairs_within(self, coords, points, tol):
+        """
+        (consulta, fila): pares de puntos de consulta `points` (M,3) y filas
+        de `coords` (las coordenadas indexadas) a distancia <= tol.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        if len(points) > 1:
+            self._flush()
+        queries, rows = [], []
+        for start in range(0, len(points), _QUERY_BLOCK):
+            block = points[start:start + _QUERY_BLOCK]
+            keys = self._hash(self._cells(block)[:, None, :] + _NEIGHBORS[None]).reshape(-1)
+            lo = np.searchsorted(self._keys, keys, side="left")
+            count = np.searchsorted(self._keys, keys, side="right") - lo
+            total = int(count.sum())
+            if total:
+                local = np.arange(total) - np.repeat(np.cumsum(count) - count, count)
+                rows.append(self._rows[np.repeat(lo, count) + local])
+                queries.append(start + np.repeat(np.arange(len(keys)) // len(_NEIGHBORS), count))
+        if self._pending_rows:
+            # Búfer pequeño (solo con una consulta): se compara entero
+            rows.append(np.array(self._pending_rows, dtype=np.int64))
+            queries.append(np.zeros(len(self._pending_rows), dtype=np.int64))
+        if not rows:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        queries, rows = np.concatenate(queries), np.concatenate(rows)
+        d = np.asarray(coords)[rows] - points[queries]
+        close = np.einsum("ij,ij->i", d, d) <= tol * tol
+        return queries[close], rows[close]
+
+
+# --- SEGMENTOS ---
+# Máximo de entradas (segmento, celda) por segmento, en promedio, antes de agrandar la celda
+_MAX_CELLS_PER_SEGMENT = 8
+
+
+def segment_candidate_pairs(p0, p1, pad=0.0, cell=None):
+    """
+    Fase amplia: pares (i, j), i < j, de segmentos cuyas cajas (ampliadas
+    en `pad`) comparten alguna celda de una rejilla uniforme. Cada segmento
+    se registra en todas las celdas que toca su caja; por defecto la celda
+    es la extensión media de las cajas.
+    """
+    p0 = np.asarray(p0, dtype=np.float64)
+    p1 = np.asarray(p1, dtype=np.float64)
+    empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+    n = len(p0)
+    if n < 2:
+        return empty
+    lo = np.minimum(p0, p1) - pad
+    hi = np.maximum(p0, p1) + pad
+    origin = lo.min(axis=0)
+    span = float((hi.max(axis=0) - origin).max())
+    if cell is None:
+        cell = float((hi - lo).max(axis=1).mean())
+    cell = max(cell, span / (_MAX_CELLS_PER_AXIS - 2), 1e-12)
+
+    while True:
+        cmin = np.floor((lo - origin) / cell).astype(np.int64)
+        spans = np.floor((hi - origin) / cell).astype(np.int64) - cmin + 1
+        counts = spans.prod(axis=1)
+        if counts.sum() <= _MAX_CELLS_PER_SEGMENT * n:
+            break
+        cell *= 2.0
+
+    # Una entrada por (segmento, celda): se descompone el índice local en (ix, iy, iz)
+    seg = np.repeat(np.arange(n), counts)
+    local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    sy, sz = spans[seg, 1], spans[seg, 2]
+    cells = cmin[seg] + np.column_stack([local // (sy * sz), (local // sz) % sy, local % sz])
+    dims = cells.max(axis=0) + 1
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+
+    order = np.argsort(keys, kind="stable")
+    _, starts, group = np.unique(keys[order], return_index=True, return_counts=True)
+    multi = group > 1
+    a, b = _cross_pairs(starts[multi], group[multi], starts[multi], group[multi])
+    keep = a < b
+    i, j = seg[order[a[keep]]], seg[order[b[keep]]]
+    i, j = np.minimum(i, j), np.maximum(i, j)
+    # Un par puede compartir varias celdas
+    pair_keys = np.unique(i[i != j] * n + j[i != j])
+    return pair_keys // n, pair_keys % n
+
+
+def segment_closest_params(p0, p1, q0, q1):
+    """
+    Punto más cercano entre los segmentos p0-p1 y q0-q1 (por filas).
+    Devuelve (s, t, distancia) con P = p0 + s (p1 - p0), Q = q0 + t (q1 - q0).
+    Los segmentos de longitud nula deben filtrarse antes.
+    """
+    d1, d2, r = p1 - p0, q1 - q0, p0 - q0
+    a = np.einsum("ij,ij->i", d1, d1)
+    e = np.einsum("ij,ij->i", d2, d2)
+    b = np.einsum("ij,ij->i", d1, d2)
+    c = np.einsum("ij,ij->i", d1, r)
+    f = np.einsum("ij,ij->i", d2, r)
+    denom = a * e - b * b
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Paralelos: se toma s = 0 y se ajusta t
+        s = np.where(denom > 1e-12 * a * e, np.clip((b * f - c * e) / denom, 0.0, 1.0), 0.0)
+        t = (b * s + f) / e
+        s = np.where(t < 0.0, np.clip(-c / a, 0.0, 1.0), np.where(t > 1.0, np.clip((b - c) / a, 0.0, 1.0), s))
+    t = np.clip(t, 0.0, 1.0)
+    d = (p0 + d1 * s[:, None]) - (q0 + d2 * t[:, None])
+    return s, t, np.sqrt(np.einsum("ij,ij->i", d, d))
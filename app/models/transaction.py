@@ -0,0 +1,214 @@
+"""
+Transacciones de modelo para scripts que corren en un hilo de trabajo.
+
+El script recibe un ModelTransaction en lugar del DocumentModel: las
+inserciones y borrados se acumulan en lotes (sin tocar el modelo) y se
+aplican con la API masiva en el hilo dueño del modelo, en cada checkpoint
+y al terminar. Los IDs se reservan al momento (bajo el lock del modelo),
+así que el script puede usarlos enseguida para conectar frames.
+
+Los IDs de frames son provisionales: el commit aún puede rechazar el
+frame si ya existe (duplicado). Esos IDs nunca llegan a existir en el
+modelo y se listan en committed["rejected_element_ids"].
+
+Con merge_tolerance activo en el modelo, los nodos también se fusionan al
+aplicarse: un nodo coincidente con uno existente (o con otro del lote)
+toma el ID de ese nodo, y los frames y borrados posteriores de la
+transacción que usen el ID provisional se redirigen al definitivo. Las
+lecturas del modelo (y las llamadas fuera de la API de escritura) ya ven
+solo los IDs definitivos.
+
+Sin Qt: `dispatch(fn)` ejecuta fn en el hilo dueño y devuelve su resultado
+(en modo batch basta con `lambda fn: fn()`).
+"""
+import threading
+import time
+
+import numpy as np
+
+
+class ScriptCancelled(Exception):
+    """Se lanza dentro del script cuando el usuario lo detiene."""
+
+
+class ModelTransaction:
+    EMPTY_COUNTS = {"nodes": 0, "merged_nodes": 0, "elements": 0, "deleted_nodes": 0,
+                    "deleted_elements": 0, "rejected_elements": 0, "checkpoints": 0}
+    # Checkpoint automático si hay cambios pendientes desde hace más de esto
+    AUTO_CHECKPOINT_S = 2.0
+    # Cada cuántas operaciones se consulta el reloj (time.monotonic no es gratis)
+    _CLOCK_EVERY = 4096
+
+    @classmethod
+    def empty_summary(cls):
+        """Resumen de commit vacío: los conteos más la lista de IDs de frames rechazados."""
+        return dict(cls.EMPTY_COUNTS, rejected_element_ids=[])
+
+    def __init__(self, model, dispatch, cancel_event=None, on_commit=None):
+        self._model = model
+        self._dispatch = dispatch
+        self._cancel = cancel_event or threading.Event()
+        self._on_commit = on_commit
+        # Operaciones pendientes, en orden: [tipo, ids, datos]
+        self._ops = []
+        self._pending = 0
+        self._last_commit = time.monotonic()
+        self.committed = self.empty_summary()
+        # ID provisional -> ID definitivo de los nodos fusionados al aplicar
+        self._node_remap = {}
+        self._remap_arrays = None
+
+    # --- Estado / control ---
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def _check(self):
+        if self._cancel.is_set():
+            raise ScriptCancelled()
+        self._pending += 1
+        if self._pending % self._CLOCK_EVERY == 0 and \
+                time.monotonic() - self._last_commit > self.AUTO_CHECKPOINT_S:
+            self.checkpoint()
+
+    def _batch(self, kind):
+        if not self._ops or self._ops[-1][0] != kind:
+            self._ops.append([kind, [], []])
+        return self._ops[-1]
+
+    # --- API de escritura (misma firma que DocumentModel) ---
+    def add_node(self, x, y, z):
+        self._check()
+        node_id = int(self._model.reserve_node_ids(1)[0])
+        op = self._batch("nodes")
+        op[1].append(node_id)
+        op[2].append((x, y, z))
+        return node_id
+
+    def add_nodes(self, coords):
+        self._check()
+        coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+        ids = self._model.reserve_node_ids(len(coords))
+        op = self._batch("nodes")
+        op[1].extend(ids.tolist())
+        op[2].extend(coords.tolist())
+        return ids
+
+    def add_element(self, n_start_id, n_end_id):
+        """ID provisional del frame (None si es degenerado); ver el docstring del módulo."""
+        self._check()
+        if n_start_id == n_end_id:
+            return None
+        elem_id = int(self._model.reserve_element_ids(1)[0])
+        op = self._batch("elements")
+        op[1].append(elem_id)
+        op[2].append((n_start_id, n_end_id))
+        return elem_id
+
+    def add_elements(self, conn):
+        """IDs provisionales (0 = degenerado); los rechazados en el commit van a committed."""
+        self._check()
+        conn = np.asarray(conn, dtype=np.int64).reshape(-1, 2)
+        ids = self._model.reserve_element_ids(len(conn))
+        ids[conn[:, 0] == conn[:, 1]] = 0
+        op = self._batch("elements")
+        op[1].extend(ids.tolist())
+        op[2].extend(conn.tolist())
+        return ids
+
+    def delete_node(self, node_id):
+        self.delete_nodes([node_id])
+
+    def delete_nodes(self, node_ids):
+        self._check()
+        self._batch("delete_nodes")[1].extend(int(i) for i in node_ids)
+
+    def delete_element(self, element_id):
+        self.delete_elements([element_id])
+
+    def delete_elements(self, element_ids):
+        self._check()
+        self._batch("delete_elements")[1].extend(int(i) for i in element_ids)
+
+    # --- Commit ---
+    def checkpoint(self):
+        """Aplica los cambios pendientes en el hilo dueño del modelo (bloquea hasta terminar)."""
+        if self._cancel.is_set():
+            raise ScriptCancelled()
+        ops, self._ops = self._ops, []
+        self._last_commit = time.monotonic()
+        if ops:
+            self._dispatch(lambda: self._apply(ops))
+
+    def discard(self):
+        """Descarta lo pendiente (al cancelar). Los IDs reservados quedan sin usar."""
+        self._ops = []
+
+    def _apply(self, ops):
+        # Se ejecuta en el hilo dueño del modelo
+        model = self._model
+        for kind, ids, data in ops:
+            if kind == "nodes":
+                ids = np.asarray(ids, dtype=np.int64)
+                actual = model.add_nodes(np.array(data, dtype=np.float64), ids=ids, merge=True)
+                moved = actual != ids
+                if moved.any():
+                    self._node_remap.update(zip(ids[moved].tolist(), actual[moved].tolist()))
+                    self._remap_arrays = None
+                self.committed["nodes"] += len(ids) - int(moved.sum())
+                self.committed["merged_nodes"] += int(moved.sum())
+            elif kind == "elements":
+                ids = np.asarray(ids, dtype=np.int64)
+                conn = self._remap_nodes(np.array(data, dtype=np.int64).reshape(-1, 2))
+                valid = ids > 0
+                added = model.add_elements(conn[valid], ids=ids[valid])
+                rejected = ids[valid][added == 0]
+                self.committed["elements"] += int(valid.sum()) - len(rejected)
+                self.committed["rejected_elements"] += len(rejected)
+                self.committed["rejected_element_ids"].extend(rejected.tolist())
+            elif kind == "delete_nodes":
+                before = len(model.node_ids)
+                model.delete_nodes(self._remap_nodes(np.asarray(ids, dtype=np.int64)))
+                self.committed["deleted_nodes"] += before - len(model.node_ids)
+            elif kind == "delete_elements":
+                before = len(model.element_ids)
+                model.delete_elements(ids)
+                self.committed["deleted_elements"] += before - len(model.element_ids)
+        self.committed["checkpoints"] += 1
+        if self._on_commit is not None:
+            self._on_commit()
+
+    def _remap_nodes(self, node_ids):
+        """IDs de nodo con los provisionales fusionados sustituidos por su ID definitivo."""
+        if not self._node_remap:
+            return node_ids
+        if self._remap_arrays is None:
+            keys = np.fromiter(self._node_remap.keys(), dtype=np.int64, count=len(self._node_remap))
+            values = np.fromiter(self._node_remap.values(), dtype=np.int64, count=len(self._node_remap))
+            order = np.argsort(keys)
+            self._remap_arrays = keys[order], values[order]
+        keys, values = self._remap_arrays
+        pos = np.minimum(np.searchsorted(keys, node_ids), len(keys) - 1)
+        return np.where(keys[pos] == node_ids, values[pos], node_ids)
+
+    # --- Lectura y resto de la API: checkpoint + llamada en el hilo dueño ---
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        self.checkpoint()
+        value = self._dispatch(lambda: getattr(self._model, name))
+        if callable(value):
+            def call(*args, **kwargs):
+                self.checkpoint()
+                return _detach(self._dispatch(lambda: value(*args, **kwargs)))
+            return call
+        return _detach(value)
+
+
+def _detach(value):
+    # Los arrays del modelo son vistas de sus buffers: el script recibe copias
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    if isinstance(value, tuple):
+        return tuple(_detach(v) for v in value)
+    return value
@@ -0,0 +1,187 @@
+"""
+Instrumentación ligera de caminos calientes (sin dependencias de Qt).
+
+    from app.perf import perf
+
+    @perf.measure("viewport.pick")
+    def _get_clicked_item(...): ...
+
+    with perf.timed("controller.refresh"):
+        ...
+
+    perf.gauge("viewport.nodes", n)
+    perf.enabled = True
+    print(perf.report())
+    perf.dump("perf.json")
+
+Con `perf.enabled = False` (por defecto) cada punto instrumentado cuesta una
+comprobación de atributo. Los tiempos se guardan en buffers circulares para
+calcular percentiles sobre las últimas N muestras.
+"""
+import functools
+import json
+import os
+import time
+
+import numpy as np
+
+
+class _RingBuffer:
+    __slots__ = ("values", "index", "count", "total")
+
+    def __init__(self, capacity):
+        self.values = np.zeros(capacity, dtype=np.float64)
+        self.index = 0
+        self.count = 0
+        self.total = 0  # muestras históricas (no solo las del buffer)
+
+    def add(self, value):
+        self.values[self.index] = value
+        self.index = (self.index + 1) % len(self.values)
+        self.count = min(self.count + 1, len(self.values))
+        self.total += 1
+
+    def last(self):
+        if self.count == 0:
+            return None
+        return float(self.values[self.index - 1])
+
+    def window(self):
+        return self.values[:self.count] if self.count < len(self.values) else self.values
+
+    def percentiles(self, ps=(50, 95, 99)):
+        if self.count == 0:
+            return {p: None for p in ps}
+        res = np.percentile(self.window(), ps)
+        return {p: float(v) for p, v in zip(ps, res)}
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("monitor", "name", "t0")
+
+    def __init__(self, monitor, name):
+        self.monitor = monitor
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.monitor.record(self.name, time.perf_counter() - self.t0)
+        return False
+
+
+class PerfMonitor:
+    def __init__(self, capacity=512, enabled=False):
+        self.capacity = capacity
+        self.enabled = enabled
+        self.timings = {}   # nombre -> _RingBuffer (segundos)
+        self.counters = {}  # nombre -> int
+        self.gauges = {}    # nombre -> último valor
+
+    # --- Registro ---
+    def record(self, name, seconds):
+        if not self.enabled:
+            return
+        buf = self.timings.get(name)
+        if buf is None:
+            buf = self.timings[name] = _RingBuffer(self.capacity)
+        buf.add(seconds)
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def gauge(self, name, value):
+        if self.enabled:
+            self.gauges[name] = value
+
+    def timed(self, name):
+        """Context manager que cronometra el bloque (no-op si está deshabilitado)."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def measure(self, name):
+        """Decorador equivalente a envolver la función en `timed(name)`."""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                t0 = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - t0)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        self.timings.clear()
+        self.counters.clear()
+        self.gauges.clear()
+
+    # --- Consulta ---
+    def last(self, name):
+        buf = self.timings.get(name)
+        return buf.last() if buf else None
+
+    def percentiles(self, name, ps=(50, 95, 99)):
+        buf = self.timings.get(name)
+        return buf.percentiles(ps) if buf else {p: None for p in ps}
+
+    def stats(self):
+        """Resumen serializable: tiempos en ms con p50/p95/p99."""
+        timings = {}
+        for name, buf in sorted(self.timings.items()):
+            pct = buf.percentiles()
+            timings[name] = {
+                "samples": buf.total,
+                "last_ms": buf.last() * 1000.0,
+                "p50_ms": pct[50] * 1000.0,
+                "p95_ms": pct[95] * 1000.0,
+                "p99_ms": pct[99] * 1000.0,
+                "max_ms": float(buf.window().max()) * 1000.0,
+            }
+        return {"timings": timings, "counters": dict(sorted(self.counters.items())),
+                "gauges": dict(sorted(self.gauges.items()))}
+
+    def report(self):
+        """Tabla de texto apta para el terminal."""
+        st = self.stats()
+        lines = [f"{'timer':36s} {'n':>7s} {'last':>9s} {'p50':>9s} {'p95':>9s} {'p99':>9s} {'max':>9s}  (ms)"]
+        for name, t in st["timings"].items():
+            lines.append(f"{name:36s} {t['samples']:7d} {t['last_ms']:9.2f} {t['p50_ms']:9.2f} "
+                         f"{t['p95_ms']:9.2f} {t['p99_ms']:9.2f} {t['max_ms']:9.2f}")
+        for name, v in st["counters"].items():
+            lines.append(f"{name:36s} count={v}")
+        for name, v in st["gauges"].items():
+            lines.append(f"{name:36s} = {v}")
+        if len(lines) == 1:
+            lines.append("(no samples; enable with View -> Performance)")
+        return "\n".join(lines)
+
+    def dump(self, path):
+        """Guarda el resumen: JSON si la extensión es .json, texto en otro caso."""
+        with open(path, "w", encoding="utf-8") as f:
+            if os.path.splitext(path)[1].lower() == ".json":
+                json.dump(self.stats(), f, indent=2)
+            else:
+                f.write(self.report() + "\n")
+
+
+# Instancia global de la aplicación. APP_PERF=1 la activa desde el arranque.
+perf = PerfMonitor(enabled=os.environ.get("APP_PERF", "") not in ("", "0"))
@@ -1,76 +1,19 @@
 #
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QTreeWidget, QTreeWidgetItem, 
-                             QTextEdit, QLabel, QPushButton, QFrame, QSizePolicy, 
+                             QPlainTextEdit, QLabel, QPushButton, QFrame, QSizePolicy, 
                              QTabWidget, QHBoxLayout, QTableWidget, QTableWidgetItem, 
-                             QHeaderView, QAbstractItemView)
-from PyQt6.QtCore import Qt, pyqtSignal, QSize, QPoint, QRect
-from PyQt6.QtGui import QColor, QIcon, QPixmap, QPainter, QVector3D, QMatrix4x4, QTextCursor, QPen, QBrush
+                             QHeaderView, QAbstractItemView, QLineEdit, QFileDialog,
+                             QProgressBar, QToolButton, QGridLayout)
+from PyQt6.QtCore import Qt, pyqtSignal, QSize, QTimer, QItemSelection, QItemSelectionModel
+from PyQt6.QtGui import QColor, QIcon, QPixmap, QPainter, QFont
 import numpy as np
-import pyqtgraph.opengl as gl
-from pyqtgraph.opengl import GLViewWidget
-import math
-
-# --- SISTEMA DE TEXTO VECTORIAL ---
-VECTOR_FONT_DEFS = {
-    '0': [[0,0], [1,0], [1,2], [0,2], [0,0]],
-    '1': [[0.5,0], [0.5,2]],
-    '2': [[0,2], [1,2], [1,1], [0,1], [0,0], [1,0]],
-    '3': [[0,2], [1,2], [1,1], [0,1], [1,1], [1,0], [0,0]],
-    '4': [[1,0], [1,2], [1,1], [0,1], [0,2]],
-    '5': [[1,2], [0,2], [0,1], [1,1], [1,0], [0,0]],
-    '6': [[1,2], [0,2], [0,0], [1,0], [1,1], [0,1]],
-    '7': [[0,2], [1,2], [0.5,0]],
-    '8': [[0,1], [1,1], [1,2], [0,2], [0,0], [1,0], [1,1]],
-    '9': [[1,0], [1,2], [0,2], [0,1], [1,1]],
-    'X': [[0,0], [1,2], [0.5,1], [0,2], [1,0]], 
-    'Y': [[0,2], [0.5,1], [1,2], [0.5,1], [0.5,0]], 
-    'Z': [[0,2], [1,2], [0,0], [1,0]],
-    '-': [[0,1], [1,1]],
-    'F': [[0,0], [0,2], [1,2], [0,2], [0,1], [0.8,1]] 
-}
-
-def generate_vector_text(text, origin, scale=1.0, color=(0,0,0,1), width=1):
-    points = []
-    ox, oy, oz = origin
-    cursor_x = 0
-    text = str(text)
-
-    for char in text:
-        if char in VECTOR_FONT_DEFS:
-            stroke_points = VECTOR_FONT_DEFS[char]
-            for i in range(len(stroke_points) - 1):
-                lx1, ly1 = stroke_points[i]
-                p1 = [ox + (cursor_x + lx1) * scale, oy, oz + ly1 * scale]
-                lx2, ly2 = stroke_points[i+1]
-                p2 = [ox + (cursor_x + lx2) * scale, oy, oz + ly2 * scale]
-                points.append(p1)
-                points.append(p2)
-        cursor_x += 1.5 
-
-    if not points:
-        return None
-
-    pos = np.array(points, dtype=np.float32)
-    item = gl.GLLinePlotItem(pos=pos, color=color, width=width, antialias=True, mode='lines') 
-    return item
-
-# --- FUNCIONES MATEMÁTICAS ---
-
-def dist_sq_point_to_segment_2d(px, py, x1, y1, x2, y2):
-    """
-    Calcula la distancia al cuadrado desde un punto (px, py) 
-    a un segmento de línea 2D definido por (x1, y1) y (x2, y2).
-    """
-    l2 = (x1 - x2)**2 + (y1 - y2)**2
-    if l2 == 0: return (px - x1)**2 + (py - y1)**2
-    
-    t = ((px - x1) * (x2 - x1) + (py - y1) * (y2 - y1)) / l2
-    t = max(0, min(1, t))
-    
-    proj_x = x1 + t * (x2 - x1)
-    proj_y = y1 + t * (y2 - y1)
-    
-    return (px - proj_x)**2 + (py - proj_y)**2
+
+from app.perf import perf
+from app.memory import TABLE_CELL_BYTES
+from app.models.selection import IdMask
+
+# NOTA: el viewport 3D vive en app/views/viewport.py y se importa de forma
+# diferida (arrastra pyqtgraph.opengl + OpenGL, ~0.3 s de arranque).
 
 def create_color_icon(color: QColor, text: str = "") -> QIcon:
     pixmap = QPixmap(32, 32)
@@ -82,6 +25,31 @@ def create_color_icon(color: QColor, text: str = "") -> QIcon:
         painter.end()
     return QIcon(pixmap)
 
+def _ids_array(ids):
+    if isinstance(ids, np.ndarray):
+        return ids.astype(np.int64, copy=False).reshape(-1)
+    if isinstance(ids, IdMask):
+        return ids.selected_ids()
+    return np.fromiter(ids, dtype=np.int64)
+
+def select_table_rows(table, row_ids, ids):
+    """
+    Selecciona las filas cuyo ID está en `ids` (iterable o IdMask) con una sola
+    QItemSelection de tramos contiguos, en lugar de un selectRow por fila.
+    """
+    if isinstance(ids, IdMask) and len(ids.ids) == len(row_ids) and np.array_equal(ids.ids, row_ids):
+        mask = ids.mask
+    else:
+        mask = np.isin(row_ids, _ids_array(ids))
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], mask, [False])).view(np.int8)))
+    model = table.model()
+    last_col = table.columnCount() - 1
+    selection = QItemSelection()
+    for start, stop in zip(edges[::2].tolist(), edges[1::2].tolist()):
+        selection.select(model.index(start, 0), model.index(stop - 1, last_col))
+    flags = QItemSelectionModel.SelectionFlag.ClearAndSelect | QItemSelectionModel.SelectionFlag.Rows
+    table.selectionModel().select(selection, flags)
+
 # --- WIDGETS AUXILIARES ---
 
 class WorkTreeWidget(QWidget):
@@ -104,6 +72,12 @@ class WorkTreeWidget(QWidget):
     def _on_click(self, item, col):
         self.itemSelected.emit(item.text(0))
 
+def table_footprint(report, name, table, row_ids=None):
+    """Partida de memoria de un QTableWidget: un item por celda (estimado) + ids por fila."""
+    cells = table.rowCount() * table.columnCount()
+    report.add("table models", f"{name} ({cells} cells, est.)",
+               cells * TABLE_CELL_BYTES + (report.nbytes(row_ids) if row_ids is not None else 0))
+
 class NodeTableWidget(QWidget):
     selectionChanged = pyqtSignal(list) 
     def __init__(self):
@@ -121,9 +95,14 @@ class NodeTableWidget(QWidget):
         self.setLayout(layout)
         self.table.itemSelectionChanged.connect(self._on_selection_change)
         self._block_signal = False
+        self._row_ids = np.zeros(0, dtype=np.int64)
+    def memory_footprint(self, report):
+        table_footprint(report, "Nodes table", self.table, self._row_ids)
+    @perf.measure("table.nodes.update")
     def update_data(self, full_node_list):
         self._block_signal = True
         self.table.setRowCount(len(full_node_list))
+        self._row_ids = np.array([n[0] for n in full_node_list], dtype=np.int64)
         for row, node_data in enumerate(full_node_list):
             id_item = QTableWidgetItem(str(node_data[0]))
             id_item.setData(Qt.ItemDataRole.UserRole, node_data[0])
@@ -132,24 +111,15 @@ class NodeTableWidget(QWidget):
             self.table.setItem(row, 2, QTableWidgetItem(f"{node_data[2]:.2f}"))
             self.table.setItem(row, 3, QTableWidgetItem(f"{node_data[3]:.2f}"))
         self._block_signal = False
-    def select_rows_by_ids(self, ids_set):
+    @perf.measure("table.select_rows")
+    def select_rows_by_ids(self, ids):
         self._block_signal = True
-        self.table.clearSelection()
-        if ids_set:
-            for row in range(self.table.rowCount()):
-                item_id = self.table.item(row, 0).data(Qt.ItemDataRole.UserRole)
-                if item_id in ids_set:
-                    self.table.selectRow(row)
+        select_table_rows(self.table, self._row_ids, ids)
         self._block_signal = False
     def _on_selection_change(self):
         if self._block_signal: return
-        selected_ids = []
-        rows = set(index.row() for index in self.table.selectedIndexes())
-        for row in rows:
-            item = self.table.item(row, 0)
-            if item:
-                selected_ids.append(item.data(Qt.ItemDataRole.UserRole))
-        self.selectionChanged.emit(selected_ids)
+        rows = [index.row() for index in self.table.selectionModel().selectedRows()]
+        self.selectionChanged.emit(self._row_ids[rows].tolist())
 
 class ElementTableWidget(QWidget):
     selectionChanged = pyqtSignal(list)
@@ -168,9 +138,14 @@ class ElementTableWidget(QWidget):
         self.setLayout(layout)
         self.table.itemSelectionChanged.connect(self._on_selection_change)
         self._block_signal = False
+        self._row_ids = np.zeros(0, dtype=np.int64)
+    def memory_footprint(self, report):
+        table_footprint(report, "Frames table", self.table, self._row_ids)
+    @perf.measure("table.elements.update")
     def update_data(self, elements_list):
         self._block_signal = True
         self.table.setRowCount(len(elements_list))
+        self._row_ids = np.array([e[0] for e in elements_list], dtype=np.int64)
         for row, elem in enumerate(elements_list):
             id_item = QTableWidgetItem(str(elem[0]))
             id_item.setData(Qt.ItemDataRole.UserRole, elem[0])
@@ -178,24 +153,15 @@ class ElementTableWidget(QWidget):
             self.table.setItem(row, 1, QTableWidgetItem(str(elem[1])))
             self.table.setItem(row, 2, QTableWidgetItem(str(elem[2])))
         self._block_signal = False
-    def select_rows_by_ids(self, ids_set):
+    @perf.measure("table.select_rows")
+    def select_rows_by_ids(self, ids):
         self._block_signal = True
-        self.table.clearSelection()
-        if ids_set:
-            for row in range(self.table.rowCount()):
-                item_id = self.table.item(row, 0).data(Qt.ItemDataRole.UserRole)
-                if item_id in ids_set:
-                    self.table.selectRow(row)
+        select_table_rows(self.table, self._row_ids, ids)
         self._block_signal = False
     def _on_selection_change(self):
         if self._block_signal: return
-        selected_ids = []
-        rows = set(index.row() for index in self.table.selectedIndexes())
-        for row in rows:
-            item = self.table.item(row, 0)
-            if item:
-                selected_ids.append(item.data(Qt.ItemDataRole.UserRole))
-        self.selectionChanged.emit(selected_ids)
+        rows = [index.row() for index in self.table.selectionModel().selectedRows()]
+        self.selectionChanged.emit(self._row_ids[rows].tolist())
 
 class MaterialTableWidget(QWidget):
     def __init__(self):
@@ -210,6 +176,8 @@ class MaterialTableWidget(QWidget):
         layout.addWidget(QLabel("Materials Definitions"))
         layout.addWidget(self.table)
         self.setLayout(layout)
+    def memory_footprint(self, report):
+        table_footprint(report, "Materials table", self.table)
     def update_data(self, materials_list):
         self.table.setRowCount(len(materials_list))
         for row, mat in enumerate(materials_list):
@@ -219,33 +187,269 @@ class MaterialTableWidget(QWidget):
             self.table.setItem(row, 3, QTableWidgetItem(f"{mat[3]:.2f}"))
             self.table.setItem(row, 4, QTableWidgetItem(f"{mat[4]:.2f}"))
 
-class TerminalWidget(QWidget):
+class SectionTableWidget(QWidget):
+    HEADERS = ["ID", "Name", "Shape", "A", "Iy", "Iz", "J"]
+
     def __init__(self):
         super().__init__()
         layout = QVBoxLayout()
         layout.setContentsMargins(0, 0, 0, 0)
-        self.text_area = QTextEdit()
+        self.table = QTableWidget()
+        self.table.setColumnCount(len(self.HEADERS))
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        layout.addWidget(QLabel("Section Definitions"))
+        layout.addWidget(self.table)
+        self.setLayout(layout)
+
+    def memory_footprint(self, report):
+        table_footprint(report, "Sections table", self.table)
+
+    def update_data(self, sections_list):
+        self.table.setRowCount(len(sections_list))
+        for row, (sid, name, shape, *props) in enumerate(sections_list):
+            self.table.setItem(row, 0, QTableWidgetItem(str(sid)))
+            self.table.setItem(row, 1, QTableWidgetItem(name))
+            self.table.setItem(row, 2, QTableWidgetItem(shape))
+            for col, value in enumerate(props, start=3):
+                self.table.setItem(row, col, QTableWidgetItem(f"{value:.4g}"))
+
+def summarize_ids(ids, limit=8):
+    """'1, 2, 3, ... (+997 more)' para no volcar miles de IDs en el terminal."""
+    ids = np.sort(_ids_array(ids))
+    head = ", ".join(str(i) for i in ids[:limit].tolist())
+    if len(ids) > limit:
+        head += f", ... (+{len(ids) - limit} more)"
+    return head
+
+class TerminalWidget(QWidget):
+    """
+    Sink de log con buffer: los mensajes se encolan y se vuelcan en bloque
+    con un timer (un solo appendPlainText por lote). El widget conserva como
+    mucho `max_lines` líneas; el log completo puede ir además a un archivo.
+    """
+    FLUSH_INTERVAL_MS = 50
+
+    def __init__(self, max_lines=5000):
+        super().__init__()
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.text_area = QPlainTextEdit()
         self.text_area.setReadOnly(True)
+        self.text_area.setUndoRedoEnabled(False)
+        self.text_area.setMaximumBlockCount(max_lines)
         self.text_area.setStyleSheet("background-color: #FFFFFF; color: #000000; font-family: Consolas; border: 1px solid #CCC;")
-        self.text_area.setText("System initialized.")
+        self.text_area.setPlainText("System initialized.")
         layout.addWidget(QLabel("Terminal Output"))
         layout.addWidget(self.text_area)
         self.setLayout(layout)
+
+        self.max_lines = max_lines
+        self._pending = []
+        self._log_file = None
+        self.log_path = None
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self.flush)
+
     def print_message(self, message: str):
-        self.text_area.append(message)
-        cursor = self.text_area.textCursor()
-        cursor.movePosition(QTextCursor.MoveOperation.End)
-        self.text_area.setTextCursor(cursor)
+        self._pending.append(message)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def print_bulk(self, action: str, kind: str, ids):
+        """Una línea resumen para operaciones masivas: '>> Deleted 10000 frames: 1, 2, ...'"""
+        ids = _ids_array(ids)
+        if not len(ids):
+            return
+        noun = kind if len(ids) == 1 else kind + "s"
+        self.print_message(f">> {action} {len(ids)} {noun}: {summarize_ids(ids)}")
+
+    @perf.measure("terminal.flush")
+    def flush(self):
+        if not self._pending:
+            return
+        lines, self._pending = self._pending, []
+        if self._log_file is not None:
+            self._log_file.write("\n".join(lines) + "\n")
+            self._log_file.flush()
+        # Lo que no cabe en el widget se descartaría igualmente al recortar
+        if len(lines) > self.max_lines:
+            dropped = len(lines) - self.max_lines + 1
+            lines = [f"... {dropped} lines omitted ..."] + lines[dropped:]
+        self.text_area.appendPlainText("\n".join(lines))
+        bar = self.text_area.verticalScrollBar()
+        bar.setValue(bar.maximum())
+
+    # --- Log a archivo ---
+    def set_log_file(self, path):
+        self.close_log_file()
+        self._log_file = open(path, "a", encoding="utf-8", buffering=1 << 16)
+        self.log_path = path
+
+    def close_log_file(self):
+        self.flush()
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+            self.log_path = None
 
 class ScriptEditorWidget(QWidget):
+    """
+    Editor de scripts + consola de una línea. No ejecuta nada: emite
+    runRequested / stopRequested y el controlador lanza el ScriptRunner.
+    """
+    runRequested = pyqtSignal(str, str)      # (código, nombre de archivo)
+    consoleRequested = pyqtSignal(str)
+    stopRequested = pyqtSignal()
+
+    EXAMPLE = (
+        "# 'model' acumula los cambios y se aplican al terminar (o con checkpoint())\n"
+        "# Disponible: model, params, np, perf, print, checkpoint\n"
+        "n = 10\n"
+        "ids = model.add_nodes([(i * 5.0, 0.0, 0.0) for i in range(n + 1)])\n"
+        "model.add_elements(np.column_stack([ids[:-1], ids[1:]]))\n"
+        "print(f'{n} frames')\n"
+    )
+
     def __init__(self):
         super().__init__()
         layout = QVBoxLayout()
         layout.setContentsMargins(0, 0, 0, 0)
+        self.file_path = None
+
+        # Barra de acciones
+        bar = QHBoxLayout()
+        self.run_button = QPushButton("Run")
+        self.run_button.setShortcut("Ctrl+Return")
+        self.run_button.setToolTip("Run script (Ctrl+Enter)")
+        self.run_button.clicked.connect(self._emit_run)
+        self.stop_button = QPushButton("Stop")
+        self.stop_button.setEnabled(False)
+        self.stop_button.clicked.connect(self.stopRequested.emit)
+        self.open_button = QPushButton("Open...")
+        self.open_button.clicked.connect(self.open_file)
+        self.save_button = QPushButton("Save...")
+        self.save_button.clicked.connect(self.save_file)
+        for b in (self.run_button, self.stop_button, self.open_button, self.save_button):
+            bar.addWidget(b)
+        bar.addStretch()
+        layout.addLayout(bar)
+
+        mono = QFont("Consolas")
+        mono.setStyleHint(QFont.StyleHint.Monospace)
+
         tabs = QTabWidget()
-        tabs.addTab(QLabel("Script Editor Placeholder"), "Editor")
+        self.editor = QPlainTextEdit()
+        self.editor.setFont(mono)
+        self.editor.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.editor.setTabStopDistance(4 * self.editor.fontMetrics().horizontalAdvance(" "))
+        self.editor.setPlainText(self.EXAMPLE)
+        tabs.addTab(self.editor, "Editor")
         layout.addWidget(tabs)
+
+        # Consola: una línea, variables persistentes entre ejecuciones
+        self.console = QLineEdit()
+        self.console.setFont(mono)
+        self.console.setPlaceholderText(">>> python")
+        self.console.returnPressed.connect(self._emit_console)
+        layout.addWidget(self.console)
+        self.setLayout(layout)
+
+    def _emit_run(self):
+        if self.run_button.isEnabled():
+            self.runRequested.emit(self.editor.toPlainText(), self.file_path or "<editor>")
+
+    def _emit_console(self):
+        line = self.console.text().strip()
+        if line and self.run_button.isEnabled():
+            self.console.clear()
+            self.consoleRequested.emit(line)
+
+    def set_running(self, running: bool):
+        self.run_button.setEnabled(not running)
+        self.stop_button.setEnabled(running)
+        self.console.setEnabled(not running)
+
+    def open_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Open Script", "", "Python (*.py);;All Files (*)")
+        if path:
+            with open(path, "r", encoding="utf-8") as f:
+                self.editor.setPlainText(f.read())
+            self.file_path = path
+
+    def save_file(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Script", self.file_path or "script.py", "Python (*.py)")
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self.editor.toPlainText())
+            self.file_path = path
+
+class TaskStatusWidget(QWidget):
+    """
+    Indicador de tareas en segundo plano para la barra de estado: nombre,
+    barra de progreso y botón de cancelar de la tarea más reciente.
+    """
+    cancelRequested = pyqtSignal(object)   # handle de la tarea
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QHBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.label = QLabel()
+        self.progress = QProgressBar()
+        self.progress.setFixedWidth(160)
+        self.progress.setMaximumHeight(14)
+        self.progress.setTextVisible(False)
+        self.cancel_button = QToolButton()
+        self.cancel_button.setText("✕")
+        self.cancel_button.setToolTip("Cancel task")
+        self.cancel_button.setAutoRaise(True)
+        self.cancel_button.clicked.connect(self._emit_cancel)
+        layout.addWidget(self.label)
+        layout.addWidget(self.progress)
+        layout.addWidget(self.cancel_button)
         self.setLayout(layout)
+        self._tasks = []   # handles activos, el último es el que se muestra
+        self.setVisible(False)
+
+    def task_started(self, handle):
+        self._tasks.append(handle)
+        self._refresh()
+
+    def task_progress(self, handle):
+        if self._tasks and handle is self._tasks[-1]:
+            self._refresh()
+
+    def task_ended(self, handle):
+        self._tasks = [h for h in self._tasks if h is not handle]
+        self._refresh()
+
+    def _refresh(self):
+        if not self._tasks:
+            self.setVisible(False)
+            return
+        handle = self._tasks[-1]
+        text = handle.name + (f": {handle.message}" if handle.message else "")
+        if len(self._tasks) > 1:
+            text += f"  (+{len(self._tasks) - 1})"
+        if handle.cancel_requested:
+            text += " (cancelling...)"
+        self.label.setText(text)
+        if handle.fraction < 0:
+            self.progress.setRange(0, 0)  # indeterminado
+        else:
+            self.progress.setRange(0, 1000)
+            self.progress.setValue(int(handle.fraction * 1000))
+        self.cancel_button.setEnabled(not handle.cancel_requested)
+        self.setVisible(True)
+
+    def _emit_cancel(self):
+        if self._tasks:
+            self.cancelRequested.emit(self._tasks[-1])
+            self._refresh()
 
 class CoordStatusWidget(QFrame):
     def __init__(self, parent=None):
@@ -268,453 +472,55 @@ class CoordStatusWidget(QFrame):
             self.label.setStyleSheet("color: #00FF00; font-family: Consolas; font-weight: bold; font-size: 11pt;")
         self.label.setText(txt)
 
-# --- VIEWPORT 3D (Corazón Gráfico) ---
-
-class Viewport3DWidget(GLViewWidget):
-    mouseMovedSignal = pyqtSignal(float, float, float, bool)
-    nodeSelectionChanged = pyqtSignal(set)
-    frameSelectionChanged = pyqtSignal(set)
-    createFrameSignal = pyqtSignal(int, int) 
+class PerfOverlayWidget(QFrame):
+    """Overlay View -> Performance: tiempos de frame/picking y tamaños de buffers."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setStyleSheet("QFrame { background-color: rgba(0, 0, 0, 180); border-radius: 6px; } QLabel { color: #FFD54F; font-family: Consolas; font-size: 9pt; }")
+        layout = QVBoxLayout()
+        layout.setContentsMargins(10, 5, 10, 5)
+        self.label = QLabel()
+        layout.addWidget(self.label)
+        self.setLayout(layout)
+        self.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
+        self.timer = QTimer(self)
+        self.timer.setInterval(500)
+        self.timer.timeout.connect(self.refresh)
+        self.hide()
 
-    def __init__(self):
-        super().__init__()
-        self.setCameraPosition(distance=150, elevation=30, azimuth=45)
-        self.setBackgroundColor('w')
-        self.setMouseTracking(True)
-
-        self.full_nodes_data = [] 
-        self.full_elements_data = []
-
-        self.selected_node_ids = set()
-        self.selected_frame_ids = set()
-        
-        # FLAGS
-        self.node_ids_visible = False
-        self.frame_ids_visible = False
-        self.axes_visible = True
-        self.add_frame_mode = False 
-        self.temp_first_node_id = None 
-        
-        # --- Variables de Box Selection ---
-        self.box_selection_mode = False 
-        self.is_dragging_box = False     
-        self.box_start = QPoint()        
-        self.box_end = QPoint()          
-        
-        # Almacenes de Items Gráficos
-        self.node_text_items = [] 
-        self.frame_text_items = [] 
-        self.axes_items = []
-
-        # Grid
-        self.grid = gl.GLGridItem()
-        self.grid.setSize(2000, 2000, 0)
-        self.grid.setSpacing(50, 50, 0)
-        self.grid.setColor((50, 50, 50, 40))
-        self.grid.setGLOptions('translucent')
-        self.addItem(self.grid)
-        self.axes_items.append(self.grid)
-
-        # Dibujar Ejes X,Y,Z
-        self._draw_vector_axes()
-
-        # Item para Frames (Líneas)
-        self.frames_item = gl.GLLinePlotItem(pos=np.zeros((0,3)), color=(0.4, 0.4, 0.4, 1), width=2, mode='lines', antialias=True)
-        self.addItem(self.frames_item)
-
-        # Item para Frames Seleccionados
-        self.sel_frames_item = gl.GLLinePlotItem(pos=np.zeros((0,3)), color=(1, 0, 0, 1), width=4, mode='lines', antialias=True)
-        self.addItem(self.sel_frames_item)
-        self.sel_frames_item.setVisible(False)
-
-        # Item para Nodos (Puntos)
-        self.scatter = gl.GLScatterPlotItem(pos=np.zeros((0, 3)), size=10, color=(0, 0, 1, 1), pxMode=True)
-        self.scatter.setGLOptions('translucent')
-        self.addItem(self.scatter)
-
-        # Debug Ray
-        self.debug_ray_line = gl.GLLinePlotItem(pos=np.zeros((2,3)), color=(1, 0, 1, 1), width=3, antialias=True)
-        self.addItem(self.debug_ray_line)
-        self.debug_ray_line.setVisible(False)
-
-    def set_add_frame_mode(self, active: bool):
-        self.add_frame_mode = active
-        self.temp_first_node_id = None
-        self._refresh_scatter_colors()
-
-    def set_box_selection_mode(self, active: bool):
-        self.box_selection_mode = active
+    def set_active(self, active: bool):
+        self.setVisible(active)
         if active:
-            self.add_frame_mode = False
-            self.setMouseTracking(True)
-
-    def _draw_vector_axes(self):
-        L, W = 50, 1 
-        xaxis = gl.GLLinePlotItem(pos=np.array([[0,0,0], [L,0,0]]), color=(1,0,0,1), width=W, antialias=True)
-        yaxis = gl.GLLinePlotItem(pos=np.array([[0,0,0], [0,L,0]]), color=(0,0.6,0,1), width=W, antialias=True)
-        zaxis = gl.GLLinePlotItem(pos=np.array([[0,0,0], [0,0,L]]), color=(0,0,1,1), width=W, antialias=True)
-        
-        self.addItem(xaxis); self.axes_items.append(xaxis)
-        self.addItem(yaxis); self.axes_items.append(yaxis)
-        self.addItem(zaxis); self.axes_items.append(zaxis)
-        
-        txt_x = generate_vector_text("X", (L+5, 0, 0), scale=2.5, color=(1,0,0,1))
-        if txt_x: self.addItem(txt_x); self.axes_items.append(txt_x)
-        txt_y = generate_vector_text("Y", (0, L+5, 0), scale=2.5, color=(0,0.6,0,1))
-        if txt_y: self.addItem(txt_y); self.axes_items.append(txt_y)
-        txt_z = generate_vector_text("Z", (0, 0, L+5), scale=2.5, color=(0,0,1,1))
-        if txt_z: self.addItem(txt_z); self.axes_items.append(txt_z)
-
-    def auto_adjust_grid(self, bounds):
-        if not bounds: return
-        min_x, max_x, min_y, max_y, _, _ = bounds
-        
-        width = max_x - min_x
-        height = max_y - min_y
-        max_dim = max(width, height) 
-        
-        # CASO 1: Modelo vacío, puntual o muy pequeño (< 10 unidades)
-        if max_dim < 10.0:
-            grid_size = 100.0
-            spacing = 10.0
-        # CASO 2: Modelo normal o grande
-        else:
-            grid_size = max_dim * 3.0
-            exponent = math.floor(math.log10(max_dim))
-            spacing = 10 ** (exponent - 1)
-            if max_dim / spacing > 20: spacing *= 5
-            if grid_size < 100: grid_size = 100
-
-        self.grid.setSize(grid_size, grid_size, 0)
-        self.grid.setSpacing(spacing, spacing, 0)
-        
-        center_x = (min_x + max_x) / 2
-        center_y = (min_y + max_y) / 2
-        self.grid.resetTransform()
-        self.grid.translate(center_x, center_y, 0)
-
-    # --- TOGGLES DE VISIBILIDAD ---
-    def toggle_axes(self, show: bool):
-        self.axes_visible = show
-        for item in self.axes_items: item.setVisible(show)
-
-    def toggle_node_ids(self, show: bool):
-        self.node_ids_visible = show
-        self._refresh_node_labels()
-
-    def toggle_frame_ids(self, show: bool):
-        self.frame_ids_visible = show
-        self._refresh_frame_labels()
-    
-    def _refresh_node_labels(self):
-        for item in self.node_text_items:
-            try: self.removeItem(item)
-            except: pass
-        self.node_text_items.clear()
-        if not self.node_ids_visible: return
-        for node in self.full_nodes_data:
-            nid, x, y, z = node
-            txt_item = generate_vector_text(str(nid), (x+1, y, z+1), scale=0.5, color=(0,0,0,1), width=1)
-            if txt_item: self.addItem(txt_item); self.node_text_items.append(txt_item)
-
-    def _refresh_frame_labels(self):
-        for item in self.frame_text_items:
-            try: self.removeItem(item)
-            except: pass
-        self.frame_text_items.clear()
-        if not self.frame_ids_visible: return
-        node_map = {n[0]: (n[1], n[2], n[3]) for n in self.full_nodes_data}
-        for elem in self.full_elements_data:
-            eid, n1, n2 = elem
-            if n1 in node_map and n2 in node_map:
-                c1 = node_map[n1]
-                c2 = node_map[n2]
-                mid_x = (c1[0] + c2[0]) / 2.0
-                mid_y = (c1[1] + c2[1]) / 2.0
-                mid_z = (c1[2] + c2[2]) / 2.0
-                txt_item = generate_vector_text(f"F{eid}", (mid_x, mid_y, mid_z + 1), scale=0.5, color=(0,0,0.5,1), width=1)
-                if txt_item: self.addItem(txt_item); self.frame_text_items.append(txt_item)
-
-    def update_scene_data(self, nodes_data, elements_data):
-        self.full_nodes_data = nodes_data
-        self.full_elements_data = elements_data
-        
-        current_ids = set(n[0] for n in nodes_data)
-        self.selected_node_ids = self.selected_node_ids.intersection(current_ids)
-        current_f_ids = set(e[0] for e in elements_data)
-        self.selected_frame_ids = self.selected_frame_ids.intersection(current_f_ids)
-        
-        self._refresh_scatter_colors()
-        self._refresh_node_labels()
-        self._refresh_frame_labels()
-        
-        lines_pts = []
-        node_map = {n[0]: (n[1], n[2], n[3]) for n in nodes_data}
-        
-        norm_lines, sel_lines = [], []
-        
-        for elem in elements_data:
-            nid1, nid2 = elem[1], elem[2]
-            if nid1 in node_map and nid2 in node_map:
-                pts = [list(node_map[nid1]), list(node_map[nid2])]
-                if elem[0] in self.selected_frame_ids: sel_lines.extend(pts)
-                else: norm_lines.extend(pts)
-        
-        self.frames_item.setData(pos=np.array(norm_lines, dtype=np.float32) if norm_lines else np.zeros((0,3)))
-        
-        if sel_lines:
-            self.sel_frames_item.setData(pos=np.array(sel_lines, dtype=np.float32))
-            self.sel_frames_item.setVisible(True)
-        else:
-            self.sel_frames_item.setVisible(False)
-
-    def set_selection(self, node_ids=None, frame_ids=None):
-        if node_ids is not None: self.selected_node_ids = set(node_ids)
-        if frame_ids is not None: self.selected_frame_ids = set(frame_ids)
-        self.update_scene_data(self.full_nodes_data, self.full_elements_data) # Force refresh visuals
-
-    def _refresh_scatter_colors(self):
-        if not self.full_nodes_data:
-            self.scatter.setData(pos=np.zeros((0, 3)), color=(0,0,0,0))
-            return
-        coords = np.array([n[1:] for n in self.full_nodes_data], dtype=np.float32)
-        colors = np.array([[0, 0, 1, 1] for _ in range(len(coords))], dtype=np.float32)
-        
-        for i, node in enumerate(self.full_nodes_data):
-            nid = node[0]
-            if nid in self.selected_node_ids:
-                colors[i] = [1, 0, 0, 1] 
-            elif nid == self.temp_first_node_id:
-                colors[i] = [0, 1, 0, 1] 
-        self.scatter.setData(pos=coords, size=10, color=colors, pxMode=True)
-        self.update()
-
-    # --- DIBUJADO DE CAJA 2D ---
-    def paintEvent(self, event):
-        super().paintEvent(event)
-        if self.is_dragging_box:
-            painter = QPainter(self)
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-            rect = QRect(self.box_start, self.box_end).normalized()
-            fill_color = QColor(0, 120, 215, 50)  
-            border_color = QColor(0, 120, 215, 255) 
-            painter.setPen(QPen(border_color, 1))
-            painter.setBrush(QBrush(fill_color))
-            painter.drawRect(rect)
-            painter.end()
-
-    # --- EVENTOS DE MOUSE ---
-
-    def mousePressEvent(self, ev):
-        # 1. Box Selection Start
-        if self.box_selection_mode and ev.button() == Qt.MouseButton.LeftButton:
-            self.is_dragging_box = True
-            self.box_start = ev.pos()
-            self.box_end = ev.pos()
-            ev.accept()
-            return
-
-        super().mousePressEvent(ev)
-        
-        # 2. Clic Normal (Si no es movimiento de cámara)
-        if ev.button() == Qt.MouseButton.LeftButton:
-            self._handle_single_click(ev)
-
-    def mouseMoveEvent(self, ev):
-        # 1. Box Dragging
-        if self.is_dragging_box:
-            self.box_end = ev.pos()
-            self.update() 
-            ev.accept()
-            return
-
-        super().mouseMoveEvent(ev)
-        self._handle_mouse_hover(ev)
-
-    def mouseReleaseEvent(self, ev):
-        # 1. Box Selection End
-        if self.is_dragging_box and ev.button() == Qt.MouseButton.LeftButton:
-            self.is_dragging_box = False
-            self.box_end = ev.pos()
-            self.update() 
-            self._perform_box_selection(ev.modifiers())
-            ev.accept()
-            return
-
-        super().mouseReleaseEvent(ev)
-
-    # --- LÓGICA DE SELECCIÓN (CLICK & BOX) ---
-
-    def _handle_single_click(self, ev):
-        item_type, item_id = self._get_clicked_item(ev.position().x(), ev.position().y())
-        
-        if self.add_frame_mode:
-            if item_type == 'node':
-                if self.temp_first_node_id is None:
-                    self.temp_first_node_id = item_id
-                else:
-                    if item_id != self.temp_first_node_id:
-                        self.createFrameSignal.emit(self.temp_first_node_id, item_id)
-                    self.temp_first_node_id = None
-                self._refresh_scatter_colors()
-            else:
-                self.temp_first_node_id = None
-                self._refresh_scatter_colors()
+            self.refresh()
+            self.timer.start()
         else:
-            # Selección Normal
-            modifiers = ev.modifiers()
-            is_ctrl = modifiers & Qt.KeyboardModifier.ControlModifier
-            
-            if item_type:
-                if item_type == 'node':
-                    if is_ctrl:
-                        if item_id in self.selected_node_ids: self.selected_node_ids.remove(item_id)
-                        else: self.selected_node_ids.add(item_id)
-                    else:
-                        self.selected_node_ids = {item_id}
-                        self.selected_frame_ids.clear()
-                elif item_type == 'frame':
-                    if is_ctrl:
-                        if item_id in self.selected_frame_ids: self.selected_frame_ids.remove(item_id)
-                        else: self.selected_frame_ids.add(item_id)
-                    else:
-                        self.selected_frame_ids = {item_id}
-                        self.selected_node_ids.clear()
-            else:
-                if not is_ctrl:
-                    self.selected_node_ids.clear()
-                    self.selected_frame_ids.clear()
-            
-            self.update_scene_data(self.full_nodes_data, self.full_elements_data)
-            self.nodeSelectionChanged.emit(self.selected_node_ids)
-            self.frameSelectionChanged.emit(self.selected_frame_ids)
-
-    def _perform_box_selection(self, modifiers):
-        rect = QRect(self.box_start, self.box_end).normalized()
-        if rect.width() < 5 and rect.height() < 5: return
-
-        # Preparar Matrices
-        w, h = self.width(), self.height()
-        m_view = self.viewMatrix()
-        m_proj = None
-        try: m_proj = self.projectionMatrix()
-        except: pass
-        if m_proj is None:
-             try: r=(0,0,w,h); m_proj = self.projectionMatrix(region=r, viewport=r)
-             except: pass
-        if m_proj is None:
-             m_proj = QMatrix4x4(); m_proj.perspective(60.0, w/h, 0.1, 5000.0)
-        
-        mvp = m_proj * m_view
-        
-        def to_screen(x, y, z):
-            vec = mvp.map(QVector3D(float(x), float(y), float(z)))
-            sx = (vec.x() + 1.0) * w / 2.0
-            sy = (1.0 - vec.y()) * h / 2.0
-            return QPoint(int(sx), int(sy)), vec.z()
-
-        new_nodes = set()
-        new_frames = set()
-        node_screen_map = {}
-
-        # 1. Nodos en caja
-        for n in self.full_nodes_data:
-            nid, nx, ny, nz = n
-            pt, depth = to_screen(nx, ny, nz)
-            if depth < 1.0: # Visible
-                node_screen_map[nid] = pt
-                if rect.contains(pt): new_nodes.add(nid)
-        
-        # 2. Frames en caja (si algún extremo está dentro)
-        for e in self.full_elements_data:
-            eid, n1, n2 = e
-            if n1 in node_screen_map and n2 in node_screen_map:
-                p1 = node_screen_map[n1]
-                p2 = node_screen_map[n2]
-                if rect.contains(p1) or rect.contains(p2):
-                    new_frames.add(eid)
-        
-        is_ctrl = modifiers & Qt.KeyboardModifier.ControlModifier
-        if is_ctrl:
-            self.selected_node_ids.update(new_nodes)
-            self.selected_frame_ids.update(new_frames)
-        else:
-            self.selected_node_ids = new_nodes
-            self.selected_frame_ids = new_frames
-            
-        self.update_scene_data(self.full_nodes_data, self.full_elements_data)
-        self.nodeSelectionChanged.emit(self.selected_node_ids)
-        self.frameSelectionChanged.emit(self.selected_frame_ids)
-
-    def _get_clicked_item(self, x, y, node_thresh=15.0, frame_pixel_thresh=10.0):
-        w, h = self.width(), self.height()
-        m_view = self.viewMatrix()
-        m_proj = None
-        try: m_proj = self.projectionMatrix()
-        except: pass
-        if m_proj is None:
-             try: r=(0,0,w,h); m_proj = self.projectionMatrix(region=r, viewport=r)
-             except: pass
-        if m_proj is None:
-             m_proj = QMatrix4x4(); m_proj.perspective(60.0, w/h, 0.1, 5000.0)
-        
-        mvp = m_proj * m_view
-        
-        def project(bx, by, bz):
-            v = mvp.map(QVector3D(float(bx), float(by), float(bz)))
-            return (v.x()+1.0)*w/2.0, (1.0-v.y())*h/2.0, v.z()
-
-        # Debug Visual
-        # (Opcional: podrías dibujar aquí la línea de rayo, pero en modo screen-space es menos útil)
-        print(f"\n--- CLICK SCREEN ({x}, {y}) ---")
-
-        # Nodos (Prioridad)
-        closest_n, min_n = None, float('inf')
-        sq_n_th = node_thresh**2
-        s_map = {}
-        
-        for n in self.full_nodes_data:
-            nid, nx, ny, nz = n
-            sx, sy, sz = project(nx, ny, nz)
-            if sz < 1.0: s_map[nid] = (sx, sy)
-            d2 = (x-sx)**2 + (y-sy)**2
-            if d2 < sq_n_th and d2 < min_n:
-                min_n = d2; closest_n = nid
-        
-        if closest_n: 
-            print(f">> Node {closest_n} hit"); return 'node', closest_n
-
-        # Frames (2D)
-        closest_f, min_f = None, float('inf')
-        sq_f_th = frame_pixel_thresh**2
-        
-        for e in self.full_elements_data:
-            eid, n1, n2 = e
-            if n1 in s_map and n2 in s_map:
-                s1, s2 = s_map[n1], s_map[n2]
-                d2 = dist_sq_point_to_segment_2d(x, y, s1[0], s1[1], s2[0], s2[1])
-                if d2 < sq_f_th and d2 < min_f:
-                    min_f = d2; closest_f = eid
-        
-        if closest_f:
-            print(f">> Frame {closest_f} hit"); return 'frame', closest_f
-            
-        return None, None
-
-    def _handle_mouse_hover(self, ev):
-        pass # Implementar hover si deseas (snap visual)
-
-    # ... Resto de métodos (set_view_direction, etc.) se mantienen igual ...
-    def set_view_direction(self, view_name: str):
-        center = self.opts['center']
-        dist = self.cameraParams()['distance']
-        if view_name == "ISO": self.setCameraPosition(pos=center, distance=dist, elevation=30, azimuth=45)
-        elif view_name == "TOP": self.setCameraPosition(pos=center, distance=dist, elevation=90, azimuth=-90)
-        elif view_name == "FRONT": self.setCameraPosition(pos=center, distance=dist, elevation=0, azimuth=-90)
-        elif view_name == "RIGHT": self.setCameraPosition(pos=center, distance=dist, elevation=0, azimuth=0)
-
-# --- FIN DE COMPONENTES ---
-# (Las clases ViewCubeToolbar y CentralViewContainer deben estar aquí también, copiadas de tu versión anterior)
+            self.timer.stop()
+
+    @staticmethod
+    def _ms(value):
+        return "  -  " if value is None else f"{value * 1000:6.2f}"
+
+    def refresh(self):
+        frame = perf.percentiles("viewport.paint", (50, 95))
+        g = perf.gauges
+        lines = [
+            f"Frame   p50 {self._ms(frame[50])}  p95 {self._ms(frame[95])} ms",
+            f"Pick    last {self._ms(perf.last('viewport.pick'))} ms",
+            f"Scene   last {self._ms(perf.last('viewport.update_scene'))} ms",
+            f"Nodes {g.get('viewport.nodes', 0)}  Frame idx {g.get('viewport.frame_indices', 0)}  Labels {g.get('viewport.label_items', 0)}",
+        ]
+        self.label.setText("\n".join(lines))
+        self.reposition()
+
+    def reposition(self):
+        # Junto al CoordStatusWidget, en la esquina inferior izquierda
+        self.adjustSize()
+        parent = self.parentWidget()
+        if parent is not None:
+            self.move(10, parent.height() - self.height() - 20)
+        self.raise_()
+
+# --- CONTENEDOR CENTRAL ---
 class ViewCubeToolbar(QFrame):
     viewChanged = pyqtSignal(str)
     def __init__(self, parent=None):
@@ -731,22 +537,130 @@ class ViewCubeToolbar(QFrame):
         self.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
 
 class CentralViewContainer(QWidget):
+    # Se emite una sola vez, cuando el viewport 3D ya existe
+    viewportCreated = pyqtSignal(object)
+
+    # Split view: posición (fila, columna) de cada panel y vista inicial de los secundarios
+    PANE_LAYOUTS = {1: [(0, 0)], 2: [(0, 0), (0, 1)], 4: [(0, 0), (0, 1), (1, 0), (1, 1)]}
+    PANE_VIEWS = ["TOP", "FRONT", "RIGHT"]
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.main_layout = QVBoxLayout(self)
         self.main_layout.setContentsMargins(0, 0, 0, 0)
-        self.viewport = Viewport3DWidget()
-        self.main_layout.addWidget(self.viewport)
+        self.pane_layout = QGridLayout()
+        self.pane_layout.setContentsMargins(0, 0, 0, 0)
+        self.pane_layout.setSpacing(2)
+        self.main_layout.addLayout(self.pane_layout)
+        self._viewport = None
+        self._viewport_scheduled = False
+        # Paneles secundarios (comparten la escena del principal) y panel activo
+        self._panes = []
+        self._active = None
+
+        # Placeholder ligero hasta el primer pintado de la ventana
+        self.placeholder = QLabel("Loading 3D view...")
+        self.placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.placeholder.setStyleSheet("background-color: #FFFFFF; color: #888888;")
+        self.pane_layout.addWidget(self.placeholder, 0, 0)
+
         self.view_toolbar = ViewCubeToolbar(self)
         self.coord_status = CoordStatusWidget(self)
-        self.view_toolbar.viewChanged.connect(self.viewport.set_view_direction)
-        self.viewport.mouseMovedSignal.connect(self.coord_status.update_coords)
+        self.perf_overlay = PerfOverlayWidget(self)
+        self.view_toolbar.raise_()
+        self.coord_status.raise_()
+
+    @property
+    def viewport(self):
+        return self.ensure_viewport()
+
+    def is_viewport_created(self):
+        return self._viewport is not None
+
+    @property
+    def viewports(self):
+        """Todos los paneles 3D: el principal primero."""
+        return [self._viewport] + self._panes if self._viewport is not None else []
+
+    @property
+    def active_viewport(self):
+        """Panel sobre el que actúan la barra de vistas y las acciones de cámara."""
+        return self._active or self.viewport
+
+    def pane_count(self):
+        return len(self.viewports) or 1
+
+    def ensure_viewport(self):
+        """Crea el viewport 3D (import diferido de pyqtgraph.opengl) si aún no existe."""
+        if self._viewport is None:
+            from .viewport import Viewport3DWidget
+            self._viewport = Viewport3DWidget()
+            self.pane_layout.replaceWidget(self.placeholder, self._viewport)
+            self.placeholder.deleteLater()
+            self.placeholder = None
+            self.view_toolbar.viewChanged.connect(lambda name: self.active_viewport.set_view_direction(name))
+            self._viewport.mouseMovedSignal.connect(self.coord_status.update_coords)
+            self._viewport.activated.connect(self._set_active)
+            self._raise_overlays()
+            self.viewportCreated.emit(self._viewport)
+        return self._viewport
+
+    def set_pane_count(self, count):
+        """
+        Split view con 1, 2 o 4 paneles. Los secundarios comparten la escena
+        del principal (arrays, selección, tiles y buffers de GPU): solo la
+        cámara, el grid y el hover son de cada panel.
+        """
+        if count not in self.PANE_LAYOUTS:
+            raise ValueError(f"Unsupported pane count {count} (expected one of {sorted(self.PANE_LAYOUTS)})")
+        primary = self.ensure_viewport()
+        while len(self._panes) > count - 1:
+            pane = self._panes.pop()
+            if self._active is pane:
+                self._active = None
+            pane.detach()
+            self.pane_layout.removeWidget(pane)
+            pane.deleteLater()
+        from .viewport import Viewport3DWidget
+        while len(self._panes) < count - 1:
+            pane = Viewport3DWidget(shared=primary)
+            # Mismo encuadre que el principal, otra orientación (planta, alzados)
+            pane.setCameraPosition(pos=primary.opts['center'], distance=primary.cameraParams()['distance'])
+            pane.set_view_direction(self.PANE_VIEWS[len(self._panes) % len(self.PANE_VIEWS)])
+            # La selección es común: los paneles notifican a través de las señales del principal
+            pane.nodeSelectionChanged.connect(primary.nodeSelectionChanged)
+            pane.frameSelectionChanged.connect(primary.frameSelectionChanged)
+            pane.createFrameSignal.connect(primary.createFrameSignal)
+            pane.mouseMovedSignal.connect(self.coord_status.update_coords)
+            pane.activated.connect(self._set_active)
+            self._panes.append(pane)
+        for view, (row, col) in zip(self.viewports, self.PANE_LAYOUTS[count]):
+            self.pane_layout.addWidget(view, row, col)
+        self._raise_overlays()
+
+    def _set_active(self, view):
+        self._active = view
+
+    def _raise_overlays(self):
         self.view_toolbar.raise_()
         self.coord_status.raise_()
+        self.perf_overlay.raise_()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        # Primer pintado hecho: ahora sí cargamos el subsistema 3D
+        if self._viewport is None and not self._viewport_scheduled:
+            self._viewport_scheduled = True
+            QTimer.singleShot(0, self.ensure_viewport)
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
         self.view_toolbar.move(self.width() - self.view_toolbar.width() - 10, 10)
         self.view_toolbar.raise_()
         cw, ch = self.coord_status.width(), self.coord_status.height()
         self.coord_status.move(int((self.width() - cw)/2), self.height() - ch - 20)
-        self.coord_status.raise_()
\ No newline at end of file
+        self.coord_status.raise_()
+        self.perf_overlay.reposition()
+
+    def set_perf_overlay_visible(self, visible: bool):
+        self.perf_overlay.set_active(visible)
\ No newline at end of file
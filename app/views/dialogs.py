@@ -1,5 +1,10 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QFormLayout, QDoubleSpinBox, 
-                             QDialogButtonBox, QLineEdit, QLabel)
+                             QDialogButtonBox, QLineEdit, QLabel, QComboBox, QHBoxLayout,
+                             QTabWidget, QWidget, QCheckBox, QSpinBox, QTableWidget,
+                             QTableWidgetItem, QHeaderView, QAbstractItemView, QStackedWidget)
+from PyQt6.QtCore import pyqtSignal
+
+from app.models.sections import SHAPES, PROPERTY_NAMES, make_section
 
 class AddNodeDialog(QDialog):
     def __init__(self, parent=None):
@@ -76,4 +81,461 @@ class AddMaterialDialog(QDialog):
         return (self.input_name.text(), 
                 self.input_e.value(), 
                 self.input_nu.value(), 
-                self.input_rho.value())
\ No newline at end of file
+                self.input_rho.value())
+
+# --- SECCIONES ---
+class AddSectionDialog(QDialog):
+    """Forma paramétrica + dimensiones, con vista previa de A, Iy, Iz, J."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Add New Section")
+        layout = QVBoxLayout()
+        form = QFormLayout()
+        self.input_name = QLineEdit("FSEC1")
+        self.combo_shape = QComboBox()
+        self.combo_shape.addItems(list(SHAPES))
+        form.addRow("Name:", self.input_name)
+        form.addRow("Shape:", self.combo_shape)
+        layout.addLayout(form)
+
+        # Un formulario de dimensiones por forma
+        self.stack = QStackedWidget()
+        self.spins = {}
+        for shape, cls in SHAPES.items():
+            page = QWidget()
+            page_form = QFormLayout(page)
+            self.spins[shape] = {}
+            for param, label, default in cls.PARAMETERS:
+                spin = QDoubleSpinBox()
+                spin.setRange(0.0, 1e4)
+                spin.setDecimals(4)
+                spin.setSingleStep(0.01)
+                spin.setSuffix(" m")
+                spin.setValue(default)
+                spin.valueChanged.connect(self._update_preview)
+                page_form.addRow(f"{label}:", spin)
+                self.spins[shape][param] = spin
+            self.stack.addWidget(page)
+        layout.addWidget(self.stack)
+        self.label_preview = QLabel()
+        layout.addWidget(self.label_preview)
+        self.combo_shape.currentIndexChanged.connect(self.stack.setCurrentIndex)
+        self.combo_shape.currentIndexChanged.connect(self._update_preview)
+
+        self.buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        self.buttons.accepted.connect(self.accept)
+        self.buttons.rejected.connect(self.reject)
+        layout.addWidget(self.buttons)
+        self.setLayout(layout)
+        self._update_preview()
+
+    def get_data(self):
+        """(forma, nombre, {parámetro: valor})"""
+        shape = self.combo_shape.currentText()
+        return shape, self.input_name.text(), {p: spin.value() for p, spin in self.spins[shape].items()}
+
+    def _update_preview(self):
+        shape, name, params = self.get_data()
+        ok_button = self.buttons.button(QDialogButtonBox.StandardButton.Ok)
+        try:
+            props = make_section(shape, name, **params).properties
+        except ValueError as exc:
+            self.label_preview.setText(f"Invalid: {exc}")
+            ok_button.setEnabled(False)
+            return
+        self.label_preview.setText("   ".join(f"{k} = {v:.4g}" for k, v in zip(PROPERTY_NAMES, props)))
+        ok_button.setEnabled(True)
+
+
+class AssignFramePropertiesDialog(QDialog):
+    """Material y sección para los frames seleccionados ("No change" deja la columna como está)."""
+
+    def __init__(self, materials, sections, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Assign Frame Material / Section")
+        layout = QVBoxLayout()
+        form = QFormLayout()
+        self.combo_material, self._material_ids = self._combo(
+            [(mat_id, name) for mat_id, name, *_ in materials])
+        self.combo_section, self._section_ids = self._combo([(sid, name) for sid, name, *_ in sections])
+        form.addRow("Material:", self.combo_material)
+        form.addRow("Section:", self.combo_section)
+        layout.addLayout(form)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+    @staticmethod
+    def _combo(items):
+        combo = QComboBox()
+        combo.addItems(["(No change)", "(None)"] + [name for _, name in items])
+        return combo, [None, 0] + [item_id for item_id, _ in items]
+
+    def get_data(self):
+        """(id de material, id de sección): None = no cambiar, 0 = quitar."""
+        return (self._material_ids[self.combo_material.currentIndex()],
+                self._section_ids[self.combo_section.currentIndex()])
+
+
+# --- CARGAS ---
+class AddLoadPatternDialog(QDialog):
+    def __init__(self, parent=None, default_name="DEAD"):
+        super().__init__(parent)
+        self.setWindowTitle("Add Load Pattern")
+        layout = QVBoxLayout()
+        form = QFormLayout()
+        self.input_name = QLineEdit(default_name)
+        self.spin_self_weight = QDoubleSpinBox()
+        self.spin_self_weight.setRange(0.0, 100.0)
+        self.spin_self_weight.setDecimals(3)
+        self.spin_self_weight.setValue(1.0 if default_name == "DEAD" else 0.0)
+        form.addRow("Name:", self.input_name)
+        form.addRow("Self Weight Multiplier:", self.spin_self_weight)
+        layout.addLayout(form)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+    def get_data(self):
+        return self.input_name.text(), self.spin_self_weight.value()
+
+
+class AssignLoadDialog(QDialog):
+    """Patrón + componentes de la carga que se aplica a toda la selección."""
+    MODES = [("Replace existing loads", "replace"), ("Add to existing loads", "add"),
+             ("Delete existing loads", "delete")]
+
+    def __init__(self, title, patterns, components, unit, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        layout = QVBoxLayout()
+        form = QFormLayout()
+        self.combo_pattern = QComboBox()
+        self._pattern_ids = []
+        for pattern_id, name, _ in patterns:
+            self.combo_pattern.addItem(name)
+            self._pattern_ids.append(pattern_id)
+        form.addRow("Load Pattern:", self.combo_pattern)
+        self.spins = []
+        for name in components:
+            spin = QDoubleSpinBox()
+            spin.setRange(-1e9, 1e9)
+            spin.setDecimals(3)
+            spin.setSuffix(f" {unit}" if name[0] in "Fw" else f" {unit}·m")
+            form.addRow(f"{name}:", spin)
+            self.spins.append(spin)
+        self.combo_mode = QComboBox()
+        for label, _ in self.MODES:
+            self.combo_mode.addItem(label)
+        form.addRow("Mode:", self.combo_mode)
+        layout.addLayout(form)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+    def get_data(self):
+        """(id de patrón, valores, modo)"""
+        mode = self.MODES[self.combo_mode.currentIndex()][1]
+        return self._pattern_ids[self.combo_pattern.currentIndex()], [s.value() for s in self.spins], mode
+
+# --- DIÁLOGOS DE SELECCIÓN POR CONSULTA ---
+class _SelectionQueryDialog(QDialog):
+    """Base: formulario de la consulta + cómo combinarla con la selección actual."""
+    MODES = [("Replace selection", "replace"), ("Add to selection", "add"),
+             ("Remove from selection", "remove"), ("Intersect with selection", "intersect")]
+
+    def __init__(self, title, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        layout = QVBoxLayout()
+        self.form = QFormLayout()
+        layout.addLayout(self.form)
+
+        self.combo_mode = QComboBox()
+        for label, _ in self.MODES:
+            self.combo_mode.addItem(label)
+        mode_form = QFormLayout()
+        mode_form.addRow("Mode:", self.combo_mode)
+        layout.addLayout(mode_form)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+    def get_mode(self):
+        return self.MODES[self.combo_mode.currentIndex()][1]
+
+    @staticmethod
+    def _bound_spin(value=None):
+        # El mínimo del rango se muestra como "Any" (= sin límite)
+        spin = QDoubleSpinBox()
+        spin.setRange(-1e9, 1e9)
+        spin.setDecimals(3)
+        spin.setSpecialValueText("Any")
+        spin.setValue(spin.minimum() if value is None else value)
+        return spin
+
+    @staticmethod
+    def _bound_value(spin):
+        return None if spin.value() == spin.minimum() else spin.value()
+
+
+class SelectNodesInRangeDialog(_SelectionQueryDialog):
+    def __init__(self, parent=None):
+        super().__init__("Select Nodes in Coordinate Range", parent)
+        self.spins = []
+        for axis in "XYZ":
+            spin_min, spin_max = self._bound_spin(), self._bound_spin()
+            row = QHBoxLayout()
+            row.addWidget(spin_min)
+            row.addWidget(QLabel("to"))
+            row.addWidget(spin_max)
+            self.form.addRow(f"{axis}:", row)
+            self.spins.append((spin_min, spin_max))
+
+    def get_query(self):
+        lo = [self._bound_value(a) for a, _ in self.spins]
+        hi = [self._bound_value(b) for _, b in self.spins]
+        return lo, hi
+
+
+class SelectNodesOnPlaneDialog(_SelectionQueryDialog):
+    # Plano -> normal
+    PLANES = {"XY (Z = value)": (0, 0, 1), "XZ (Y = value)": (0, 1, 0), "YZ (X = value)": (1, 0, 0)}
+
+    def __init__(self, parent=None):
+        super().__init__("Select Nodes on Plane", parent)
+        self.combo_plane = QComboBox()
+        self.combo_plane.addItems(list(self.PLANES))
+        self.spin_value = QDoubleSpinBox()
+        self.spin_value.setRange(-1e9, 1e9)
+        self.spin_value.setDecimals(3)
+        self.spin_tol = QDoubleSpinBox()
+        self.spin_tol.setRange(0.0, 1e6)
+        self.spin_tol.setDecimals(6)
+        self.spin_tol.setValue(1e-3)
+        self.form.addRow("Plane:", self.combo_plane)
+        self.form.addRow("Value:", self.spin_value)
+        self.form.addRow("Tolerance:", self.spin_tol)
+
+    def get_query(self):
+        """(punto, normal, tolerancia)"""
+        normal = self.PLANES[self.combo_plane.currentText()]
+        point = [self.spin_value.value() * c for c in normal]
+        return point, normal, self.spin_tol.value()
+
+
+class SelectFramesByOrientationDialog(_SelectionQueryDialog):
+    KINDS = [("Columns (vertical)", "column"), ("Beams (horizontal)", "beam"), ("Braces (inclined)", "brace")]
+
+    def __init__(self, parent=None):
+        super().__init__("Select Frames by Orientation", parent)
+        self.combo_kind = QComboBox()
+        for label, _ in self.KINDS:
+            self.combo_kind.addItem(label)
+        self.spin_angle = QDoubleSpinBox()
+        self.spin_angle.setRange(0.0, 45.0)
+        self.spin_angle.setValue(1.0)
+        self.spin_angle.setSuffix(" °")
+        self.form.addRow("Orientation:", self.combo_kind)
+        self.form.addRow("Angle tolerance:", self.spin_angle)
+
+    def get_query(self):
+        return self.KINDS[self.combo_kind.currentIndex()][1], self.spin_angle.value()
+
+
+class SelectFramesByLengthDialog(_SelectionQueryDialog):
+    def __init__(self, parent=None):
+        super().__init__("Select Frames by Length", parent)
+        self.spin_min = self._bound_spin()
+        self.spin_max = self._bound_spin()
+        self.form.addRow("Min length:", self.spin_min)
+        self.form.addRow("Max length:", self.spin_max)
+
+    def get_query(self):
+        return self._bound_value(self.spin_min), self._bound_value(self.spin_max)
+
+
+class SelectFramesByPropertyDialog(_SelectionQueryDialog):
+    def __init__(self, materials, sections, parent=None):
+        super().__init__("Select Frames by Material / Section", parent)
+        self._choices = {"Section": [(sid, name) for sid, name, *_ in sections],
+                         "Material": [(mat_id, name) for mat_id, name, *_ in materials]}
+        self.combo_kind = QComboBox()
+        self.combo_kind.addItems(list(self._choices))
+        self.combo_item = QComboBox()
+        self.form.addRow("Property:", self.combo_kind)
+        self.form.addRow("Value:", self.combo_item)
+        self.combo_kind.currentTextChanged.connect(self._fill_items)
+        self._fill_items(self.combo_kind.currentText())
+
+    def _fill_items(self, kind):
+        # "(None)" = frames sin asignar
+        self.combo_item.clear()
+        self.combo_item.addItems(["(None)"] + [name for _, name in self._choices[kind]])
+
+    def get_query(self):
+        """('material' | 'section', id; 0 = sin asignar)"""
+        kind = self.combo_kind.currentText()
+        index = self.combo_item.currentIndex()
+        return kind.lower(), 0 if index <= 0 else self._choices[kind][index - 1][0]
+
+
+# --- REPLICAR (lineal / radial / espejo) ---
+class ReplicateDialog(QDialog):
+    def __init__(self, parent=None, merge_tol=1e-3):
+        super().__init__(parent)
+        self.setWindowTitle("Replicate Selection")
+        layout = QVBoxLayout()
+        self.tabs = QTabWidget()
+
+        # Lineal
+        linear = QWidget()
+        form = QFormLayout(linear)
+        self.spin_dx, self.spin_dy, self.spin_dz = (self._coord_spin() for _ in range(3))
+        self.spin_dz.setValue(3.0)
+        self.spin_linear_count = self._count_spin()
+        form.addRow("dX:", self.spin_dx)
+        form.addRow("dY:", self.spin_dy)
+        form.addRow("dZ:", self.spin_dz)
+        form.addRow("Copies:", self.spin_linear_count)
+        self.tabs.addTab(linear, "Linear")
+
+        # Radial
+        radial = QWidget()
+        form = QFormLayout(radial)
+        self.combo_axis = QComboBox()
+        self.combo_axis.addItems(["Z", "X", "Y"])
+        self.spin_cx, self.spin_cy, self.spin_cz = (self._coord_spin() for _ in range(3))
+        self.spin_angle = QDoubleSpinBox()
+        self.spin_angle.setRange(-360.0, 360.0)
+        self.spin_angle.setValue(90.0)
+        self.spin_angle.setSuffix(" °")
+        self.spin_radial_count = self._count_spin()
+        form.addRow("Axis:", self.combo_axis)
+        form.addRow("Center X:", self.spin_cx)
+        form.addRow("Center Y:", self.spin_cy)
+        form.addRow("Center Z:", self.spin_cz)
+        form.addRow("Angle step:", self.spin_angle)
+        form.addRow("Copies:", self.spin_radial_count)
+        self.tabs.addTab(radial, "Radial")
+
+        # Espejo
+        mirror = QWidget()
+        form = QFormLayout(mirror)
+        self.combo_plane = QComboBox()
+        self.combo_plane.addItems(list(SelectNodesOnPlaneDialog.PLANES))
+        self.spin_plane_value = self._coord_spin()
+        form.addRow("Plane:", self.combo_plane)
+        form.addRow("Value:", self.spin_plane_value)
+        self.tabs.addTab(mirror, "Mirror")
+
+        layout.addWidget(self.tabs)
+
+        merge_form = QFormLayout()
+        self.check_merge = QCheckBox("Merge coincident nodes at seams")
+        self.check_merge.setChecked(True)
+        self.spin_merge_tol = QDoubleSpinBox()
+        self.spin_merge_tol.setRange(0.0, 1e6)
+        self.spin_merge_tol.setDecimals(6)
+        self.spin_merge_tol.setValue(merge_tol)
+        self.check_merge.toggled.connect(self.spin_merge_tol.setEnabled)
+        merge_form.addRow(self.check_merge)
+        merge_form.addRow("Tolerance:", self.spin_merge_tol)
+        layout.addLayout(merge_form)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+    @staticmethod
+    def _coord_spin():
+        spin = QDoubleSpinBox()
+        spin.setRange(-1e6, 1e6)
+        spin.setDecimals(3)
+        return spin
+
+    @staticmethod
+    def _count_spin():
+        spin = QSpinBox()
+        spin.setRange(1, 10000)
+        spin.setValue(1)
+        return spin
+
+    def get_data(self):
+        """(tipo, parámetros, tolerancia de fusión o None)"""
+        merge_tol = self.spin_merge_tol.value() if self.check_merge.isChecked() else None
+        kind = ("linear", "radial", "mirror")[self.tabs.currentIndex()]
+        if kind == "linear":
+            params = {"offset": (self.spin_dx.value(), self.spin_dy.value(), self.spin_dz.value()),
+                      "count": self.spin_linear_count.value()}
+        elif kind == "radial":
+            params = {"angle_deg": self.spin_angle.value(), "count": self.spin_radial_count.value(),
+                      "axis": self.combo_axis.currentText(),
+                      "center": (self.spin_cx.value(), self.spin_cy.value(), self.spin_cz.value())}
+        else:
+            normal = SelectNodesOnPlaneDialog.PLANES[self.combo_plane.currentText()]
+            params = {"point": [self.spin_plane_value.value() * c for c in normal], "normal": normal}
+        return kind, params, merge_tol
+
+
+# --- RESULTADOS DE COMPROBACIÓN DEL MODELO ---
+class ModelCheckDialog(QDialog):
+    """Lista de CheckIssue; 'Select' pide seleccionar los IDs del problema marcado."""
+    selectRequested = pyqtSignal(object)
+
+    def __init__(self, issues, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Model Check")
+        self.resize(560, 260)
+        self.issues = list(issues)
+        layout = QVBoxLayout()
+
+        if self.issues:
+            layout.addWidget(QLabel(f"{len(self.issues)} problem(s) found:"))
+        else:
+            layout.addWidget(QLabel("No problems found."))
+
+        self.table = QTableWidget(len(self.issues), 4)
+        self.table.setHorizontalHeaderLabels(["Check", "Nodes", "Frames", "Details"])
+        self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        for row, issue in enumerate(self.issues):
+            self.table.setItem(row, 0, QTableWidgetItem(issue.title))
+            self.table.setItem(row, 1, QTableWidgetItem(str(len(issue.node_ids))))
+            self.table.setItem(row, 2, QTableWidgetItem(str(len(issue.element_ids))))
+            self.table.setItem(row, 3, QTableWidgetItem(issue.description))
+        self.table.resizeColumnToContents(0)
+        self.table.doubleClicked.connect(lambda index: self._emit_select())
+        layout.addWidget(self.table)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        self.btn_select = buttons.addButton("Select", QDialogButtonBox.ButtonRole.ActionRole)
+        self.btn_select.setEnabled(bool(self.issues))
+        self.btn_select.clicked.connect(self._emit_select)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+        if self.issues:
+            self.table.selectRow(0)
+
+    def _emit_select(self):
+        row = self.table.currentRow()
+        if 0 <= row < len(self.issues):
+            self.selectRequested.emit(self.issues[row])
@@ -0,0 +1,429 @@
+"""
+Items OpenGL propios para el viewport.
+
+La geometría se reparte en tiles espaciales (ver tiling.py), cada uno con sus
+propios buffers y su caja envolvente:
+  * en cada paint se descartan los tiles fuera del frustum de la cámara;
+  * al cambiar la escena solo se reconstruyen y vuelven a subir los tiles
+    cuya firma de contenido cambió (una edición local toca uno o dos tiles).
+
+TiledLineItem dibuja los frames de cada tile desde un buffer con un vértice
+por nodo del tile y un index buffer de pares de vértices, sin duplicar dos
+vértices por frame. La selección es un segundo index buffer por tile
+(subconjunto de segmentos) dibujado encima con otro color y grosor, así que
+seleccionar solo reescribe esos buffers pequeños. TiledPointsItem hace lo
+mismo con los marcadores de nodo (posición + color por tile).
+
+Los tiles viven en un TileStore que pueden compartir varios items (uno por
+panel del split view, ver `shared=`): la partición, las firmas y los índices
+se calculan una vez y, como los contextos GL de los paneles están
+compartidos, cada buffer se sube a la GPU una sola vez para todos.
+"""
+import math
+
+import numpy as np
+from OpenGL import GL
+from pyqtgraph.opengl import GLLinePlotItem, GLScatterPlotItem
+from pyqtgraph.opengl.items.GLScatterPlotItem import _is_compatibility_profile
+from PyQt6.QtGui import QOpenGLContext
+from PyQt6.QtOpenGL import QOpenGLBuffer
+
+from .picking import qmatrix_to_numpy
+from .tiling import (TARGET_PER_TILE, TileGrid, group_rows, group_signatures, group_extents,
+                     point_hashes, mix64, frustum_planes, boxes_in_frustum)
+
+_EMPTY_SEGMENTS = np.zeros((0, 2), dtype=np.uint32)
+_VERTEX, _INDEX = QOpenGLBuffer.Type.VertexBuffer, QOpenGLBuffer.Type.IndexBuffer
+
+
+class _Tile:
+    """Datos de un tile y sus buffers de GPU (se crean al primer paint)."""
+    __slots__ = ("rows", "signature", "pos", "indices", "colors", "highlight",
+                 "buffers", "dirty", "color_dirty", "highlight_dirty")
+
+    def __init__(self, rows, signature):
+        self.rows = rows            # filas globales (segmentos o puntos) en el orden del tile
+        self.signature = signature
+        self.pos = None             # (V,3) float32
+        self.indices = None         # (S,2) uint32, solo líneas
+        self.colors = None          # (V,4) float32 o None (color constante), solo puntos
+        self.highlight = _EMPTY_SEGMENTS
+        self.buffers = {}
+        self.dirty = True
+        self.color_dirty = True
+        self.highlight_dirty = False
+
+
+class TileStore:
+    """Tiles de un item (datos y buffers de GPU); la comparten los items espejo de otros paneles."""
+
+    def __init__(self, per_tile):
+        self.per_tile = per_tile
+        self.grid = None
+        self.grid_items = 0
+        self.tiles = []
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.lo = np.zeros((0, 3))
+        self.hi = np.zeros((0, 3))
+        self.retired = []
+        # Tiles reconstruidos en el último cambio
+        self.tiles_rebuilt = 0
+        # Segmentos (líneas) / posiciones y color constante (puntos)
+        self.n_segments = 0
+        self.pos = np.zeros((0, 3), dtype=np.float32)
+        self.color = (1.0, 1.0, 1.0, 1.0)
+
+    def memory_footprint(self, report, label):
+        """Partidas de memoria: arrays de los tiles y, estimado, lo subido a la GPU (una vez por tile)."""
+        cpu = gpu = 0
+        for tile in self.tiles:
+            arrays = {"pos": tile.pos, "index": tile.indices, "color": tile.colors, "highlight": tile.highlight}
+            cpu += report.nbytes(tile.rows, *arrays.values())
+            gpu += sum(a.nbytes for name, a in arrays.items() if a is not None and name in tile.buffers)
+        report.add("render buffers", f"{label} tiles", cpu)
+        report.add("render buffers", f"{label} tiles (GPU, est.)", gpu)
+
+
+class _TiledItemMixin:
+    """Gestión común de tiles: rejilla, reutilización por firma, culling y buffers retirados."""
+
+    def _init_tiles(self, per_tile, shared=None):
+        # Con shared (otro item del mismo tipo) se dibujan sus tiles, sin copiarlos
+        self.store = shared.store if shared is not None else TileStore(per_tile)
+        # Estadísticas del último paint de este item: tiles dibujados y subidos
+        self.tiles_visible = 0
+        self.tiles_uploaded = 0
+
+    @property
+    def tiles(self):
+        return self.store.tiles
+
+    @property
+    def tiles_rebuilt(self):
+        return self.store.tiles_rebuilt
+
+    def _tile_keys_for(self, points):
+        # La rejilla se conserva mientras cubra la escena y el tamaño no cambie en más de 4x
+        store = self.store
+        n = len(points)
+        lo, hi = points.min(axis=0), points.max(axis=0)
+        if store.grid is None or not store.grid.covers(lo, hi) or \
+                not (store.grid_items // 4 <= n <= 4 * max(store.grid_items, 1)):
+            store.grid = TileGrid.fit(lo, hi, n, store.per_tile)
+            store.grid_items = n
+        return store.grid.keys(points)
+
+    def _match_tiles(self, keys, signatures, rows):
+        """Reutiliza los tiles con la misma clave y firma; devuelve (tiles, índices de los nuevos)."""
+        store = self.store
+        old = dict(zip(store.keys.tolist(), store.tiles))
+        tiles, changed = [], []
+        for i, (key, signature) in enumerate(zip(keys.tolist(), signatures.tolist())):
+            tile = old.pop(key, None)
+            if tile is not None and tile.signature == signature and len(tile.rows) == len(rows[i]):
+                tile.rows = rows[i]
+            else:
+                if tile is not None:
+                    store.retired.extend(tile.buffers.values())
+                tile = _Tile(rows[i], signature)
+                changed.append(i)
+            tiles.append(tile)
+        for tile in old.values():
+            store.retired.extend(tile.buffers.values())
+        store.tiles = tiles
+        store.keys = keys
+        store.tiles_rebuilt = len(changed)
+        return tiles, changed
+
+    def _clear_tiles(self):
+        store = self.store
+        for tile in store.tiles:
+            store.retired.extend(tile.buffers.values())
+        store.tiles = []
+        store.keys = np.zeros(0, dtype=np.int64)
+        store.lo = np.zeros((0, 3))
+        store.hi = np.zeros((0, 3))
+        store.tiles_rebuilt = 0
+
+    def _visible_tiles(self):
+        store = self.store
+        self.tiles_uploaded = 0
+        # Los buffers de tiles descartados se destruyen aquí, con el contexto GL activo
+        for buffer in store.retired:
+            buffer.destroy()
+        store.retired = []
+        if not store.tiles:
+            self.tiles_visible = 0
+            return []
+        planes = frustum_planes(qmatrix_to_numpy(self.mvpMatrix()))
+        inside = boxes_in_frustum(planes, store.lo, store.hi)
+        visible = [tile for tile, v in zip(store.tiles, inside.tolist()) if v]
+        self.tiles_visible = len(visible)
+        return visible
+
+    def _upload(self, tile, name, kind, array):
+        buffer = tile.buffers.get(name)
+        if buffer is None:
+            buffer = tile.buffers[name] = QOpenGLBuffer(kind)
+        self.upload_vbo(buffer, array)
+        return buffer
+
+
+class TiledLineItem(_TiledItemMixin, GLLinePlotItem):
+    """Segmentos indexados por tiles (color base constante)."""
+    _EXTRA_ARGS = ('pos', 'indices', 'highlight_color', 'highlight_width')
+
+    def __init__(self, per_tile=TARGET_PER_TILE, shared=None, **kwds):
+        extra = {k: kwds.pop(k) for k in self._EXTRA_ARGS if k in kwds}
+        kwds.setdefault('mode', 'lines')
+        super().__init__(**kwds)
+        self._init_tiles(per_tile, shared)
+        self.highlight_color = (1.0, 0.0, 0.0, 1.0)
+        self.highlight_width = 4.0
+        self.setData(**extra)
+
+    def setData(self, **kwds):
+        """
+        Igual que GLLinePlotItem.setData (color constante) más:
+        pos + indices    (N,3) vértices y (E,2) filas de `pos` que une cada segmento;
+                         se reparten en tiles por el punto medio de cada segmento
+        highlight_color  color RGBA del resaltado
+        highlight_width  grosor del resaltado
+        Tras cambiar pos/indices hay que volver a fijar set_highlight_mask().
+        pos/indices y el resaltado afectan también a los items que comparten estos tiles.
+        """
+        pos, indices = kwds.pop('pos', None), kwds.pop('indices', None)
+        for k in ('highlight_color', 'highlight_width'):
+            if k in kwds:
+                setattr(self, k, kwds.pop(k))
+        super().setData(**kwds)
+        if pos is not None and indices is not None:
+            self._rebuild(np.asarray(pos, dtype=np.float64).reshape(-1, 3),
+                          np.asarray(indices, dtype=np.int64).reshape(-1, 2))
+            self.update()
+
+    @property
+    def n_segments(self):
+        return self.store.n_segments
+
+    def _rebuild(self, pos, indices):
+        self.store.n_segments = len(indices)
+        if not len(indices):
+            self._clear_tiles()
+            return
+        a, b = indices[:, 0], indices[:, 1]
+        pos32 = pos.astype(np.float32)
+        p0, p1 = pos32[a], pos32[b]
+        mid = p0 + p1
+        mid *= 0.5
+        tile_keys, order, starts = group_rows(self._tile_keys_for(mid))
+        del mid
+        hashes = point_hashes(pos32)
+        segment_hashes = mix64(hashes[a] ^ mix64(hashes[b] + np.uint64(1)))
+        signatures = group_signatures(segment_hashes[order], starts)
+        self.store.lo, self.store.hi = group_extents(np.minimum(p0, p1)[order], np.maximum(p0, p1)[order], starts)
+        ends = np.r_[starts[1:], len(order)]
+        tiles, changed = self._match_tiles(tile_keys, signatures,
+                                           [order[s:e] for s, e in zip(starts.tolist(), ends.tolist())])
+        if not changed:
+            return
+
+        # Vértices de los tiles nuevos de una vez: pares (tile, fila de nodo) únicos
+        n_nodes = len(pos)
+        seg_rows = np.concatenate([tiles[i].rows for i in changed])
+        counts = [len(tiles[i].rows) for i in changed]
+        tile_of = np.repeat(np.arange(len(changed), dtype=np.int64), counts)
+        uniq, inverse = np.unique(tile_of[:, None] * n_nodes + indices[seg_rows], return_inverse=True)
+        v_starts = np.searchsorted(uniq, np.arange(len(changed), dtype=np.int64) * n_nodes)
+        v_ends = np.r_[v_starts[1:], len(uniq)]
+        vertex_rows = uniq % n_nodes
+        local = (inverse.reshape(-1, 2) - v_starts[tile_of][:, None]).astype(np.uint32)
+        offset = 0
+        for j, i in enumerate(changed):
+            tile = tiles[i]
+            tile.pos = pos32[vertex_rows[v_starts[j]:v_ends[j]]]
+            tile.indices = np.ascontiguousarray(local[offset:offset + counts[j]])
+            offset += counts[j]
+
+    def set_highlight_mask(self, mask):
+        """Resalta los segmentos con mask[fila] True; solo se reescriben los tiles cuyo resaltado cambió."""
+        mask = np.asarray(mask, dtype=bool).reshape(-1)
+        if len(mask) != self.n_segments:
+            mask = np.zeros(self.n_segments, dtype=bool)
+        for tile in self.tiles:
+            selected = mask[tile.rows]
+            highlight = np.ascontiguousarray(tile.indices[selected]) if selected.any() else _EMPTY_SEGMENTS
+            if not np.array_equal(highlight, tile.highlight):
+                tile.highlight = highlight
+                tile.highlight_dirty = True
+        self.update()
+
+    def _bind_positions(self, tile):
+        if tile.dirty:
+            self._upload(tile, "pos", _VERTEX, tile.pos)
+            self._upload(tile, "index", _INDEX, tile.indices)
+            tile.dirty = False
+            self.tiles_uploaded += 1
+        vbo = tile.buffers["pos"]
+        vbo.bind()
+        GL.glVertexAttribPointer(0, 3, GL.GL_FLOAT, False, 0, None)
+        vbo.release()
+
+    def _draw_indices(self, ibo, count):
+        ibo.bind()
+        GL.glDrawElements(GL.GL_LINES, count, GL.GL_UNSIGNED_INT, None)
+        ibo.release()
+
+    def paint(self):
+        visible = self._visible_tiles()
+        if not visible:
+            return
+        self.setupGLState()
+        mat_mvp = np.array(self.mvpMatrix().data(), dtype=np.float32)
+        context = QOpenGLContext.currentContext()
+
+        enable_aa = self.antialias and not context.isOpenGLES()
+        if enable_aa:
+            GL.glEnable(GL.GL_LINE_SMOOTH)
+            GL.glEnable(GL.GL_BLEND)
+            GL.glBlendFuncSeparate(GL.GL_SRC_ALPHA, GL.GL_ONE_MINUS_SRC_ALPHA,
+                                   GL.GL_ONE, GL.GL_ONE_MINUS_SRC_ALPHA)
+            GL.glHint(GL.GL_LINE_SMOOTH_HINT, GL.GL_NICEST)
+
+        sfmt = context.format()
+        wide_lines = not (sfmt.profile() == sfmt.OpenGLContextProfile.CoreProfile
+                          and not sfmt.testOption(sfmt.FormatOption.DeprecatedFunctions))
+
+        program = self.getShaderProgram()
+        GL.glEnableVertexAttribArray(0)
+        GL.glDisableVertexAttribArray(1)
+        with program:
+            GL.glUniformMatrix4fv(GL.glGetUniformLocation(program, "u_mvp"), 1, False, mat_mvp)
+            GL.glVertexAttrib4f(1, *self.color)
+            if wide_lines:
+                GL.glLineWidth(self.width)
+            for tile in visible:
+                self._bind_positions(tile)
+                self._draw_indices(tile.buffers["index"], tile.indices.size)
+
+            # Encima de la pasada base (mismos vértices, color constante)
+            highlighted = [tile for tile in visible if len(tile.highlight)]
+            if highlighted:
+                GL.glVertexAttrib4f(1, *self.highlight_color)
+                if wide_lines:
+                    GL.glLineWidth(self.highlight_width)
+                for tile in highlighted:
+                    self._bind_positions(tile)
+                    if tile.highlight_dirty or "highlight" not in tile.buffers:
+                        self._upload(tile, "highlight", _INDEX, tile.highlight)
+                        tile.highlight_dirty = False
+                    self._draw_indices(tile.buffers["highlight"], tile.highlight.size)
+
+        GL.glDisableVertexAttribArray(0)
+        if enable_aa:
+            GL.glDisable(GL.GL_LINE_SMOOTH)
+            GL.glDisable(GL.GL_BLEND)
+        GL.glLineWidth(1.0)
+
+
+class TiledPointsItem(_TiledItemMixin, GLScatterPlotItem):
+    """Marcadores de punto por tiles: misma API que GLScatterPlotItem con `size` escalar."""
+
+    def __init__(self, per_tile=TARGET_PER_TILE, shared=None, **kwds):
+        extra = {k: kwds.pop(k) for k in ('pos', 'color') if k in kwds}
+        super().__init__(**kwds)
+        self._init_tiles(per_tile, shared)
+        self.setData(**extra)
+
+    def setData(self, **kwds):
+        """
+        pos    (N,3) posiciones: se reparten en tiles (solo se reconstruyen los que cambian)
+        color  (N,4) por punto o un RGBA constante; solo se vuelven a subir los tiles cuyo color cambió
+        """
+        pos, color = kwds.pop('pos', None), kwds.pop('color', None)
+        if isinstance(kwds.get('size'), np.ndarray):
+            raise ValueError("TiledPointsItem only supports a scalar size")
+        super().setData(**kwds)
+        if pos is not None:
+            self._rebuild(np.ascontiguousarray(pos, dtype=np.float32).reshape(-1, 3))
+        if color is not None or pos is not None:
+            self._set_colors(self.store.color if color is None else color)
+        self.update()
+
+    def _rebuild(self, pos32):
+        self.store.pos = pos32
+        if not len(pos32):
+            self._clear_tiles()
+            return
+        tile_keys, order, starts = group_rows(self._tile_keys_for(pos32))
+        signatures = group_signatures(point_hashes(pos32)[order], starts)
+        grouped = pos32[order]
+        self.store.lo, self.store.hi = group_extents(grouped, grouped, starts)
+        ends = np.r_[starts[1:], len(order)]
+        tiles, changed = self._match_tiles(tile_keys, signatures,
+                                           [order[s:e] for s, e in zip(starts.tolist(), ends.tolist())])
+        for i in changed:
+            tiles[i].pos = pos32[tiles[i].rows]
+
+    def _set_colors(self, color):
+        store = self.store
+        if isinstance(color, np.ndarray) and color.ndim == 2 and len(color) == len(store.pos):
+            store.color = np.ascontiguousarray(color, dtype=np.float32)
+            for tile in store.tiles:
+                colors = store.color[tile.rows]
+                if tile.colors is None or not np.array_equal(colors, tile.colors):
+                    tile.colors = colors
+                    tile.color_dirty = True
+        else:
+            store.color = tuple(np.asarray(color, dtype=np.float32).reshape(-1)[:4].tolist()) \
+                if not isinstance(color, tuple) else color
+            for tile in store.tiles:
+                tile.colors = None
+
+    def paint(self):
+        visible = self._visible_tiles()
+        if not visible:
+            return
+        self.setupGLState()
+        mat_mvp = np.array(self.mvpMatrix().data(), dtype=np.float32)
+        mat_modelview = np.array(self.modelViewMatrix().data(), dtype=np.float32)
+        view = self.view()
+        scale = 0 if self.pxMode else 2.0 * math.tan(math.radians(0.5 * view.opts["fov"])) / view.width()
+
+        context = QOpenGLContext.currentContext()
+        if not context.isOpenGLES():
+            if _is_compatibility_profile(context):
+                GL.glEnable(GL.GL_POINT_SPRITE)
+            GL.glEnable(GL.GL_PROGRAM_POINT_SIZE)
+
+        program = self.getShaderProgram()
+        GL.glEnableVertexAttribArray(0)
+        with program:
+            GL.glUniformMatrix4fv(GL.glGetUniformLocation(program, "u_mvp"), 1, False, mat_mvp)
+            GL.glUniformMatrix4fv(GL.glGetUniformLocation(program, "u_modelview"), 1, False, mat_modelview)
+            GL.glUniform1f(GL.glGetUniformLocation(program, "u_scale"), scale)
+            GL.glVertexAttrib1f(2, self.size)
+            for tile in visible:
+                if tile.dirty:
+                    self._upload(tile, "pos", _VERTEX, tile.pos)
+                    tile.dirty = False
+                    self.tiles_uploaded += 1
+                vbo = tile.buffers["pos"]
+                vbo.bind()
+                GL.glVertexAttribPointer(0, 3, GL.GL_FLOAT, False, 0, None)
+                vbo.release()
+                if tile.colors is not None:
+                    if tile.color_dirty or "color" not in tile.buffers:
+                        self._upload(tile, "color", _VERTEX, tile.colors)
+                        tile.color_dirty = False
+                    cbo = tile.buffers["color"]
+                    cbo.bind()
+                    GL.glVertexAttribPointer(1, 4, GL.GL_FLOAT, False, 0, None)
+                    cbo.release()
+                    GL.glEnableVertexAttribArray(1)
+                else:
+                    GL.glDisableVertexAttribArray(1)
+                    GL.glVertexAttrib4f(1, *self.store.color)
+                GL.glDrawArrays(GL.GL_POINTS, 0, len(tile.rows))
+        GL.glDisableVertexAttribArray(0)
+        GL.glDisableVertexAttribArray(1)
@@ -0,0 +1,103 @@
+"""
+Geometría de flechas para dibujar cargas (solo numpy, sin Qt ni GL).
+
+Todas las flechas de un patrón se generan en bloque como pares de vértices
+para un único GLLinePlotItem en modo 'lines': cada flecha son 3 segmentos
+(asta y dos trazos de punta). Las cargas uniformes se dibujan con varias
+flechas a lo largo del frame y una línea que une sus colas.
+
+    pos, color = load_arrows(node_pos, forces, p0, p1, w, length=2.0)
+"""
+import numpy as np
+
+NODAL_LOAD_COLOR = (0.9, 0.45, 0.0, 1.0)
+MEMBER_LOAD_COLOR = (0.0, 0.55, 0.8, 1.0)
+# Flechas por frame cargado; en modelos grandes basta una (el dibujo ya es ilegible)
+ARROWS_PER_MEMBER = 3
+MANY_MEMBERS = 50000
+_HEAD = 0.25
+_HEAD_WIDTH = 0.4
+
+
+def arrow_segments(tips, vectors):
+    """(6K,3) vértices de K flechas que terminan en tips (K,3) con dirección y largo vectors (K,3)."""
+    tips = np.asarray(tips, dtype=np.float32).reshape(-1, 3)
+    vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, 3)
+    length = np.sqrt(np.einsum("ij,ij->i", vectors, vectors))
+    unit = vectors / np.maximum(length, 1e-30)[:, None]
+    # Perpendicular para abrir la punta: respecto a Z, o a X si la flecha es casi vertical
+    ref = np.zeros_like(unit)
+    vertical = np.abs(unit[:, 2]) > 0.9
+    ref[vertical, 0] = 1.0
+    ref[~vertical, 2] = 1.0
+    side = np.cross(unit, ref)
+    side /= np.maximum(np.sqrt(np.einsum("ij,ij->i", side, side)), 1e-30)[:, None]
+    head = (length * _HEAD)[:, None]
+    back = tips - unit * head
+    out = np.empty((len(tips), 6, 3), dtype=np.float32)
+    out[:, 0] = tips - vectors
+    out[:, 1] = tips
+    out[:, 2] = tips
+    out[:, 3] = back + side * (head * _HEAD_WIDTH)
+    out[:, 4] = tips
+    out[:, 5] = back - side * (head * _HEAD_WIDTH)
+    return out.reshape(-1, 3)
+
+
+def _scale(vectors, length):
+    """Factor que deja la flecha más larga con `length` unidades de modelo."""
+    if not len(vectors):
+        return 0.0
+    peak = float(np.sqrt(np.einsum("ij,ij->i", vectors, vectors)).max())
+    return length / peak if peak > 0 else 0.0
+
+
+def member_segment_count(n_members, per_member=ARROWS_PER_MEMBER):
+    return n_members * (6 * per_member + 2)
+
+
+def member_load_segments(p0, p1, w, scale, per_member=ARROWS_PER_MEMBER, out=None):
+    """
+    Flechas repartidas a lo largo de cada frame (apuntando a él) más la línea
+    de colas. Las flechas de un frame son traslaciones de una sola: se
+    calcula una por frame y se desplaza a cada punto.
+    """
+    p0 = np.asarray(p0, dtype=np.float32)
+    p1 = np.asarray(p1, dtype=np.float32)
+    vectors = np.asarray(w, dtype=np.float32) * np.float32(scale)
+    if per_member == 1:
+        t = np.array([0.5], dtype=np.float32)
+    else:
+        t = np.linspace(0.0, 1.0, per_member, dtype=np.float32)
+    if out is None:
+        out = np.empty((member_segment_count(len(p0), per_member), 3), dtype=np.float32)
+    per_frame = out.reshape(len(p0), 6 * per_member + 2, 3)
+    template = arrow_segments(p0, vectors).reshape(-1, 1, 6, 3)
+    offsets = (p1 - p0)[:, None, None, :] * t[None, :, None, None]
+    np.add(template, offsets, out=per_frame[:, :6 * per_member].reshape(-1, per_member, 6, 3))
+    np.subtract(p0, vectors, out=per_frame[:, -2])
+    np.subtract(p1, vectors, out=per_frame[:, -1])
+    return out
+
+
+def load_arrows(node_pos, forces, p0, p1, w, length):
+    """
+    (vértices (V,3), colores (V,4)) float32 de las cargas de un patrón:
+    fuerzas nodales (K,3) en node_pos y cargas uniformes w (M,3) sobre los
+    frames p0 -> p1. Cada grupo se escala para que su flecha mayor mida `length`.
+    """
+    forces = np.asarray(forces, dtype=np.float64).reshape(-1, 3)
+    w = np.asarray(w, dtype=np.float64).reshape(-1, 3)
+    keep = forces.any(axis=1)
+    nodal = arrow_segments(np.asarray(node_pos)[keep], forces[keep] * _scale(forces[keep], length))
+    keep = w.any(axis=1)
+    n_members = int(keep.sum())
+    per_member = ARROWS_PER_MEMBER if n_members <= MANY_MEMBERS else 1
+    pos = np.empty((len(nodal) + member_segment_count(n_members, per_member), 3), dtype=np.float32)
+    pos[:len(nodal)] = nodal
+    member_load_segments(np.asarray(p0)[keep], np.asarray(p1)[keep], w[keep],
+                         _scale(w[keep], length), per_member, out=pos[len(nodal):])
+    colors = np.empty((len(pos), 4), dtype=np.float32)
+    colors[:len(nodal)] = NODAL_LOAD_COLOR
+    colors[len(nodal):] = MEMBER_LOAD_COLOR
+    return pos, colors
@@ -1,9 +1,9 @@
 from PyQt6.QtWidgets import QMainWindow, QDockWidget, QToolBar
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QAction
+from PyQt6.QtGui import QAction, QActionGroup
 
 # Importamos la nueva tabla MaterialTableWidget
-from .components import WorkTreeWidget, TerminalWidget, ScriptEditorWidget, CentralViewContainer, NodeTableWidget, ElementTableWidget, MaterialTableWidget
+from .components import WorkTreeWidget, TerminalWidget, ScriptEditorWidget, CentralViewContainer, NodeTableWidget, ElementTableWidget, MaterialTableWidget, SectionTableWidget, TaskStatusWidget
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -18,9 +18,49 @@ class MainWindow(QMainWindow):
         self.view_axes_action = None
         self.view_node_ids_action = None
         self.view_frame_ids_action = None
+        self.view_perf_action = None
+        self.perf_dump_action = None
+        self.perf_save_action = None
+        # Split view: número de paneles -> acción
+        self.view_layout_actions = {}
+        # Help: informe de memoria
+        self.memory_report_action = None
+        self.track_allocations_action = None
         
         # Acciones de Definición (NUEVAS)
         self.define_material_action = None
+        self.define_section_action = None
+        self.define_load_pattern_action = None
+        self.log_to_file_action = None
+        self.export_tcl_action = None
+        self.export_py_action = None
+        self.export_csv_action = None
+
+        # Acciones de Edición
+        self.merge_nodes_action = None
+        self.merge_on_insert_action = None
+        self.replicate_action = None
+        self.divide_frames_action = None
+        self.split_intersections_action = None
+
+        # Acciones de Modelo
+        self.check_model_action = None
+
+        # Acciones de Asignación y visualización de cargas
+        self.assign_frame_properties_action = None
+        self.assign_nodal_loads_action = None
+        self.assign_frame_loads_action = None
+        self.view_loads_action = None
+
+        # Acciones de Selección
+        self.select_all_action = None
+        self.select_none_action = None
+        self.select_invert_action = None
+        self.select_nodes_range_action = None
+        self.select_nodes_plane_action = None
+        self.select_frames_orientation_action = None
+        self.select_frames_length_action = None
+        self.select_frames_property_action = None
 
         self._create_menu_bar()
         self._create_toolbar()
@@ -36,6 +76,7 @@ class MainWindow(QMainWindow):
         self.node_table = NodeTableWidget()
         self.element_table = ElementTableWidget() 
         self.material_table = MaterialTableWidget() # <--- NUEVO WIDGET
+        self.section_table = SectionTableWidget()
         
         self.dock_right.setWidget(self.script_editor) 
         self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.dock_right)
@@ -47,6 +88,8 @@ class MainWindow(QMainWindow):
         self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self.dock_bottom)
         
         self.statusBar().showMessage("Ready")
+        self.task_status = TaskStatusWidget()
+        self.statusBar().addPermanentWidget(self.task_status)
 
     def set_right_panel(self, widget_name):
         if widget_name == "Geometry":
@@ -58,6 +101,9 @@ class MainWindow(QMainWindow):
         elif widget_name == "Materials": # <--- NUEVO PANEL
             self.dock_right.setWindowTitle("Materials Definition")
             self.dock_right.setWidget(self.material_table)
+        elif widget_name == "Sections":
+            self.dock_right.setWindowTitle("Sections Definition")
+            self.dock_right.setWidget(self.section_table)
         else:
             self.dock_right.setWindowTitle("Script Editor")
             self.dock_right.setWidget(self.script_editor)
@@ -67,14 +113,76 @@ class MainWindow(QMainWindow):
         
         # File
         file_menu = menu_bar.addMenu("File")
+        self.log_to_file_action = QAction("Log to File...", self)
+        self.log_to_file_action.setCheckable(True)
+        file_menu.addAction(self.log_to_file_action)
+        export_menu = file_menu.addMenu("Export")
+        self.export_tcl_action = QAction("OpenSees Tcl...", self)
+        export_menu.addAction(self.export_tcl_action)
+        self.export_py_action = QAction("OpenSees Python...", self)
+        export_menu.addAction(self.export_py_action)
+        self.export_csv_action = QAction("CSV...", self)
+        export_menu.addAction(self.export_csv_action)
+        file_menu.addSeparator()
         file_menu.addAction("Exit", self.close)
 
+        # Edit
+        edit_menu = menu_bar.addMenu("Edit")
+        self.replicate_action = QAction("Replicate...", self)
+        self.replicate_action.setShortcut("Ctrl+R")
+        edit_menu.addAction(self.replicate_action)
+        self.divide_frames_action = QAction("Divide Frames...", self)
+        edit_menu.addAction(self.divide_frames_action)
+        self.split_intersections_action = QAction("Split Frames at Intersections...", self)
+        edit_menu.addAction(self.split_intersections_action)
+        edit_menu.addSeparator()
+        self.merge_nodes_action = QAction("Merge Coincident Nodes...", self)
+        edit_menu.addAction(self.merge_nodes_action)
+        self.merge_on_insert_action = QAction("Merge Nodes on Insert", self)
+        self.merge_on_insert_action.setCheckable(True)
+        edit_menu.addAction(self.merge_on_insert_action)
+
+        # Select (consultas vectorizadas sobre el modelo)
+        select_menu = menu_bar.addMenu("Select")
+        self.select_all_action = QAction("All", self)
+        self.select_all_action.setShortcut("Ctrl+A")
+        select_menu.addAction(self.select_all_action)
+        self.select_none_action = QAction("None", self)
+        self.select_none_action.setShortcut("Ctrl+Shift+A")
+        select_menu.addAction(self.select_none_action)
+        self.select_invert_action = QAction("Invert", self)
+        self.select_invert_action.setShortcut("Ctrl+I")
+        select_menu.addAction(self.select_invert_action)
+        select_menu.addSeparator()
+        self.select_nodes_range_action = QAction("Nodes in Coordinate Range...", self)
+        select_menu.addAction(self.select_nodes_range_action)
+        self.select_nodes_plane_action = QAction("Nodes on Plane...", self)
+        select_menu.addAction(self.select_nodes_plane_action)
+        self.select_frames_orientation_action = QAction("Frames by Orientation...", self)
+        select_menu.addAction(self.select_frames_orientation_action)
+        self.select_frames_length_action = QAction("Frames by Length...", self)
+        select_menu.addAction(self.select_frames_length_action)
+        self.select_frames_property_action = QAction("Frames by Material / Section...", self)
+        select_menu.addAction(self.select_frames_property_action)
+
         # View
         view_menu = menu_bar.addMenu("View")
         self.view_axes_action = QAction("Show Axes / Grid", self)
         self.view_axes_action.setCheckable(True)
         self.view_axes_action.setChecked(True) 
         view_menu.addAction(self.view_axes_action)
+        self.zoom_extents_action = QAction("Zoom Extents", self)
+        self.zoom_extents_action.setShortcut("F")
+        view_menu.addAction(self.zoom_extents_action)
+        layout_menu = view_menu.addMenu("Layout")
+        layout_group = QActionGroup(self)
+        for count, label in [(1, "Single View"), (2, "Two Views"), (4, "Four Views")]:
+            action = QAction(label, self)
+            action.setCheckable(True)
+            action.setChecked(count == 1)
+            layout_group.addAction(action)
+            layout_menu.addAction(action)
+            self.view_layout_actions[count] = action
         view_menu.addSeparator()
         self.view_node_ids_action = QAction("Show Node IDs", self)
         self.view_node_ids_action.setCheckable(True)
@@ -82,6 +190,23 @@ class MainWindow(QMainWindow):
         self.view_frame_ids_action = QAction("Show Frame IDs", self)
         self.view_frame_ids_action.setCheckable(True)
         view_menu.addAction(self.view_frame_ids_action)
+        view_menu.addSeparator()
+        self.view_perf_action = QAction("Performance", self)
+        self.view_perf_action.setCheckable(True)
+        view_menu.addAction(self.view_perf_action)
+        self.perf_dump_action = QAction("Dump Performance Stats to Terminal", self)
+        view_menu.addAction(self.perf_dump_action)
+        self.perf_save_action = QAction("Save Performance Stats...", self)
+        view_menu.addAction(self.perf_save_action)
+        view_menu.addSeparator()
+        self.view_loads_action = QAction("Show Loads...", self)
+        view_menu.addAction(self.view_loads_action)
+
+        # Model
+        model_menu = menu_bar.addMenu("Model")
+        self.check_model_action = QAction("Check Model", self)
+        self.check_model_action.setShortcut("Ctrl+K")
+        model_menu.addAction(self.check_model_action)
 
         # --- NUEVO MENÚ "DEFINE" ---
         define_menu = menu_bar.addMenu("Define")
@@ -91,9 +216,33 @@ class MainWindow(QMainWindow):
         self.define_material_action = QAction("Add New Material...", self)
         materials_menu.addAction(self.define_material_action)
         
-        # Submenú Sections (Placeholder por ahora)
+        # Submenú Sections
         sections_menu = define_menu.addMenu("Sections")
-        sections_menu.addAction("Add New Section... (Coming Soon)")
+        self.define_section_action = QAction("Add New Section...", self)
+        sections_menu.addAction(self.define_section_action)
+
+        # Submenú Load Patterns
+        loads_menu = define_menu.addMenu("Load Patterns")
+        self.define_load_pattern_action = QAction("Add New Load Pattern...", self)
+        loads_menu.addAction(self.define_load_pattern_action)
+
+        # Assign: cargas sobre la selección actual
+        assign_menu = menu_bar.addMenu("Assign")
+        self.assign_frame_properties_action = QAction("Frame Material / Section...", self)
+        assign_menu.addAction(self.assign_frame_properties_action)
+        assign_menu.addSeparator()
+        self.assign_nodal_loads_action = QAction("Joint Loads...", self)
+        assign_menu.addAction(self.assign_nodal_loads_action)
+        self.assign_frame_loads_action = QAction("Frame Distributed Loads...", self)
+        assign_menu.addAction(self.assign_frame_loads_action)
+
+        # Help: diagnóstico de memoria (informe en el terminal)
+        help_menu = menu_bar.addMenu("Help")
+        self.memory_report_action = QAction("Memory Report", self)
+        help_menu.addAction(self.memory_report_action)
+        self.track_allocations_action = QAction("Track Allocations", self)
+        self.track_allocations_action.setCheckable(True)
+        help_menu.addAction(self.track_allocations_action)
 
     def _create_toolbar(self):
         toolbar = QToolBar("Main Toolbar")
@@ -0,0 +1,192 @@
+"""
+Picking en espacio de pantalla (solo numpy, sin Qt).
+
+La proyección de todos los nodos se calcula una vez por cámara/escena y se
+indexa en una rejilla hash 2D de celdas de `cell` píxeles. Las consultas
+(hover, click) solo examinan las celdas vecinas al cursor.
+"""
+import numpy as np
+
+# Desplazamiento para empaquetar (cx, cy) en una sola clave int64
+_KEY_OFFSET = 1 << 20
+_KEY_MULT = 1 << 21
+
+
+def qmatrix_to_numpy(m):
+    """QMatrix4x4 -> ndarray 4x4 (fila-mayor). QMatrix4x4.data() es columna-mayor."""
+    return np.array(m.data(), dtype=np.float64).reshape(4, 4).T
+
+
+def project_points(points, mvp, width, height):
+    """
+    Proyecta puntos (N,3) a píxeles de widget.
+    Devuelve (screen (N,2), depth_ndc (N,), visible (N,) bool).
+    """
+    n = len(points)
+    if n == 0:
+        return np.zeros((0, 2)), np.zeros(0), np.zeros(0, dtype=bool)
+    clip = points @ mvp[:3, :3].T + mvp[:3, 3]
+    w = points @ mvp[3, :3] + mvp[3, 3]
+    in_front = w > 1e-9
+    safe_w = np.where(in_front, w, 1.0)
+    ndc = clip / safe_w[:, None]
+    screen = np.empty((n, 2))
+    screen[:, 0] = (ndc[:, 0] + 1.0) * width / 2.0
+    screen[:, 1] = (1.0 - ndc[:, 1]) * height / 2.0
+    visible = in_front & (ndc[:, 2] < 1.0)
+    return screen, ndc[:, 2], visible
+
+
+def unproject_ray(x, y, mvp, width, height):
+    """Rayo (origen, dirección) en coordenadas de mundo bajo el píxel (x, y)."""
+    inv = np.linalg.inv(mvp)
+    nx = 2.0 * x / width - 1.0
+    ny = 1.0 - 2.0 * y / height
+    near = inv @ np.array([nx, ny, -1.0, 1.0])
+    far = inv @ np.array([nx, ny, 1.0, 1.0])
+    near = near[:3] / near[3]
+    far = far[:3] / far[3]
+    direction = far - near
+    return near, direction / (np.linalg.norm(direction) or 1.0)
+
+
+def intersect_plane_z(origin, direction, z=0.0):
+    """Punto donde el rayo corta el plano Z = z (None si es paralelo o queda detrás)."""
+    if abs(direction[2]) < 1e-12:
+        return None
+    t = (z - origin[2]) / direction[2]
+    if t < 0:
+        return None
+    return origin + t * direction
+
+
+def rows_for_ids(ids, query):
+    """
+    Fila de cada id de `query` dentro de `ids` (no necesariamente ordenado).
+    Devuelve (rows, found) con rows = -1 donde el id no existe.
+    """
+    query = np.asarray(query, dtype=np.int64)
+    if len(ids) == 0:
+        return np.full(query.shape, -1, dtype=np.int64), np.zeros(query.shape, dtype=bool)
+    order = np.argsort(ids, kind="stable")
+    sorted_ids = ids[order]
+    pos = np.clip(np.searchsorted(sorted_ids, query), 0, len(ids) - 1)
+    found = sorted_ids[pos] == query
+    rows = np.where(found, order[pos], -1)
+    return rows, found
+
+
+def dist_sq_point_to_segments_2d(px, py, a, b):
+    """Distancia² de un punto a muchos segmentos 2D (a, b: (M,2))."""
+    d = b - a
+    l2 = np.einsum("ij,ij->i", d, d)
+    t = ((px - a[:, 0]) * d[:, 0] + (py - a[:, 1]) * d[:, 1]) / np.where(l2 > 0, l2, 1.0)
+    t = np.clip(np.where(l2 > 0, t, 0.0), 0.0, 1.0)
+    proj = a + t[:, None] * d
+    return (px - proj[:, 0]) ** 2 + (py - proj[:, 1]) ** 2
+
+
+class _CellHash:
+    """Buckets (clave de celda -> filas) sobre arrays ordenados."""
+
+    def __init__(self, keys, rows):
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.rows = rows[order]
+
+    def query(self, keys):
+        if len(self.keys) == 0:
+            return np.zeros(0, dtype=np.int64)
+        lo = np.searchsorted(self.keys, keys, side="left")
+        hi = np.searchsorted(self.keys, keys, side="right")
+        if not np.any(hi > lo):
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate([self.rows[l:h] for l, h in zip(lo, hi) if h > l])
+
+
+class ScreenSpaceIndex:
+    # Segmentos que cruzan más celdas que esto se prueban por fuerza bruta
+    MAX_CELLS_PER_SEGMENT = 256
+
+    def __init__(self, cell=16.0):
+        self.cell = float(cell)
+        self.node_screen = np.zeros((0, 2))
+        self.node_visible = np.zeros(0, dtype=bool)
+        self.seg_rows = np.zeros((0, 2), dtype=np.int64)
+        self._node_hash = _CellHash(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+        self._seg_hash = _CellHash(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+        self._long_segments = np.zeros(0, dtype=np.int64)
+
+    def _cell_keys(self, xy):
+        c = np.floor(xy / self.cell).astype(np.int64)
+        return (c[:, 0] + _KEY_OFFSET) * _KEY_MULT + (c[:, 1] + _KEY_OFFSET)
+
+    def build(self, node_screen, node_visible, seg_rows):
+        """
+        node_screen/node_visible: salida de project_points.
+        seg_rows: (E,2) filas de nodos de cada segmento.
+        """
+        self.node_screen = node_screen
+        self.node_visible = node_visible
+        self.seg_rows = seg_rows
+
+        vis_rows = np.flatnonzero(node_visible)
+        self._node_hash = _CellHash(self._cell_keys(node_screen[vis_rows]), vis_rows)
+
+        # Segmentos: muestreamos cada uno cada media celda y registramos las celdas que toca
+        if len(seg_rows):
+            seg_ok = node_visible[seg_rows[:, 0]] & node_visible[seg_rows[:, 1]]
+            seg_idx = np.flatnonzero(seg_ok)
+        else:
+            seg_idx = np.zeros(0, dtype=np.int64)
+        a = node_screen[seg_rows[seg_idx, 0]] if len(seg_idx) else np.zeros((0, 2))
+        b = node_screen[seg_rows[seg_idx, 1]] if len(seg_idx) else np.zeros((0, 2))
+        length = np.linalg.norm(b - a, axis=1)
+        n_samples = np.ceil(length / (self.cell * 0.5)).astype(np.int64) + 1
+
+        is_long = n_samples > 2 * self.MAX_CELLS_PER_SEGMENT
+        self._long_segments = seg_idx[is_long]
+        short = ~is_long
+        seg_idx, a, b, n_samples = seg_idx[short], a[short], b[short], n_samples[short]
+
+        rep = np.repeat(np.arange(len(seg_idx)), n_samples)
+        if len(rep):
+            starts = np.cumsum(n_samples) - n_samples
+            k = np.arange(len(rep)) - np.repeat(starts, n_samples)
+            t = k / np.maximum(n_samples[rep] - 1, 1)
+            pts = a[rep] + t[:, None] * (b[rep] - a[rep])
+            keys = self._cell_keys(pts)
+            pairs = np.unique(np.column_stack([keys, seg_idx[rep]]), axis=0)
+            self._seg_hash = _CellHash(pairs[:, 0], pairs[:, 1])
+        else:
+            self._seg_hash = _CellHash(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+
+    def _neighbor_keys(self, x, y, radius):
+        r = int(np.ceil(radius / self.cell))
+        cx, cy = int(np.floor(x / self.cell)), int(np.floor(y / self.cell))
+        dx, dy = np.meshgrid(np.arange(-r, r + 1), np.arange(-r, r + 1), indexing="ij")
+        return (cx + dx.ravel() + _KEY_OFFSET) * _KEY_MULT + (cy + dy.ravel() + _KEY_OFFSET)
+
+    def nearest_node(self, x, y, radius):
+        """Fila del nodo visible más cercano a (x, y) dentro de `radius` px, o -1."""
+        cand = self._node_hash.query(self._neighbor_keys(x, y, radius))
+        if len(cand) == 0:
+            return -1
+        p = self.node_screen[cand]
+        d2 = (p[:, 0] - x) ** 2 + (p[:, 1] - y) ** 2
+        i = int(np.argmin(d2))
+        return int(cand[i]) if d2[i] < radius * radius else -1
+
+    def nearest_segment(self, x, y, radius):
+        """Fila del segmento más cercano a (x, y) dentro de `radius` px, o -1."""
+        # Las muestras distan como mucho cell/4 del punto más cercano del segmento
+        cand = self._seg_hash.query(self._neighbor_keys(x, y, radius + self.cell * 0.25))
+        if len(self._long_segments):
+            cand = np.concatenate([cand, self._long_segments])
+        if len(cand) == 0:
+            return -1
+        cand = np.unique(cand)
+        rows = self.seg_rows[cand]
+        d2 = dist_sq_point_to_segments_2d(x, y, self.node_screen[rows[:, 0]], self.node_screen[rows[:, 1]])
+        i = int(np.argmin(d2))
+        return int(cand[i]) if d2[i] < radius * radius else -1
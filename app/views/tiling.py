@@ -0,0 +1,124 @@
+"""
+Partición espacial de la escena en tiles para el dibujado (solo numpy, sin Qt ni GL).
+
+Una rejilla uniforme sobre la caja del modelo asigna cada punto (nodo o
+punto medio de frame) a un tile. Cada tile guarda su caja envolvente, para
+descartarlo contra el frustum de la cámara, y una firma de su contenido:
+tras una edición solo se vuelven a subir a la GPU los tiles cuya firma cambió.
+
+    grid = TileGrid.fit(lo, hi, len(points))
+    keys, order, starts = group_rows(grid.keys(points))
+    visible = boxes_in_frustum(frustum_planes(mvp), tile_lo, tile_hi)
+"""
+import numpy as np
+
+# Elementos por tile: bastantes para amortizar la llamada de dibujo, pocos para que el culling descarte
+TARGET_PER_TILE = 32768
+# Margen al ajustar la rejilla: el modelo puede crecer algo sin reparticionar todo
+_PAD = 0.1
+
+_M1 = np.uint64(0xBF58476D1CE4E5B9)
+_M2 = np.uint64(0x94D049BB133111EB)
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+
+class TileGrid:
+    def __init__(self, origin, cell, dims):
+        self.origin = np.asarray(origin, dtype=np.float64)
+        self.cell = float(cell)
+        self.dims = np.asarray(dims, dtype=np.int64)
+
+    @classmethod
+    def fit(cls, lo, hi, n_items, per_tile=TARGET_PER_TILE):
+        """Rejilla de celdas cúbicas sobre [lo, hi] (con margen) para ~per_tile elementos por celda."""
+        lo = np.asarray(lo, dtype=np.float64)
+        hi = np.asarray(hi, dtype=np.float64)
+        pad = max(float((hi - lo).max()) * _PAD, 1.0)
+        lo, hi = lo - pad, hi + pad
+        extent = hi - lo
+        n_tiles = max(1, -(-int(n_items) // per_tile))
+        cell = (float(np.prod(extent)) / n_tiles) ** (1.0 / 3.0)
+        dims = np.maximum(np.ceil(extent / cell), 1).astype(np.int64)
+        return cls(lo, cell, dims)
+
+    def covers(self, lo, hi):
+        return bool(np.all(np.asarray(lo) >= self.origin) and
+                    np.all(np.asarray(hi) <= self.origin + self.cell * self.dims))
+
+    def keys(self, points):
+        """Clave entera del tile de cada punto (N,3); los de fuera van al tile del borde."""
+        scaled = np.asarray(points, dtype=np.float64) - self.origin
+        scaled /= self.cell
+        idx = np.floor(scaled, out=scaled).astype(np.int64)
+        np.clip(idx, 0, self.dims - 1, out=idx)
+        return (idx[:, 0] * self.dims[1] + idx[:, 1]) * self.dims[2] + idx[:, 2]
+
+
+def group_rows(keys):
+    """
+    (claves únicas, filas agrupadas por clave, inicio de cada grupo en esas filas).
+    Dentro de cada grupo las filas conservan su orden original.
+    """
+    keys = np.asarray(keys, dtype=np.int64)
+    order = np.argsort(keys, kind="stable")
+    if not len(order):
+        return keys[:0], order, order[:0]
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    return sorted_keys[starts], order, starts
+
+
+def mix64(x):
+    """Mezcla splitmix64 (uint64 -> uint64) para firmas de contenido."""
+    x = np.asarray(x, dtype=np.uint64)
+    x = x ^ (x >> np.uint64(30))
+    x = x * _M1
+    x = x ^ (x >> np.uint64(27))
+    x = x * _M2
+    return x ^ (x >> np.uint64(31))
+
+
+def point_hashes(points32):
+    """Hash de cada punto (N,3) float32 a partir de sus bits exactos."""
+    bits = np.ascontiguousarray(points32, dtype=np.float32).view(np.uint32).astype(np.uint64)
+    return mix64(bits[:, 0] | (bits[:, 1] << np.uint64(32))) ^ mix64(bits[:, 2] + _GOLDEN)
+
+
+def group_signatures(hashes, starts):
+    """
+    Firma por grupo de hashes ya agrupados (ver group_rows): depende del
+    contenido y del orden dentro del grupo, así que firma igual => buffers iguales.
+    """
+    n = len(hashes)
+    if not len(starts):
+        return np.zeros(0, dtype=np.uint64)
+    counts = np.diff(np.r_[starts, n])
+    rank = np.arange(n, dtype=np.uint64) - np.repeat(starts, counts).astype(np.uint64)
+    return np.bitwise_xor.reduceat(mix64(hashes ^ mix64(rank + _GOLDEN)), starts)
+
+
+def group_extents(lo, hi, starts):
+    """Caja (min, max) por grupo de cajas (N,3) ya agrupadas."""
+    return np.minimum.reduceat(lo, starts, axis=0), np.maximum.reduceat(hi, starts, axis=0)
+
+
+def frustum_planes(mvp):
+    """
+    Los 6 planos (a,b,c,d) del frustum de una matriz MVP fila-mayor (ver
+    picking.qmatrix_to_numpy): un punto está dentro si a*x+b*y+c*z+d >= 0 en los 6.
+    """
+    m = np.asarray(mvp, dtype=np.float64)
+    return np.array([m[3] + m[0], m[3] - m[0], m[3] + m[1], m[3] - m[1], m[3] + m[2], m[3] - m[2]])
+
+
+def boxes_in_frustum(planes, lo, hi):
+    """
+    Máscara de las cajas (T,3) que pueden verse: una caja se descarta si su
+    vértice más favorable queda detrás de algún plano (conservador).
+    """
+    lo = np.asarray(lo, dtype=np.float64).reshape(-1, 3)
+    hi = np.asarray(hi, dtype=np.float64).reshape(-1, 3)
+    normals = planes[:, :3]
+    corner = np.where(normals[None, :, :] >= 0, hi[:, None, :], lo[:, None, :])
+    dist = np.einsum("tpk,pk->tp", corner, normals) + planes[:, 3]
+    return (dist >= 0).all(axis=1)
@@ -0,0 +1,147 @@
+"""
+Benchmark de los caminos calientes de la GUI con Qt/GL en plataforma
+`offscreen`: Viewport3DWidget (update_scene_data, tiles reconstruidos tras
+una edición local, picking, box selection, etiquetas, split view de 4
+paneles) y tablas (update_data / select_rows_by_ids).
+
+    python benchmarks/bench_gui.py --sizes 1k,10k,100k -o gui.json
+"""
+import argparse
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PyQt6.QtCore import Qt, QPoint
+from PyQt6.QtGui import QVector3D
+from PyQt6.QtWidgets import QApplication
+
+from common import add_common_args, finish, time_call
+from synthetic import as_tuples, frame_grid, parse_sizes, size_label
+from app.views.viewport import Viewport3DWidget
+from app.views.components import NodeTableWidget, ElementTableWidget
+
+DEFAULT_SIZES = "1k,10k,100k,1M"
+VIEW_W, VIEW_H = 1280, 720
+
+
+def _fit_camera(vp, coords):
+    lo, hi = coords.min(axis=0), coords.max(axis=0)
+    center = (lo + hi) / 2.0
+    diag = float(np.linalg.norm(hi - lo)) or 10.0
+    vp.setCameraPosition(pos=QVector3D(*center.tolist()), distance=diag * 1.5, elevation=30, azimuth=45)
+
+
+def bench_viewport(nodes, elements, coords, label_limit, repeat):
+    row = {}
+    vp = Viewport3DWidget()
+    vp.resize(VIEW_W, VIEW_H)
+    _fit_camera(vp, coords)
+
+    row["update_scene_data"], _ = time_call(vp.update_scene_data, nodes, elements, repeat=repeat)
+
+    # Edición local: mover un nodo solo reconstruye los tiles que lo contienen
+    moved = list(nodes)
+    nid, x, y, z = moved[len(moved) // 2]
+    moved[len(moved) // 2] = (nid, x + 0.1, y, z)
+    row["update_scene_one_node_moved"], _ = time_call(vp.update_scene_data, moved, elements)
+    row["tiles"] = len(vp.frames_item.tiles) + len(vp.scatter.tiles)
+    row["tiles_rebuilt_one_node_moved"] = vp.frames_item.tiles_rebuilt + vp.scatter.tiles_rebuilt
+
+    # Primer pick tras cambiar la escena: incluye proyección + índice de pantalla
+    row["get_clicked_item_cold"], _ = time_call(vp._get_clicked_item, VIEW_W / 2, VIEW_H / 2)
+    row["get_clicked_item"], _ = time_call(vp._get_clicked_item, VIEW_W / 2, VIEW_H / 2, repeat=repeat)
+
+    vp.box_start = QPoint(VIEW_W // 3, VIEW_H // 3)
+    vp.box_end = QPoint(2 * VIEW_W // 3, 2 * VIEW_H // 3)
+    row["box_selection"], _ = time_call(vp._perform_box_selection, Qt.KeyboardModifier.NoModifier, repeat=repeat)
+    row["box_selected_nodes"] = len(vp.selected_node_ids)
+
+    # Cambio de selección sin cambio de geometría (colores + índice resaltado)
+    half_nodes = set(range(1, len(nodes) // 2 + 1))
+    half_frames = set(range(1, len(elements) // 2 + 1))
+    row["set_selection"], _ = time_call(vp.set_selection, half_nodes, half_frames, repeat=repeat)
+    row["invert_selection"], _ = time_call(vp.invert_selection, repeat=repeat)
+
+    if len(nodes) <= label_limit:
+        vp.node_ids_visible = True
+        vp.frame_ids_visible = True
+        row["refresh_node_labels"], _ = time_call(vp._refresh_node_labels)
+        row["refresh_frame_labels"], _ = time_call(vp._refresh_frame_labels)
+        vp.node_ids_visible = False
+        vp.frame_ids_visible = False
+        vp._refresh_node_labels()
+        vp._refresh_frame_labels()
+    else:
+        row["refresh_node_labels"] = None
+        row["refresh_frame_labels"] = None
+
+    # Split view: 3 paneles más sobre la misma escena; la actualización se calcula una vez
+    panes = [Viewport3DWidget(shared=vp) for _ in range(3)]
+    for pane in panes:
+        pane.resize(VIEW_W // 2, VIEW_H // 2)
+    row["update_scene_data_4_panes"], _ = time_call(vp.update_scene_data, nodes, elements, repeat=repeat)
+    row["set_selection_4_panes"], _ = time_call(vp.set_selection, half_nodes, half_frames, repeat=repeat)
+    for pane in panes:
+        pane.detach()
+        pane.deleteLater()
+
+    vp.deleteLater()
+    return row
+
+
+def bench_tables(nodes, elements, table_limit, select_fraction, rng):
+    row = {}
+    if len(nodes) > table_limit:
+        return {k: None for k in ("node_table_update", "node_table_select",
+                                  "element_table_update", "element_table_select")}
+    k = max(1, int(len(nodes) * select_fraction))
+    node_sel = set((rng.choice(len(nodes), size=k, replace=False) + 1).tolist())
+    elem_sel = set((rng.choice(len(elements), size=min(k, len(elements)), replace=False) + 1).tolist())
+
+    node_table = NodeTableWidget()
+    row["node_table_update"], _ = time_call(node_table.update_data, nodes)
+    row["node_table_select"], _ = time_call(node_table.select_rows_by_ids, node_sel)
+    node_table.deleteLater()
+
+    element_table = ElementTableWidget()
+    row["element_table_update"], _ = time_call(element_table.update_data, elements)
+    row["element_table_select"], _ = time_call(element_table.select_rows_by_ids, elem_sel)
+    element_table.deleteLater()
+    return row
+
+
+def run(sizes, label_limit=10_000, table_limit=100_000, select_fraction=0.01, repeat=3):
+    app = QApplication.instance() or QApplication(sys.argv)
+    rng = np.random.default_rng(0)
+    results = {}
+    for n in sizes:
+        coords, conn = frame_grid(n)
+        nodes, elements = as_tuples(coords, conn)
+        reps = repeat if n <= 10_000 else 1
+        row = bench_viewport(nodes, elements, coords, label_limit, reps)
+        row.update(bench_tables(nodes, elements, table_limit, select_fraction, rng))
+        app.processEvents()
+        results[size_label(n)] = row
+        print(f"gui {size_label(n):>5}: " + "  ".join(
+            f"{k}={'skip' if v is None else (v if isinstance(v, int) else f'{v * 1000:.1f}ms')}"
+            for k, v in row.items()), file=sys.stderr)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_common_args(parser)
+    parser.add_argument("--sizes", default=DEFAULT_SIZES)
+    parser.add_argument("--label-limit", type=int, default=10_000,
+                        help="Largest size for ID label refresh")
+    parser.add_argument("--table-limit", type=int, default=100_000,
+                        help="Largest size for table benchmarks (one QTableWidgetItem per cell today)")
+    args = parser.parse_args()
+    results = run(parse_sizes(args.sizes), label_limit=args.label_limit, table_limit=args.table_limit)
+    return finish(args, "gui", results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Memoria por subsistema (app/memory.py) sobre los modelos sintéticos, en
+bytes por nodo, con presupuestos: la salida es 1 si alguno se supera.
+
+    python benchmarks/bench_memory.py --sizes 10k,100k,1M -o memory.json
+    python benchmarks/bench_memory.py --gui --sizes 10k,100k    # + escena y tablas (offscreen)
+
+Sin --gui solo se mide el modelo (arrays y cachés); con --gui también los
+buffers de render del viewport y las tablas (estimadas, ver TABLE_CELL_BYTES).
+Los resultados son enteros (bytes), así que --baseline no los compara como
+tiempos: el control de regresión son los presupuestos.
+"""
+import argparse
+import os
+import sys
+
+from common import add_common_args, finish, time_call
+from synthetic import build_model, frame_grid, parse_sizes, size_label
+from app.memory import SUBSYSTEMS, AllocationTracker, MemoryReport
+
+DEFAULT_SIZES = "10k,100k,1M"
+# Presupuestos por defecto (bytes/nodo) con margen sobre lo medido en la malla sintética
+MAX_MODEL_BYTES_PER_NODE = 256
+MAX_TOTAL_BYTES_PER_NODE = 2048
+
+
+def _qt_application():
+    """QApplication offscreen (solo con --gui: sin él la suite no importa Qt)."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication(sys.argv)
+
+
+def _gui_owners(model):
+    """Viewport + tablas con los datos del modelo."""
+    from app.views.viewport import Viewport3DWidget
+    from app.views.components import NodeTableWidget, ElementTableWidget
+
+    vp = Viewport3DWidget()
+    vp.update_scene_data(model.nodes, model.elements)
+    node_table, element_table = NodeTableWidget(), ElementTableWidget()
+    node_table.update_data(model.nodes)
+    element_table.update_data(model.elements)
+    # La escena retiene su viewport (scene.views)
+    return [vp.scene, node_table, element_table]
+
+
+def run(sizes, gui=False, table_limit=100_000, trace_limit=100_000):
+    """
+    {size: {subsistema: bytes/nodo, ...}}. Hasta trace_limit, además los
+    bytes que tracemalloc ve reservar al construir el modelo (build_traced) y
+    su pico; las líneas que más reservan van a stderr (los snapshots de
+    tracemalloc con millones de bloques tardan minutos, por eso el límite).
+    """
+    results = {}
+    app = _qt_application() if gui else None
+    for n in sizes:
+        coords, conn = frame_grid(n)
+        row = {}
+        tracker = AllocationTracker()
+        trace = n <= trace_limit
+        if trace:
+            tracker.start()
+        with tracker.track("build"):
+            row["build_s"], model = time_call(build_model, coords, conn)
+            model.nodes, model.elements  # listas de tuplas que piden tablas y viewport
+        if trace:
+            row["build_traced_bytes"], row["build_traced_peak_bytes"] = tracker.traced()
+            tracker.stop()
+            print(f"{size_label(n)} build: top allocations", file=sys.stderr)
+            print(tracker.format_diff(tracker.diffs["build"][:5]), file=sys.stderr)
+
+        owners = [model]
+        if gui and n <= table_limit:
+            owners += _gui_owners(model)
+        report = MemoryReport.collect(*owners)
+        n_nodes = len(model.node_ids)
+        for name in SUBSYSTEMS:
+            row[f"{name.replace(' ', '_')}_per_node"] = int(report.bytes_per_node(n_nodes, name))
+        row["total_per_node"] = int(report.bytes_per_node(n_nodes))
+        row["total_bytes"] = report.total
+        results[size_label(n)] = row
+    return results
+
+
+def check_budgets(results, max_model, max_total):
+    """[(tamaño, métrica, valor, presupuesto)] de los presupuestos superados."""
+    failures = []
+    for size, row in results.items():
+        if row["model_arrays_per_node"] > max_model:
+            failures.append((size, "model_arrays_per_node", row["model_arrays_per_node"], max_model))
+        if row["total_per_node"] > max_total:
+            failures.append((size, "total_per_node", row["total_per_node"], max_total))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_common_args(parser)
+    parser.add_argument("--sizes", default=DEFAULT_SIZES)
+    parser.add_argument("--gui", action="store_true", help="Also measure the viewport scene and tables")
+    parser.add_argument("--table-limit", type=int, default=100_000,
+                        help="Largest size for --gui (one QTableWidgetItem per cell today)")
+    parser.add_argument("--trace-limit", type=int, default=100_000,
+                        help="Largest size traced with tracemalloc (0 = none)")
+    parser.add_argument("--max-model-bytes-per-node", type=int, default=MAX_MODEL_BYTES_PER_NODE)
+    parser.add_argument("--max-total-bytes-per-node", type=int, default=MAX_TOTAL_BYTES_PER_NODE)
+    args = parser.parse_args()
+    results = run(parse_sizes(args.sizes), gui=args.gui, table_limit=args.table_limit,
+                  trace_limit=args.trace_limit)
+    code = finish(args, "memory", results)
+    failures = check_budgets(results, args.max_model_bytes_per_node, args.max_total_bytes_per_node)
+    for size, metric, value, budget in failures:
+        print(f"{size:>6s} {metric}: {value} B/node over budget {budget}", file=sys.stderr)
+    return 1 if failures else code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
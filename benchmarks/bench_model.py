@@ -0,0 +1,115 @@
+"""
+Benchmark de DocumentModel (sin Qt): inserción, borrado, bounds y cargas.
+
+    python benchmarks/bench_model.py --sizes 1k,10k,100k,1M -o model.json
+"""
+import argparse
+import sys
+
+import numpy as np
+
+from common import add_common_args, finish, time_call
+from synthetic import build_model, frame_grid, parse_sizes, size_label, with_duplicates
+from app.models.document_model import DocumentModel
+
+DEFAULT_SIZES = "1k,10k,100k,1M"
+
+
+def _add_nodes(coords):
+    model = DocumentModel()
+    for x, y, z in coords.tolist():
+        model.add_node(x, y, z)
+    return model
+
+
+def _add_elements(model, conn):
+    for a, b in conn.tolist():
+        model.add_element(a, b)
+    return model
+
+
+def _delete_nodes(model, ids):
+    for nid in ids:
+        model.delete_node(nid)
+
+
+def _delete_elements(model, ids):
+    for eid in ids:
+        model.delete_element(eid)
+
+
+def run(sizes, quadratic_limit=10_000, delete_fraction=0.01, repeat=3):
+    """
+    Devuelve {size: {op: segundos | None}}. Las operaciones uno a uno que son
+    O(n²) en total (chequeo de duplicados, borrados) se omiten (None) por
+    encima de `quadratic_limit`; las variantes *_bulk se miden siempre.
+    """
+    results = {}
+    rng = np.random.default_rng(0)
+    for n in sizes:
+        coords, conn = frame_grid(n)
+        reps = repeat if n <= 10_000 else 1
+        row = {}
+
+        row["add_nodes"], _ = time_call(_add_nodes, coords, repeat=reps)
+        row["add_nodes_bulk"], _ = time_call(lambda: DocumentModel().add_nodes(coords), repeat=reps)
+
+        if n <= quadratic_limit:
+            row["add_elements"], _ = time_call(lambda: _add_elements(build_model(coords, conn[:0]), conn), repeat=reps)
+        else:
+            row["add_elements"] = None
+
+        row["add_elements_bulk"], _ = time_call(lambda: build_model(coords, conn[:0]).add_elements(conn), repeat=reps)
+
+        model = build_model(coords, conn)
+        row["get_nodes_data"], _ = time_call(model.get_nodes_data, repeat=reps)
+        row["get_model_bounds"], _ = time_call(model.get_model_bounds, repeat=reps)
+
+        k = max(1, int(n * delete_fraction))
+        node_ids = (rng.choice(len(coords), size=k, replace=False) + 1).tolist()
+        elem_ids = (rng.choice(len(conn), size=min(k, len(conn)), replace=False) + 1).tolist()
+        fresh = build_model(coords, conn)
+        row["delete_elements_bulk"], _ = time_call(fresh.delete_elements, elem_ids)
+        fresh = build_model(coords, conn)
+        row["delete_nodes_bulk"], _ = time_call(fresh.delete_nodes, node_ids)
+
+        # Cargas: un patrón con peso propio + carga uniforme en todos los frames
+        loaded = build_model(coords, conn)
+        material = loaded.add_material("Concrete", 30000.0, 0.2, 25.0)
+        section = loaded.add_section("rectangle", "R30x50", b=0.3, h=0.5)
+        row["assign_frame_properties"], _ = time_call(loaded.assign_frame_properties, loaded.element_ids,
+                                                      material, section, repeat=reps)
+        pattern = loaded.add_load_pattern("DEAD", 1.0)
+        row["set_member_loads"], _ = time_call(loaded.set_member_loads, pattern, loaded.element_ids,
+                                               [0.0, 0.0, -10.0], repeat=reps)
+        row["equivalent_nodal_loads"], _ = time_call(loaded.equivalent_nodal_loads, pattern, repeat=reps)
+
+        dup = build_model(with_duplicates(coords), conn)
+        row["merge_coincident_nodes"], _ = time_call(dup.merge_coincident_nodes, 1e-3)
+
+        if n <= quadratic_limit:
+            row["delete_elements"], _ = time_call(lambda: _delete_elements(build_model(coords, conn), elem_ids))
+            row["delete_nodes"], _ = time_call(lambda: _delete_nodes(build_model(coords, conn), node_ids))
+        else:
+            row["delete_elements"] = None
+            row["delete_nodes"] = None
+
+        results[size_label(n)] = row
+        print(f"model {size_label(n):>5}: " + "  ".join(
+            f"{k}={'skip' if v is None else f'{v * 1000:.1f}ms'}" for k, v in row.items()), file=sys.stderr)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_common_args(parser)
+    parser.add_argument("--sizes", default=DEFAULT_SIZES)
+    parser.add_argument("--quadratic-limit", type=int, default=10_000,
+                        help="Largest size for operations that are O(n^2) today")
+    args = parser.parse_args()
+    results = run(parse_sizes(args.sizes), quadratic_limit=args.quadratic_limit)
+    return finish(args, "model", results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
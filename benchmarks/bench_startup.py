@@ -0,0 +1,148 @@
+"""
+Benchmark de arranque de la GUI.
+
+  * Tiempo de import por módulo (parseando `python -X importtime`).
+  * Tiempo hasta el primer pintado de la ventana y hasta que el viewport 3D
+    está listo (Qt en plataforma `offscreen`).
+
+    python benchmarks/bench_startup.py -o startup.json
+    python benchmarks/bench_startup.py --baseline startup.json
+    python benchmarks/bench_startup.py --budget-first-paint 400 --budget-import 600
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+from common import REPO_ROOT, add_common_args, finish
+
+ENTRY_MODULE = "app.controllers.main_controller"
+
+# "import time: self [us] | cumulative | imported package"
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+# Se ejecuta en un proceso limpio. t0 se toma antes de cualquier import de la app.
+FIRST_PAINT_SCRIPT = r"""
+import time
+t0 = time.perf_counter()
+import json, sys
+from PyQt6.QtCore import QObject, QEvent, QTimer
+from app.controllers.main_controller import MainController
+t_import = time.perf_counter()
+
+controller = MainController()
+t_init = time.perf_counter()
+marks = {}
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, ev):
+        if ev.type() == QEvent.Type.Paint and "first_paint" not in marks:
+            marks["first_paint"] = time.perf_counter()
+        return False
+
+def on_viewport(_vp):
+    marks["viewport_ready"] = time.perf_counter()
+    QTimer.singleShot(0, controller.app.quit)
+
+flt = FirstPaint()
+controller.window.installEventFilter(flt)
+controller.window.central_container.installEventFilter(flt)
+controller.window.central_container.viewportCreated.connect(on_viewport)
+controller.window.show()
+QTimer.singleShot(10000, controller.app.quit)  # salvaguarda
+controller.app.exec()
+
+ms = lambda t: (t - t0) * 1000.0 if t is not None else None
+print(json.dumps({
+    "import_ms": ms(t_import),
+    "controller_init_ms": ms(t_init),
+    "first_paint_ms": ms(marks.get("first_paint")),
+    "viewport_ready_ms": ms(marks.get("viewport_ready")),
+}))
+"""
+
+
+def _env():
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env["PYTHONPATH"] = REPO_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def parse_importtime(stderr_text):
+    """Devuelve {modulo: {"self_ms", "cumulative_ms", "depth"}}."""
+    modules = {}
+    for line in stderr_text.splitlines():
+        m = IMPORTTIME_RE.match(line)
+        if not m:
+            continue
+        self_us, cum_us, indent, name = m.groups()
+        modules[name] = {
+            "self_ms": int(self_us) / 1000.0,
+            "cumulative_ms": int(cum_us) / 1000.0,
+            "depth": len(indent) // 2,
+        }
+    return modules
+
+
+def measure_import_times(module=ENTRY_MODULE):
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=REPO_ROOT, env=_env(), capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr)
+    return parse_importtime(proc.stderr)
+
+
+def measure_first_paint():
+    proc = subprocess.run([sys.executable, "-c", FIRST_PAINT_SCRIPT],
+                          cwd=REPO_ROOT, env=_env(), capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_common_args(parser)
+    parser.add_argument("--runs", type=int, default=3, help="Repetitions (best run is kept)")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to report")
+    parser.add_argument("--budget-first-paint", type=float, help="Max. ms until first paint")
+    parser.add_argument("--budget-import", type=float, help="Max. cumulative ms importing the entry module")
+    args = parser.parse_args()
+
+    imports = min((measure_import_times() for _ in range(args.runs)),
+                  key=lambda m: m.get(ENTRY_MODULE, {}).get("cumulative_ms", float("inf")))
+    paints = [measure_first_paint() for _ in range(args.runs)]
+    paint = min(paints, key=lambda p: p["first_paint_ms"] or float("inf"))
+
+    slowest = sorted(imports.items(), key=lambda kv: kv[1]["self_ms"], reverse=True)[:args.top]
+    # Módulos de la app: sirven para detectar que alguien volvió a importar algo pesado en el arranque
+    app_modules = {k: v["cumulative_ms"] for k, v in imports.items() if k == "app" or k.startswith("app.")}
+
+    results = {
+        "startup": paint,
+        "import": {
+            "entry_cumulative_ms": imports.get(ENTRY_MODULE, {}).get("cumulative_ms"),
+            "app_modules_ms": app_modules,
+        },
+        "slowest_modules_self_ms": {k: v["self_ms"] for k, v in slowest},
+        "eager_heavy_modules": sorted(m for m in ("pyqtgraph.opengl", "OpenGL.GL") if m in imports),
+    }
+
+    status = finish(args, "startup", results)
+
+    over = []
+    if args.budget_first_paint is not None and (paint["first_paint_ms"] or 0) > args.budget_first_paint:
+        over.append(f"first paint {paint['first_paint_ms']:.0f} ms > {args.budget_first_paint:.0f} ms")
+    entry_ms = results["import"]["entry_cumulative_ms"] or 0
+    if args.budget_import is not None and entry_ms > args.budget_import:
+        over.append(f"import {entry_ms:.0f} ms > {args.budget_import:.0f} ms")
+    for msg in over:
+        print("BUDGET EXCEEDED: " + msg, file=sys.stderr)
+    return 1 if over else status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Utilidades compartidas por los benchmarks: cronometraje, resultados JSON y
+comparación contra una línea base.
+"""
+import json
+import os
+import platform
+import sys
+import time
+
+# Raíz del repo en sys.path para poder hacer `python benchmarks/xxx.py`
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+def time_call(fn, *args, repeat=1, **kwargs):
+    """Ejecuta fn `repeat` veces y devuelve (mejor tiempo en s, último resultado)."""
+    best = float("inf")
+    result = None
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def environment_info():
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def write_results(path, suite, results):
+    """results: {nombre_métrica: valor_en_segundos (o dict con métricas)}"""
+    payload = {"suite": suite, "env": environment_info(), "results": results}
+    if path in (None, "-"):
+        json.dump(payload, sys.stdout, indent=2)
+        print()
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+    return payload
+
+
+def _flatten(results, prefix=""):
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name + "."))
+        elif isinstance(value, float):
+            # Los enteros son conteos (nodos seleccionados, bytes...), no tiempos
+            flat[name] = value
+    return flat
+
+
+def compare_to_baseline(results, baseline_path, tolerance=0.20):
+    """
+    Compara métricas (más bajo = mejor) contra un JSON previo.
+    Devuelve la lista de regresiones [(métrica, base, actual, ratio)].
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = _flatten(json.load(f).get("results", {}))
+    current = _flatten(results)
+
+    regressions = []
+    for name, value in sorted(current.items()):
+        base = baseline.get(name)
+        if base is None or base <= 0:
+            continue
+        ratio = value / base
+        marker = ""
+        if ratio > 1.0 + tolerance:
+            regressions.append((name, base, value, ratio))
+            marker = "  <-- REGRESSION"
+        print(f"{name:60s} {base:12.6f} -> {value:12.6f}  x{ratio:5.2f}{marker}", file=sys.stderr)
+    return regressions
+
+
+def add_common_args(parser):
+    parser.add_argument("--output", "-o", default="-", help="JSON output file ('-' = stdout)")
+    parser.add_argument("--baseline", help="Previous JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.20,
+                        help="Allowed slowdown vs. baseline (0.20 = 20%%)")
+
+
+def finish(args, suite, results):
+    """Escribe resultados y devuelve el código de salida (1 si hay regresiones)."""
+    write_results(args.output, suite, results)
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.tolerance:.0%} tolerance", file=sys.stderr)
+            return 1
+    return 0
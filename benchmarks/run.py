@@ -0,0 +1,40 @@
+"""
+Ejecuta todas las suites sobre los modelos sintéticos y escribe un único JSON
+(salida 1 si hay regresiones o se supera un presupuesto de memoria).
+
+    python benchmarks/run.py -o baseline.json
+    python benchmarks/run.py --sizes 1k,10k --baseline baseline.json
+"""
+import argparse
+import sys
+
+from common import add_common_args, finish
+from synthetic import parse_sizes
+import bench_model
+import bench_gui
+import bench_memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_common_args(parser)
+    parser.add_argument("--sizes", default="1k,10k,100k,1M")
+    parser.add_argument("--skip-gui", action="store_true", help="Only the headless model suite")
+    args = parser.parse_args()
+
+    sizes = parse_sizes(args.sizes)
+    results = {"model": bench_model.run(sizes)}
+    if not args.skip_gui:
+        results["gui"] = bench_gui.run(sizes)
+    results["memory"] = bench_memory.run(sizes, gui=not args.skip_gui)
+    code = finish(args, "all", results)
+    # Presupuestos de bytes por nodo por defecto (ver bench_memory.py)
+    failures = bench_memory.check_budgets(results["memory"], bench_memory.MAX_MODEL_BYTES_PER_NODE,
+                                          bench_memory.MAX_TOTAL_BYTES_PER_NODE)
+    for size, metric, value, budget in failures:
+        print(f"{size:>6s} {metric}: {value} B/node over budget {budget}", file=sys.stderr)
+    return 1 if failures else code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Generadores de modelos sintéticos (pórticos 3D regulares) para los benchmarks.
+
+    coords, conn = frame_grid(100_000)          # 100k nodos y 100k frames
+    model = build_model(coords, conn)           # DocumentModel poblado
+"""
+import math
+
+import numpy as np
+
+from common import REPO_ROOT  # noqa: F401  (asegura sys.path)
+from app.models.document_model import DocumentModel
+
+SIZE_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+
+def parse_sizes(text):
+    """'1k,10k,1M' -> [1000, 10000, 1000000]"""
+    sizes = []
+    for token in text.split(","):
+        token = token.strip().lower()
+        if not token:
+            continue
+        mult = SIZE_SUFFIXES.get(token[-1], 1)
+        number = token[:-1] if token[-1] in SIZE_SUFFIXES else token
+        sizes.append(int(float(number) * mult))
+    return sizes
+
+
+def size_label(n):
+    if n >= 1_000_000 and n % 1_000_000 == 0:
+        return f"{n // 1_000_000}M"
+    if n >= 1_000 and n % 1_000 == 0:
+        return f"{n // 1_000}k"
+    return str(n)
+
+
+def frame_grid(n_nodes, n_frames=None, spacing=(6.0, 5.0, 3.0)):
+    """
+    Edificio regular: rejilla nx * ny * nz de nodos con vigas en X/Y y
+    columnas en Z. Devuelve (coords (N,3) float64, conn (E,2) int64 con IDs
+    1-based en el orden de inserción).
+    """
+    if n_frames is None:
+        n_frames = n_nodes
+    nz = max(1, round(n_nodes ** (1.0 / 3.0)))
+    nxy = max(1, math.ceil(math.sqrt(n_nodes / nz)))
+    nx = ny = nxy
+    while nx * ny * nz < n_nodes:
+        nz += 1
+
+    ix, iy, iz = np.meshgrid(np.arange(nx), np.arange(ny), np.arange(nz), indexing="ij")
+    coords = np.column_stack([ix.ravel() * spacing[0], iy.ravel() * spacing[1], iz.ravel() * spacing[2]])
+    index = np.arange(nx * ny * nz).reshape(nx, ny, nz)
+
+    # Todas las conexiones candidatas: columnas, vigas X y vigas Y
+    pairs = [
+        np.column_stack([index[:, :, :-1].ravel(), index[:, :, 1:].ravel()]),
+        np.column_stack([index[:-1, :, :].ravel(), index[1:, :, :].ravel()]),
+        np.column_stack([index[:, :-1, :].ravel(), index[:, 1:, :].ravel()]),
+    ]
+    conn = np.concatenate(pairs)
+    # Solo conexiones entre los n_nodes primeros nodos
+    conn = conn[(conn < n_nodes).all(axis=1)]
+    # Subconjunto de n_frames con semilla fija, columnas y vigas en su
+    # proporción (recortar la lista concatenada dejaría casi solo columnas)
+    if n_frames < len(conn):
+        rng = np.random.default_rng(0)
+        vertical = conn[:, 0] % nz != conn[:, 1] % nz
+        columns, beams = np.flatnonzero(vertical), np.flatnonzero(~vertical)
+        n_columns = round(n_frames * len(columns) / len(conn))
+        if len(columns) and len(beams) and n_frames >= 2:
+            n_columns = min(max(n_columns, 1), n_frames - 1)
+        keep = np.concatenate([rng.permutation(columns)[:n_columns],
+                               rng.permutation(beams)[:n_frames - n_columns]])
+        conn = conn[np.sort(keep)]
+    # Inserción planta a planta: vigas de la planta y columnas que arrancan en ella
+    conn = conn[np.argsort(conn.min(axis=1) % nz, kind="stable")]
+    vertical = conn[:, 0] % nz != conn[:, 1] % nz
+    assert nz == 1 or nxy == 1 or len(conn) < 2 or 0 < vertical.sum() < len(conn), \
+        "frame_grid: expected both columns and beams"
+    return coords[:n_nodes], conn.astype(np.int64) + 1
+
+
+def as_tuples(coords, conn):
+    """Listas (id, x, y, z) y (id, n1, n2) como las que consumen las vistas."""
+    nodes = [(i + 1, x, y, z) for i, (x, y, z) in enumerate(coords.tolist())]
+    elements = [(i + 1, a, b) for i, (a, b) in enumerate(conn.tolist())]
+    return nodes, elements
+
+
+def build_model(coords, conn):
+    """DocumentModel poblado con la API masiva (IDs 1..N en orden)."""
+    model = DocumentModel()
+    model.add_nodes(coords)
+    model.add_elements(conn)
+    return model
+
+
+def with_duplicates(coords, fraction=0.1, jitter=1e-5, seed=0):
+    """Copia de coords donde `fraction` de los nodos duplica (casi) a otro."""
+    rng = np.random.default_rng(seed)
+    out = coords.copy()
+    k = int(len(coords) * fraction)
+    if k:
+        dst = rng.choice(len(coords), size=k, replace=False)
+        src = rng.integers(0, len(coords), size=k)
+        out[dst] = coords[src] + rng.uniform(-jitter, jitter, size=(k, 3))
+    return out
@@ -1,5 +1,6 @@
-from app.controllers.main_controller import MainController
+import sys
+
+from app.__main__ import main
 
 if __name__ == "__main__":
-    controller = MainController()
-    controller.run()
\ No newline at end of file
+    sys.exit(main())